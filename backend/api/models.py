@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
 
 class SearchQuery(BaseModel):
@@ -16,6 +16,38 @@ class SearchQuery(BaseModel):
     merge_segments: Optional[bool] = Field(
         True, description="Çakışan segmentleri birleştir"
     )
+    nprobe: Optional[int] = Field(
+        None, ge=1, le=65536, description="IVF index'inde taranacak liste sayısı"
+    )
+    ef_search: Optional[int] = Field(
+        None, ge=1, le=4096, description="HNSW index'inde arama kuyruğu boyutu"
+    )
+
+
+class BatchSearchQuery(BaseModel):
+    """Çoklu arama sorgusu modeli"""
+
+    queries: List[Annotated[str, Field(min_length=1)]] = Field(
+        ..., min_length=1, max_length=64, description="Arama sorgusu metinleri"
+    )
+    video_id: Optional[str] = Field(
+        None, description="Arama yapılacak video ID (opsiyonel)"
+    )
+    k: Optional[int] = Field(
+        30, ge=1, le=100, description="Sorgu başına maksimum sonuç sayısı"
+    )
+    similarity_threshold: Optional[float] = Field(
+        0.1, ge=0.0, le=1.0, description="Minimum benzerlik eşiği"
+    )
+    merge_segments: Optional[bool] = Field(
+        True, description="Çakışan segmentleri birleştir"
+    )
+    nprobe: Optional[int] = Field(
+        None, ge=1, le=65536, description="IVF index'inde taranacak liste sayısı"
+    )
+    ef_search: Optional[int] = Field(
+        None, ge=1, le=4096, description="HNSW index'inde arama kuyruğu boyutu"
+    )
 
 
 class FrameResult(BaseModel):
@@ -61,6 +93,11 @@ class VideoInfo(BaseModel):
     width: int
     height: int
     total_frames: int
+    indexed_until: Optional[float] = Field(
+        None,
+        description="Aranabilir kısmın sonu (saniye); None videonun tamamen "
+        "index'lendiğini belirtir",
+    )
 
 
 class SearchResponse(BaseModel):
@@ -78,6 +115,15 @@ class SearchResponse(BaseModel):
     )
 
 
+class BatchSearchResponse(BaseModel):
+    """Çoklu arama sonucu response modeli"""
+
+    responses: List[SearchResponse] = Field(
+        ..., description="Sorgularla aynı sırada arama sonuçları"
+    )
+    total_queries: int
+
+
 class VideoUploadResponse(BaseModel):
     """Video upload response modeli"""
 
@@ -86,6 +132,24 @@ class VideoUploadResponse(BaseModel):
     video_id: Optional[str] = None
     video_info: Optional[VideoInfo] = None
     frames_extracted: Optional[int] = None
+    job_id: Optional[str] = Field(
+        None, description="Videoyu işleyen ingestion işinin ID'si (GET /jobs/{id})"
+    )
+
+
+class JobStatus(BaseModel):
+    """Ingestion işi durum modeli"""
+
+    job_id: str
+    video_id: str
+    status: str = Field(..., description="queued/running/completed/failed")
+    stage: str = Field(..., description="İşin şu anki aşaması")
+    percent: float = Field(..., description="Videonun işlenen kısmı (0-100)")
+    frames_processed: int
+    frames_per_second: float
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
 
 
 # class VideoSegmentRequest(BaseModel):
@@ -113,9 +177,22 @@ class ErrorResponse(BaseModel):
     detail: Optional[str] = None
 
 
+class CacheStats(BaseModel):
+    """Sorgu embedding cache istatistikleri modeli"""
+
+    hits: int
+    misses: int
+    hit_rate: float
+    size: int
+    max_size: int
+
+
 class HealthResponse(BaseModel):
     """Health check response modeli"""
 
     status: str
     videos_indexed: int
     frames_indexed: int
+    index_type: Optional[str] = None
+    models_loaded: List[str] = []
+    query_cache: Optional[CacheStats] = None
@@ -4,26 +4,40 @@ Video upload, arama ve video segment servisleri sağlar.
 """
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional
-import tempfile
+from typing import Callable, Dict, List, Optional
+import asyncio
+import json
 import shutil
+import tempfile
+import threading
+import uuid
 
 from api.models import (
     SearchQuery,
     SearchResponse,
+    BatchSearchQuery,
+    BatchSearchResponse,
     FrameResult,
     SegmentResult,
     BestFrame,
     VideoUploadResponse,
     VideoInfo,
     HealthResponse,
+    CacheStats,
+    JobStatus,
 )
-from core.video_processor import VideoProcessor
+from core.video_processor import VideoProcessor, VideoMetadata, SamplingOptions
 from core.feature_extractor import FeatureExtractor
 from core.search_engine import SearchEngine
 from core.segment_merger import SegmentMerger
+from core.ingestion import IngestionPipeline
+from core.bounded_executor import BoundedExecutor, ExecutorSaturatedError
+from core.job_queue import Job, JobQueue
+from config.settings import settings
+from utils.hashing import copy_with_hash
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -35,6 +49,14 @@ video_processor: Optional[VideoProcessor] = None
 feature_extractor: Optional[FeatureExtractor] = None
 search_engine: Optional[SearchEngine] = None
 segment_merger: Optional[SegmentMerger] = None
+ingestion_pipeline: Optional[IngestionPipeline] = None
+# Aramalar ve upload'lar ayrı havuzlarda çalışır; uzun bir upload aramaları bekletmez
+search_executor: Optional[BoundedExecutor] = None
+upload_executor: Optional[BoundedExecutor] = None
+job_queue: Optional[JobQueue] = None
+
+# SSE akışında iş durumunun kontrol edilme aralığı (saniye)
+JOB_EVENTS_INTERVAL = 0.5
 
 
 def initialize_services():
@@ -44,6 +66,7 @@ def initialize_services():
     Bu fonksiyon app başlatılırken çağrılmalıdır.
     """
     global video_processor, feature_extractor, search_engine, segment_merger
+    global ingestion_pipeline, search_executor, upload_executor, job_queue
 
     logger.info("Initializing services...")
 
@@ -51,12 +74,93 @@ def initialize_services():
     feature_extractor = FeatureExtractor()
     search_engine = SearchEngine()
     segment_merger = SegmentMerger(merge_threshold=0.0)
+    ingestion_pipeline = IngestionPipeline(
+        video_processor, feature_extractor, search_engine
+    )
+
+    search_executor = BoundedExecutor(
+        "search", settings.SEARCH_WORKERS, settings.SEARCH_MAX_PENDING
+    )
+    upload_executor = BoundedExecutor(
+        "upload", settings.UPLOAD_WORKERS, settings.UPLOAD_MAX_PENDING
+    )
 
     search_engine.load_index()
 
+    # Index yüklendikten sonra bekleyen ve yarım kalmış işler çalıştırılır
+    job_queue = JobQueue(
+        settings.JOB_DB_PATH, _process_job, workers=settings.INGEST_JOB_WORKERS
+    )
+    job_queue.start()
+
+    # Model tower'ları ilk istekte yüklenir; warm-up API'yi bekletmeden
+    # arka planda yapılır
+    if settings.MODEL_WARMUP_TOWERS:
+        threading.Thread(
+            target=feature_extractor.warm_up, name="model-warmup", daemon=True
+        ).start()
+
     logger.info("Services initialized successfully")
 
 
+def shutdown_services():
+    """
+    Servisleri kapatır.
+
+    Bu fonksiyon app kapanırken çağrılmalıdır.
+    """
+    # Devam eden upload'lar index'e eklenip kaydedilene kadar beklenir
+    if job_queue:
+        job_queue.close()
+
+    for executor in (upload_executor, search_executor):
+        if executor:
+            executor.shutdown()
+
+    if feature_extractor:
+        feature_extractor.text_batcher.close()
+        feature_extractor.text_cache.save()
+
+    # Arka planda yazılan snapshot yarım kalmasın
+    if search_engine:
+        search_engine.wait_for_compaction()
+
+
+def _saturated(error: ExecutorSaturatedError) -> HTTPException:
+    """
+    Dolu bir havuz için istemcinin tekrar denemesini isteyen 503 hatası üretir.
+    """
+    return HTTPException(
+        status_code=503,
+        detail=f"Server is busy ({error}). Please retry later.",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _to_video_info(video_metadata: VideoMetadata) -> VideoInfo:
+    """
+    VideoMetadata nesnesini API modeline dönüştürür.
+
+    Args:
+        video_metadata: Video metadata
+
+    Returns:
+        VideoInfo modeli
+    """
+    return VideoInfo(
+        video_id=video_metadata.video_id,
+        original_filename=video_metadata.original_filename,
+        duration=video_metadata.duration,
+        fps=video_metadata.fps,
+        width=video_metadata.width,
+        height=video_metadata.height,
+        total_frames=video_metadata.total_frames,
+        indexed_until=None
+        if video_metadata.fully_indexed
+        else video_metadata.indexed_until,
+    )
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """
@@ -65,68 +169,300 @@ async def health_check():
     Servisin çalışır durumda olduğunu kontrol eder.
     """
     videos = search_engine.get_all_videos() if search_engine else []
-    frames = len(search_engine.frame_metadata_list) if search_engine else 0
+    frames = search_engine.view.frame_count if search_engine else 0
+    query_cache = (
+        CacheStats(**feature_extractor.text_cache.stats())
+        if feature_extractor
+        else None
+    )
 
     return HealthResponse(
-        status="healthy", videos_indexed=len(videos), frames_indexed=frames
+        status="healthy",
+        videos_indexed=len(videos),
+        frames_indexed=frames,
+        index_type=search_engine.index_type if search_engine else None,
+        models_loaded=feature_extractor.loaded_towers if feature_extractor else [],
+        query_cache=query_cache,
     )
 
 
 @router.post("/upload", response_model=VideoUploadResponse)
-async def upload_video(file: UploadFile = File(...)):
+async def upload_video(
+    file: UploadFile = File(...),
+    sampling_strategy: Optional[str] = Form(None),
+    frames_per_second: Optional[float] = Form(None, gt=0),
+):
     """
     Video upload endpoint.
 
-    Video dosyasını yükler, frame'leri çıkarır ve index'e ekler.
+    Video dosyasını kaydeder ve işlenmesi için ingestion kuyruğuna ekler;
+    frame çıkarma, embedding ve index'e ekleme arka planda yapılır. Yanıt
+    video bilgisini ve ilerlemenin GET /jobs/{job_id} ile izlenebileceği iş
+    ID'sini içerir. Örnekleme stratejisi (fixed/keyframe/adaptive) ve hızı
+    upload başına seçilebilir, verilmezse settings'deki varsayılanlar
+    kullanılır. Aynı içerikteki bir video daha önce index'lendiyse veya
+    kuyruktaysa mevcut video (ve iş) döndürülür. Geçersiz örnekleme
+    seçenekleri 400, upload havuzu doluysa 503 döner.
     """
+    logger.info(f"Received video upload: {file.filename}")
+
+    # Geçersiz seçenekler dosya kopyalanmadan ve iş kuyruğa girmeden reddedilir
+    try:
+        options = SamplingOptions(
+            strategy=sampling_strategy, frames_per_second=frames_per_second
+        ).resolve()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
-        original_filename = file.filename
-        logger.info(f"Received video upload: {original_filename}")
-
-        # Geçici dosya oluştur
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=Path(file.filename).suffix
-        ) as tmp_file:
-            # Upload edilen dosyayı geçici dosyaya kopyala
-            shutil.copyfileobj(file.file, tmp_file)
-            tmp_path = Path(tmp_file.name)
-
-        # Video'yu işle
-        video_id, frame_metadata_list, video_metadata = video_processor.process_video(
-            tmp_path, original_filename
+        return await upload_executor.run(_enqueue_upload, file, options)
+
+    except HTTPException:
+        raise
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
+    except Exception as e:
+        logger.exception("Error processing video")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _enqueue_upload(file: UploadFile, options: SamplingOptions) -> VideoUploadResponse:
+    """
+    Upload edilen videoyu kaydeder, doğrular ve ingestion kuyruğuna ekler.
+
+    Dosya kopyalama ve hash hesaplama disk yoğun olduğu için upload
+    havuzunda çalışır.
+
+    Args:
+        file: Upload edilen dosya
+        options: Çözümlenmiş örnekleme seçenekleri
+
+    Returns:
+        Upload sonucu
+
+    Raises:
+        HTTPException: Video geçersizse (400)
+    """
+    original_filename = file.filename
+
+    # Dosya iş bitene kadar (yeniden başlatmalar dahil) bekleme dizininde kalır
+    with tempfile.NamedTemporaryFile(
+        delete=False,
+        dir=settings.PENDING_UPLOAD_DIR,
+        suffix=Path(file.filename).suffix,
+    ) as tmp_file:
+        # Upload edilen dosyayı kopyalarken içerik hash'ini hesapla
+        content_hash = copy_with_hash(file.file, tmp_file)
+        tmp_path = Path(tmp_file.name)
+
+    # Aynı içerik daha önce index'lendiyse veya kuyruktaysa tekrar işlenmez.
+    # Kısmen index'lenmiş video hâlâ işlenmektedir; iş kuyrukta aranır
+    existing_video = search_engine.find_video_by_hash(content_hash)
+    if existing_video and existing_video.fully_indexed:
+        tmp_path.unlink(missing_ok=True)
+
+        logger.info(
+            f"Duplicate upload of video {existing_video.video_id}, skipping processing"
         )
 
-        # Frame'lerden feature'ları çıkar
-        frame_paths = [Path(fm.frame_path) for fm in frame_metadata_list]
-        features = feature_extractor.extract_image_features(frame_paths)
+        return VideoUploadResponse(
+            success=True,
+            message="Video already indexed",
+            video_id=existing_video.video_id,
+            video_info=_to_video_info(existing_video),
+        )
 
-        # Index'e ekle
-        search_engine.build_index(features, frame_metadata_list, video_metadata)
+    info = (
+        video_processor.get_video_info(tmp_path)
+        if video_processor.validate_video(tmp_path)
+        else None
+    )
+    if info is None:
+        tmp_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail="Invalid video file")
+
+    # Aktif iş kontrolü ve ekleme tek transaction'dır; aynı videonun
+    # eşzamanlı upload'ları tek bir iş oluşturur
+    video_id = str(uuid.uuid4())
+    job, queued = job_queue.submit(
+        video_id,
+        str(tmp_path),
+        original_filename,
+        content_hash,
+        options=asdict(options),
+    )
 
-        # Index'i kaydet
-        search_engine.save_index()
+    if not queued:
+        tmp_path.unlink(missing_ok=True)
 
-        logger.info(f"Video processed successfully: {video_id}")
+        logger.info(
+            f"Duplicate upload of queued video {job.video_id}, "
+            f"returning job {job.job_id}"
+        )
+
+        indexed_video = search_engine.get_video_metadata(job.video_id)
 
         return VideoUploadResponse(
             success=True,
-            message="Video uploaded and processed successfully",
-            video_id=video_id,
+            message="Video is already being processed",
+            video_id=job.video_id,
             video_info=VideoInfo(
-                video_id=video_metadata.video_id,
-                original_filename=video_metadata.original_filename,
-                duration=video_metadata.duration,
-                fps=video_metadata.fps,
-                width=video_metadata.width,
-                height=video_metadata.height,
-                total_frames=video_metadata.total_frames,
+                video_id=job.video_id,
+                original_filename=job.original_filename,
+                indexed_until=indexed_video.indexed_until if indexed_video else 0.0,
+                **info,
             ),
-            frames_extracted=len(frame_metadata_list),
+            job_id=job.job_id,
         )
 
-    except Exception as e:
-        logger.error(f"Error processing video: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+    return VideoUploadResponse(
+        success=True,
+        message="Video queued for processing",
+        video_id=video_id,
+        video_info=VideoInfo(
+            video_id=video_id,
+            original_filename=original_filename,
+            indexed_until=0.0,
+            **info,
+        ),
+        job_id=job.job_id,
+    )
+
+
+def _process_job(job: Job, progress: Callable[..., None]) -> None:
+    """
+    Ingestion işini yürütür: videoyu işler, index'e ekler ve kaydeder.
+
+    Yeniden başlatma sonrası tekrar çalıştırılabilir: dosya önceki
+    çalıştırmada upload dizinine taşındıysa oradan okunur, video tamamen
+    index'e eklenip kaydedildiyse tekrar işlenmez. Önceki çalıştırmadan
+    kalan parçalar index'ten silinir; iş başarısız olursa eklenen parçalar,
+    video dosyası ve thumbnail'lar silinir.
+
+    Args:
+        job: Çalıştırılacak iş
+        progress: İlerleme bildirimi (JobQueue.update alanları)
+    """
+    indexed_video = search_engine.get_video_metadata(job.video_id)
+    if indexed_video and indexed_video.fully_indexed:
+        logger.info(f"Video {job.video_id} is already indexed")
+        return
+
+    if indexed_video:
+        logger.info(f"Discarding partially indexed video {job.video_id}")
+        search_engine.remove_video(job.video_id)
+
+    video_path = Path(job.file_path)
+    if not video_path.exists():
+        video_path = settings.UPLOAD_DIR / f"{job.video_id}{video_path.suffix}"
+
+    # Video'yu işle: frame'ler decoder'dan doğrudan embedding'e akar
+    # ve parça parça index'e eklenir
+    try:
+        _, frame_metadata_list, _ = ingestion_pipeline.run(
+            video_path,
+            job.original_filename,
+            SamplingOptions(**job.options),
+            content_hash=job.content_hash,
+            video_id=job.video_id,
+            progress=progress,
+        )
+
+        # Index'i kaydet
+        progress(stage="saving")
+        search_engine.save_index()
+    except Exception:
+        _discard_failed_job(job)
+        raise
+
+    logger.info(
+        f"Video processed successfully: {job.video_id} "
+        f"({len(frame_metadata_list)} frames)"
+    )
+
+
+def _discard_failed_job(job: Job) -> None:
+    """
+    Başarısız işin index'e eklenen parçalarını ve dosyalarını siler.
+
+    Başarısız işler tekrar çalıştırılmaz; eklenen parçalar sonucu aranabilir
+    bırakmamalı, video dosyası ve thumbnail'lar da diskte kalmamalıdır.
+
+    Args:
+        job: Başarısız olan iş
+    """
+    if search_engine.get_video_metadata(job.video_id):
+        search_engine.remove_video(job.video_id)
+
+    # Dosya bekleme dizininde veya upload dizinine taşınmış olabilir
+    pending_path = Path(job.file_path)
+    pending_path.unlink(missing_ok=True)
+    (settings.UPLOAD_DIR / f"{job.video_id}{pending_path.suffix}").unlink(
+        missing_ok=True
+    )
+    shutil.rmtree(settings.FRAME_EXTRACTION_DIR / job.video_id, ignore_errors=True)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    Ingestion işi durum endpoint'i.
+
+    İşin aşamasını, işlenen yüzdeyi ve frame/saniye hızını döndürür.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return _to_job_status(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Ingestion işi ilerleme akışı (server-sent events).
+
+    İşin durumu değiştikçe JobStatus JSON'u bir event olarak gönderilir;
+    iş tamamlandığında veya başarısız olduğunda akış kapanır.
+    """
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last_update = None
+
+        while True:
+            job = job_queue.get(job_id)
+
+            if job.updated_at != last_update:
+                last_update = job.updated_at
+                status = _to_job_status(job).model_dump()
+                yield f"data: {json.dumps(status)}\n\n"
+
+            if job.done:
+                return
+
+            await asyncio.sleep(JOB_EVENTS_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def _to_job_status(job: Job) -> JobStatus:
+    """
+    Job nesnesini API modeline dönüştürür.
+    """
+    return JobStatus(
+        job_id=job.job_id,
+        video_id=job.video_id,
+        status=job.status,
+        stage=job.stage,
+        percent=round(job.percent, 1),
+        frames_processed=job.frames_processed,
+        frames_per_second=round(job.frames_per_second, 2),
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
 
 
 @router.post("/search", response_model=SearchResponse)
@@ -134,13 +470,12 @@ async def search(request: SearchQuery):
     query = request.query
     video_id = request.video_id
     k = request.k
-    similarity_threshold = request.similarity_threshold
     merge_segments = request.merge_segments
     """
     Arama endpoint.
 
     Metin sorgusuyla benzer frame'leri bulur ve isteğe bağlı olarak
-    çakışan segmentleri birleştirir.
+    çakışan segmentleri birleştirir. Arama havuzu doluysa 503 döner.
     """
     try:
         logger.info(
@@ -148,101 +483,216 @@ async def search(request: SearchQuery):
             f"merge_segments={merge_segments}"
         )
 
-        if not search_engine.index:
-            raise HTTPException(
-                status_code=400,
-                detail="No videos indexed. Please upload a video first.",
-            )
+        _check_searchable(video_id)
 
-        if video_id:
-            if not search_engine.get_video_metadata(video_id):
-                raise HTTPException(
-                    status_code=404, detail=f"Video '{video_id}' not found."
-                )
+        # Sorgu encode ve FAISS araması arama havuzunda çalışır
+        search_results = await search_executor.run(_search_frames, request)
 
-        # Text feature çıkar
-        text_features = feature_extractor.extract_text_features(query)
+        return _to_search_response(query, video_id, search_results, merge_segments)
 
-        search_results = search_engine.search(
-            text_features,
-            k=k,
-            similarity_threshold=similarity_threshold,
-            video_id=video_id,
-        )
+    except HTTPException:
+        raise
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
+    except Exception as e:
+        logger.exception("Search error")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Frame sonuçlarını oluştur
-        frame_results = []
-        for result in search_results:
-            frame_metadata = result["frame_metadata"]
-
-            # Thumbnail URL oluştur
-            thumbnail_url = f"/frames/{frame_metadata.video_id}/{Path(frame_metadata.frame_path).name}"
-
-            frame_results.append(
-                FrameResult(
-                    frame_id=frame_metadata.frame_id,
-                    video_id=frame_metadata.video_id,
-                    timestamp=frame_metadata.timestamp,
-                    score=result["score"],
-                    rank=result["rank"],
-                    thumbnail_url=thumbnail_url,
-                )
-            )
 
-        # Response oluştur
-        response_data = {
-            "query": query,
-            "video_id": video_id,
-            "results": frame_results,
-            "total_results": len(frame_results),
-        }
-
-        # Segment birleştirme işlemi
-        if merge_segments and search_results:
-            logger.info("Merging overlapping segments...")
-
-            # Segmentleri birleştir
-            merged_segments = segment_merger.merge_search_results(
-                search_results,
-                segment_duration=10.0,  # Her frame için ±5 saniye segment
-            )
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_batch(request: BatchSearchQuery):
+    """
+    Çoklu arama endpoint.
 
-            # Segment sonuçlarını oluştur
-            segment_results = []
-            for segment in merged_segments:
-                segment_results.append(
-                    SegmentResult(
-                        video_id=segment.video_id,
-                        video_url=f"/videos/{segment.video_id}",
-                        start_time=segment.start_time,
-                        end_time=segment.end_time,
-                        duration=round(segment.end_time - segment.start_time, 2),
-                        best_score=segment.best_score,
-                        best_frame=BestFrame(**segment.best_frame),
-                        frame_count=segment.frame_count,
-                    )
-                )
+    Tüm sorgular tek bir text tower batch'inde encode edilir ve index'te
+    tek bir çok satırlı aramayla aranır. Her sorgu için /search ile aynı
+    biçimde sonuç ve segment döndürür. Arama havuzu doluysa 503 döner.
+    """
+    try:
+        logger.info(
+            f"Batch search of {len(request.queries)} queries, "
+            f"video_id={request.video_id}, k={request.k}, "
+            f"merge_segments={request.merge_segments}"
+        )
 
-            # Özet bilgi
-            merge_info = segment_merger.get_segment_summary(merged_segments)
+        _check_searchable(request.video_id)
 
-            response_data["segments"] = segment_results
-            response_data["merge_info"] = merge_info
+        # Tüm batch arama havuzunda tek bir iş olarak çalışır
+        batch_results = await search_executor.run(_search_frames_batch, request)
 
-            logger.info(
-                f"Segment merge completed: {len(segment_results)} segments "
-                f"created from {len(frame_results)} frames"
+        responses = [
+            _to_search_response(
+                query, request.video_id, search_results, request.merge_segments
             )
+            for query, search_results in zip(request.queries, batch_results)
+        ]
 
-        return SearchResponse(**response_data)
+        return BatchSearchResponse(responses=responses, total_queries=len(responses))
 
     except HTTPException:
         raise
+    except ExecutorSaturatedError as e:
+        raise _saturated(e)
     except Exception as e:
-        logger.error(f"Search error: {e}", exc_info=True)
+        logger.exception("Batch search error")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _check_searchable(video_id: Optional[str]) -> None:
+    """
+    Aramanın yapılabileceğini doğrular.
+
+    Args:
+        video_id: Aramanın sınırlandığı video ID'si (opsiyonel)
+
+    Raises:
+        HTTPException: Index boşsa (400) veya video bulunamazsa (404)
+    """
+    if not search_engine.view.frame_count:
+        raise HTTPException(
+            status_code=400,
+            detail="No videos indexed. Please upload a video first.",
+        )
+
+    if video_id:
+        if not search_engine.get_video_metadata(video_id):
+            raise HTTPException(
+                status_code=404, detail=f"Video '{video_id}' not found."
+            )
+
+
+def _to_search_response(
+    query: str,
+    video_id: Optional[str],
+    search_results: List[Dict],
+    merge_segments: Optional[bool],
+) -> SearchResponse:
+    """
+    Bir sorgunun arama sonuçlarını API modeline dönüştürür.
+
+    Args:
+        query: Arama sorgusu metni
+        video_id: Aramanın sınırlandığı video ID'si
+        search_results: SearchEngine.search sonuçları
+        merge_segments: Çakışan segmentler birleştirilsin mi
+
+    Returns:
+        SearchResponse modeli
+    """
+    # Frame sonuçlarını oluştur
+    frame_results = []
+    for result in search_results:
+        frame_metadata = result["frame_metadata"]
+
+        # Thumbnail URL oluştur
+        thumbnail_url = (
+            f"/frames/{frame_metadata.video_id}/{Path(frame_metadata.frame_path).name}"
+        )
+
+        frame_results.append(
+            FrameResult(
+                frame_id=frame_metadata.frame_id,
+                video_id=frame_metadata.video_id,
+                timestamp=frame_metadata.timestamp,
+                score=result["score"],
+                rank=result["rank"],
+                thumbnail_url=thumbnail_url,
+            )
+        )
+
+    # Response oluştur
+    response_data = {
+        "query": query,
+        "video_id": video_id,
+        "results": frame_results,
+        "total_results": len(frame_results),
+    }
+
+    # Segment birleştirme işlemi
+    if merge_segments and search_results:
+        logger.info("Merging overlapping segments...")
+
+        # Segmentleri birleştir
+        merged_segments = segment_merger.merge_search_results(
+            search_results,
+            segment_duration=10.0,  # Her frame için ±5 saniye segment
+        )
+
+        # Segment sonuçlarını oluştur
+        segment_results = []
+        for segment in merged_segments:
+            segment_results.append(
+                SegmentResult(
+                    video_id=segment.video_id,
+                    video_url=f"/videos/{segment.video_id}",
+                    start_time=segment.start_time,
+                    end_time=segment.end_time,
+                    duration=round(segment.end_time - segment.start_time, 2),
+                    best_score=segment.best_score,
+                    best_frame=BestFrame(**segment.best_frame),
+                    frame_count=segment.frame_count,
+                )
+            )
+
+        # Özet bilgi
+        merge_info = segment_merger.get_segment_summary(merged_segments)
+
+        response_data["segments"] = segment_results
+        response_data["merge_info"] = merge_info
+
+        logger.info(
+            f"Segment merge completed: {len(segment_results)} segments "
+            f"created from {len(frame_results)} frames"
+        )
+
+    return SearchResponse(**response_data)
+
+
+def _search_frames(request: SearchQuery) -> List[Dict]:
+    """
+    Sorguyu encode eder ve index'te arar.
+
+    Tekrar eden sorgular cache'ten gelir, eşzamanlı sorgular aynı batch'te
+    encode edilir. Arama yayınlanmış index görünümünde çalışır ve devam
+    eden upload'ları beklemez.
+
+    Returns:
+        SearchEngine.search sonuçları
+    """
+    text_features = feature_extractor.extract_query_features(request.query)
+
+    return search_engine.search(
+        text_features,
+        k=request.k,
+        similarity_threshold=request.similarity_threshold,
+        video_id=request.video_id,
+        nprobe=request.nprobe,
+        ef_search=request.ef_search,
+    )
+
+
+def _search_frames_batch(request: BatchSearchQuery) -> List[List[Dict]]:
+    """
+    Sorguları tek batch'te encode eder ve index'te birlikte arar.
+
+    Cache'te olmayan sorgular tek bir text tower çağrısıyla encode edilir;
+    tüm sorgular aynı index görünümünde tek bir FAISS aramasıyla aranır.
+
+    Returns:
+        Her sorgu için SearchEngine.search sonuçları
+    """
+    text_features = feature_extractor.extract_query_features_batch(request.queries)
+
+    return search_engine.search_batch(
+        text_features,
+        k=request.k,
+        similarity_threshold=request.similarity_threshold,
+        video_id=request.video_id,
+        nprobe=request.nprobe,
+        ef_search=request.ef_search,
+    )
+
+
 @router.get("/videos/{video_id}")
 async def get_video(video_id: str):
     """
@@ -270,7 +720,7 @@ async def get_video(video_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Video file error: {e}", exc_info=True)
+        logger.exception("Video file error")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -284,21 +734,10 @@ async def list_videos():
     try:
         videos = search_engine.get_all_videos()
 
-        video_list = [
-            VideoInfo(
-                video_id=v.video_id,
-                original_filename=v.original_filename,
-                duration=v.duration,
-                fps=v.fps,
-                width=v.width,
-                height=v.height,
-                total_frames=v.total_frames,
-            )
-            for v in videos
-        ]
+        video_list = [_to_video_info(v) for v in videos]
 
         return {"videos": video_list, "total": len(video_list)}
 
     except Exception as e:
-        logger.error(f"List videos error: {e}", exc_info=True)
+        logger.exception("List videos error")
         raise HTTPException(status_code=500, detail=str(e))
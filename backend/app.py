@@ -9,7 +9,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from api.routes import router, initialize_services
+from api.routes import router, initialize_services, shutdown_services
 from config.settings import settings
 from utils.logger import get_logger
 
@@ -63,6 +63,7 @@ def create_app() -> FastAPI:
     async def shutdown_event():
         """Uygulama kapanırken çalışır"""
         logger.info("Shutting down Video Semantic Search API...")
+        shutdown_services()
 
     return app
 
@@ -0,0 +1,112 @@
+"""
+Index tiplerinin bellek kullanımını, arama gecikmesini ve recall'unu
+karşılaştıran benchmark.
+
+Gerçek embedding'lere benzemesi için kümelenmiş sentetik vektörlerden her
+index tipini kurar ve aynı sorguları tek tek arar. Frame başına index
+boyutunu, Flat index'e göre recall@k'yı ve p50/p99 gecikmeyi raporlar.
+Kayıplı tiplerde adayların tam vektörlerle yeniden skorlandığı recall da
+ayrıca verilir.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_ann_index --vectors 1000000 --nprobe 16 --ef-search 64
+"""
+
+import argparse
+import time
+from typing import List
+
+import faiss
+import numpy as np
+
+from core import index_factory
+
+
+def recall_at_k(found: List[np.ndarray], expected: List[np.ndarray], k: int) -> float:
+    """
+    Bulunan sonuçların beklenen ilk k sonuçla ortalama kesişim oranı.
+    """
+    return float(np.mean([len(set(f) & set(e)) / k for f, e in zip(found, expected)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=30)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--ef-search", type=int, default=64)
+    parser.add_argument("--rerank-candidates", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(args.clusters, args.dim))
+    vectors = centers[rng.integers(0, args.clusters, args.vectors)]
+    vectors = (vectors + 0.5 * rng.normal(size=vectors.shape)).astype("float32")
+    faiss.normalize_L2(vectors)
+
+    queries = vectors[rng.choice(args.vectors, args.queries, replace=False)]
+    queries = queries + 0.1 * rng.normal(size=queries.shape).astype("float32")
+    faiss.normalize_L2(queries)
+
+    expected = None
+
+    print(
+        f"{'index':<10}{'bytes/frame':>12}{'build s':>10}{'recall':>10}"
+        f"{'reranked':>10}{'p50 ms':>10}{'p99 ms':>10}"
+    )
+
+    for index_type in index_factory.INDEX_TYPES:
+        start = time.perf_counter()
+        index = index_factory.create_index(index_type, args.dim, args.vectors)
+        if not index.is_trained:
+            index_factory.train_index(index, vectors)
+        index.add(vectors)
+        build_time = time.perf_counter() - start
+
+        # Serileştirilmiş boyut index'in bellekteki boyutuna yakındır
+        bytes_per_frame = faiss.serialize_index(index).nbytes / args.vectors
+
+        candidates_k = args.k * args.rerank_candidates
+        params = index_factory.search_parameters(
+            index, args.k, nprobe=args.nprobe, ef_search=args.ef_search
+        )
+        rerank_params = index_factory.search_parameters(
+            index, candidates_k, nprobe=args.nprobe, ef_search=args.ef_search
+        )
+
+        latencies, found, reranked = [], [], []
+        for query in queries:
+            start = time.perf_counter()
+            _, indices = index.search(query.reshape(1, -1), args.k, params=params)
+            latencies.append((time.perf_counter() - start) * 1000)
+            found.append(indices[0])
+
+            _, candidates = index.search(
+                query.reshape(1, -1), candidates_k, params=rerank_params
+            )
+            candidates = candidates[0][candidates[0] >= 0]
+            order = np.argsort(-(vectors[candidates] @ query))[: args.k]
+            reranked.append(candidates[order])
+
+        if expected is None:
+            expected = found
+
+        recall = recall_at_k(found, expected, args.k)
+        reranked_recall = (
+            f"{recall_at_k(reranked, expected, args.k):>10.3f}"
+            if index_factory.is_lossy(index)
+            else f"{'-':>10}"
+        )
+
+        print(
+            f"{index_type:<10}{bytes_per_frame:>12.0f}{build_time:>10.1f}"
+            f"{recall:>10.3f}{reranked_recall}"
+            f"{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 99):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Frame decode stratejilerini karşılaştıran benchmark.
+
+Sentetik bir video üretir ve read/grab/seek modlarında örnekleme süresini ölçer.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_frame_decoding --duration 120 --fps 30
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+
+from benchmarks.video_utils import generate_test_video
+from core.video_processor import DECODE_MODES, VideoProcessor
+
+
+def run_mode(processor: VideoProcessor, video_path: Path, decode_mode: str):
+    """
+    Tek bir decode modunu çalıştırır.
+
+    Returns:
+        (geçen_süre, örneklenen_frame_numaraları) tuple'ı
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    start = time.perf_counter()
+    frame_numbers = [
+        frame_number
+        for _, frame_number, _, _ in processor._iter_sampled_frames(
+            cap, fps, total_frames, decode_mode, processor.frames_per_second
+        )
+    ]
+    elapsed = time.perf_counter() - start
+
+    cap.release()
+    return elapsed, frame_numbers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=120.0)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    processor = VideoProcessor()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        video_path = generate_test_video(
+            Path(tmp_dir) / "bench.mp4",
+            duration=args.duration,
+            fps=args.fps,
+            width=args.width,
+            height=args.height,
+        )
+
+        results = {mode: run_mode(processor, video_path, mode) for mode in DECODE_MODES}
+
+    baseline_time, baseline_frames = results["read"]
+
+    print(f"{'mode':<8}{'seconds':>10}{'frames':>10}{'speedup':>10}  same_frames")
+    for mode, (elapsed, frame_numbers) in results.items():
+        print(
+            f"{mode:<8}{elapsed:>10.3f}{len(frame_numbers):>10}"
+            f"{baseline_time / elapsed:>9.2f}x  {frame_numbers == baseline_frames}"
+        )
+
+
+if __name__ == "__main__":
+    main()
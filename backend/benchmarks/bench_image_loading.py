@@ -0,0 +1,104 @@
+"""
+FeatureExtractor görsel yükleme stratejilerini karşılaştıran benchmark.
+
+Sentetik JPEG'ler üretir ve seri yükleme ile thread pool'da önceden
+yükleme (prefetch) durumlarında saniyede işlenen görsel sayısını ölçer.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_image_loading --images 512 --workers 0 2 4 8
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from PIL import Image
+
+from core.feature_extractor import FeatureExtractor
+
+
+def generate_images(directory: Path, count: int, width: int, height: int) -> List[Path]:
+    """
+    Gürültülü sentetik JPEG görselleri üretir.
+
+    Returns:
+        Görsel yolları listesi
+    """
+    rng = np.random.default_rng(0)
+    paths = []
+
+    for i in range(count):
+        pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        path = directory / f"frame_{i:05d}.jpg"
+        Image.fromarray(pixels).save(path, quality=90)
+        paths.append(path)
+
+    return paths
+
+
+def run_workers(
+    extractor: FeatureExtractor,
+    image_paths: List[Path],
+    batch_size: int,
+    num_workers: int,
+    prefetch_batches: int,
+):
+    """
+    Tek bir worker ayarını çalıştırır.
+
+    Returns:
+        (geçen_süre, feature'lar) tuple'ı
+    """
+    start = time.perf_counter()
+    features = extractor.extract_image_features(
+        image_paths,
+        batch_size=batch_size,
+        num_workers=num_workers,
+        prefetch_batches=prefetch_batches,
+    )
+    return time.perf_counter() - start, features
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=512)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--prefetch", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4])
+    args = parser.parse_args()
+
+    extractor = FeatureExtractor()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        image_paths = generate_images(
+            Path(tmp_dir), args.images, args.width, args.height
+        )
+
+        # Model ısınması ölçüme dahil edilmez
+        extractor.extract_image_features(image_paths[: args.batch_size], num_workers=0)
+
+        results = {
+            workers: run_workers(
+                extractor, image_paths, args.batch_size, workers, args.prefetch
+            )
+            for workers in args.workers
+        }
+
+    baseline_time, baseline_features = results[args.workers[0]]
+
+    print(f"{'workers':<9}{'seconds':>10}{'images/s':>10}{'speedup':>10}  same_output")
+    for workers, (elapsed, features) in results.items():
+        print(
+            f"{workers:<9}{elapsed:>10.3f}{len(features) / elapsed:>10.1f}"
+            f"{baseline_time / elapsed:>9.2f}x  "
+            f"{np.allclose(features, baseline_features, atol=1e-4)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
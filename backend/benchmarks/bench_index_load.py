@@ -0,0 +1,153 @@
+"""
+Index açılış modlarını (belleğe okuma / memory-mapped) karşılaştıran benchmark.
+
+Farklı corpus boyutlarında index'leri kurup diske yazar, sonra her dosyayı
+ayrı bir process'te iki modda açar. Açılış süresini, ilk aramanın
+gecikmesini ve process'e özel (anonim) belleği raporlar. Memory-mapped
+modda index sayfaları dosyaya aittir ve aynı dosyayı açan worker'lar
+arasında paylaşılır; bu bellek 'shared MB' sütununda görünür.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_index_load --sizes 10000 100000 1000000 --index-types flat ivf_flat
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import faiss
+import numpy as np
+
+from core import index_factory
+
+LOAD_MODES = ("read", "mmap")
+
+
+def memory_mb() -> Dict[str, float]:
+    """
+    Process'in anonim (özel) ve dosyaya bağlı bellek kullanımını döndürür.
+
+    Sadece Linux'ta ölçülür; diğer sistemlerde boş sözlük döner.
+    """
+    status = Path("/proc/self/status")
+    if not status.exists():
+        return {}
+
+    fields = dict(
+        line.split(":", 1) for line in status.read_text().splitlines() if ":" in line
+    )
+    return {
+        name: int(fields[name].split()[0]) / 1024
+        for name in ("RssAnon", "RssFile")
+        if name in fields
+    }
+
+
+def load_once(path: str, mode: str, dim: int) -> Dict[str, float]:
+    """
+    Index'i verilen modda açar ve bir arama yapar (ayrı process'te çalışır).
+
+    Returns:
+        Süre ve bellek ölçümleri
+    """
+    before = memory_mb()
+
+    start = time.perf_counter()
+    index = index_factory.read_index(path, mmap=mode == "mmap")
+    load_ms = (time.perf_counter() - start) * 1000
+
+    query = np.random.default_rng(1).normal(size=(1, dim)).astype("float32")
+    faiss.normalize_L2(query)
+    params = index_factory.search_parameters(index, 10)
+
+    start = time.perf_counter()
+    index.search(query, 10, params=params)
+    first_query_ms = (time.perf_counter() - start) * 1000
+
+    after = memory_mb()
+
+    return {
+        "load_ms": load_ms,
+        "first_query_ms": first_query_ms,
+        "private_mb": after.get("RssAnon", 0) - before.get("RssAnon", 0),
+        "shared_mb": after.get("RssFile", 0) - before.get("RssFile", 0),
+    }
+
+
+def measure(path: Path, mode: str, dim: int) -> Dict[str, float]:
+    """
+    load_once'ı temiz bir process'te çalıştırır.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_index_load",
+            "--child",
+            str(path),
+            mode,
+            str(dim),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 500000])
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument(
+        "--index-types",
+        nargs="+",
+        default=["flat", "sq8", "ivf_flat"],
+        choices=index_factory.INDEX_TYPES,
+    )
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        path, mode, dim = args.child
+        print(json.dumps(load_once(path, mode, int(dim))))
+        return
+
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'index':<10}{'vectors':>10}{'file MB':>10}{'mode':>8}{'load ms':>10}"
+        f"{'query ms':>10}{'private MB':>12}{'shared MB':>12}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            vectors = rng.normal(size=(size, args.dim)).astype("float32")
+            faiss.normalize_L2(vectors)
+
+            for index_type in args.index_types:
+                path = Path(tmp_dir) / f"{index_type}_{size}.index"
+                index_factory.write_index(
+                    index_factory.build_index(vectors, index_type), str(path)
+                )
+                file_mb = path.stat().st_size / 2**20
+
+                for mode in LOAD_MODES:
+                    result = measure(path, mode, args.dim)
+                    print(
+                        f"{index_type:<10}{size:>10}{file_mb:>10.0f}{mode:>8}"
+                        f"{result['load_ms']:>10.1f}{result['first_query_ms']:>10.2f}"
+                        f"{result['private_mb']:>12.0f}{result['shared_mb']:>12.0f}"
+                    )
+
+                path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Inference backend'lerinin gecikmesini ve torch ile uyumunu ölçen benchmark.
+
+Image ve text tower'larını torch, ONNX fp32 ve ONNX int8 backend'lerinde
+çalıştırır; batch başına medyan gecikmeyi ve torch çıktısına göre en düşük
+cosine benzerliğini raporlar. Herhangi bir backend --min-cosine eşiğinin
+altında kalırsa çıkış kodu 1 olur (parity check olarak kullanılabilir).
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_inference_backends --image-batch 32 --repeats 10
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Callable, Dict
+
+import numpy as np
+import torch
+
+from core.feature_extractor import FeatureExtractor
+from core.inference_backends import OnnxEncoder, compare_encoders
+
+QUERIES = [
+    "a dog running on the beach",
+    "people sitting in a conference room",
+    "a red car driving through the city at night",
+    "close up of a person smiling",
+    "snowy mountains under a clear sky",
+    "a plate of food on a wooden table",
+    "a crowd at a football match",
+    "text on a whiteboard",
+]
+
+
+def measure(
+    encode: Callable[[Dict[str, torch.Tensor]], np.ndarray],
+    inputs: Dict[str, torch.Tensor],
+    repeats: int,
+) -> float:
+    """
+    Encode fonksiyonunu ısındırıp medyan çalışma süresini ölçer.
+
+    Returns:
+        Medyan süre (milisaniye)
+    """
+    encode(inputs)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encode(inputs)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--image-batch", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args()
+
+    extractor = FeatureExtractor(model_name=args.model, backend="torch")
+    tokenizer, _ = extractor._get_tower("text")
+
+    rng = np.random.default_rng(0)
+    images = [
+        rng.integers(0, 256, size=(360, 640, 3), dtype=np.uint8)
+        for _ in range(args.image_batch)
+    ]
+    inputs = {
+        "image": extractor._preprocess_images(images),
+        "query": tokenizer(QUERIES[:1], return_tensors="pt", padding=True),
+        "text": tokenizer(QUERIES, return_tensors="pt", padding=True),
+    }
+
+    def encoders(quantize: bool) -> Dict[str, OnnxEncoder]:
+        return {
+            tower: OnnxEncoder(
+                lambda tower=tower: extractor._load_tower_model(tower),
+                tower,
+                extractor.model_name,
+                extractor.device,
+                quantize=quantize,
+            )
+            for tower in ("image", "text")
+        }
+
+    backends = {
+        "torch": {tower: extractor._get_tower(tower)[1] for tower in ("image", "text")},
+        "onnx-fp32": encoders(quantize=False),
+        "onnx-int8": encoders(quantize=True),
+    }
+
+    print(
+        f"{'backend':<11}{'image ms':>10}{'query ms':>10}{'text ms':>10}"
+        f"{'image cos':>11}{'text cos':>10}"
+    )
+
+    failed = False
+    for name, backend in backends.items():
+        image_ms = measure(backend["image"].encode, inputs["image"], args.repeats)
+        query_ms = measure(backend["text"].encode, inputs["query"], args.repeats)
+        text_ms = measure(backend["text"].encode, inputs["text"], args.repeats)
+        parity = {
+            tower: compare_encoders(
+                backends["torch"][tower], backend[tower], inputs[tower]
+            )
+            for tower in ("image", "text")
+        }
+
+        failed |= min(parity.values()) < args.min_cosine
+
+        print(
+            f"{name:<11}{image_ms:>10.1f}{query_ms:>10.1f}{text_ms:>10.1f}"
+            f"{parity['image']:>11.4f}{parity['text']:>10.4f}"
+        )
+
+    print(
+        f"\nimage: batch of {args.image_batch}, query: 1 text, "
+        f"text: batch of {len(QUERIES)}"
+    )
+
+    if failed:
+        print(f"Parity check failed: cosine below {args.min_cosine}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
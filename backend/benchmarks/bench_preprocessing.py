@@ -0,0 +1,95 @@
+"""
+Frame preprocessing yollarını karşılaştıran mikro benchmark.
+
+Decoder çıktısına benzeyen uint8 RGB frame batch'lerini CLIPImageProcessor
+ile görsel görsel ve BatchImagePreprocessor ile batch halinde işler; batch
+başına süreyi ve iki yol arasındaki farkı raporlar.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_preprocessing --batch-size 32 --width 1280 --height 720
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+import numpy as np
+import torch
+from transformers import CLIPImageProcessor
+
+from core.image_preprocessing import BatchImagePreprocessor
+
+
+def measure(preprocess: Callable[[], torch.Tensor], repeats: int) -> float:
+    """
+    Preprocess fonksiyonunu ısındırıp medyan çalışma süresini ölçer.
+
+    Returns:
+        Medyan süre (milisaniye)
+    """
+    preprocess()
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        preprocess()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+
+def make_frames(count: int, width: int, height: int) -> List[np.ndarray]:
+    """
+    Rastgele uint8 RGB frame'ler üretir.
+    """
+    rng = np.random.default_rng(0)
+    return [
+        rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    processor = (
+        CLIPImageProcessor.from_pretrained(args.model)
+        if args.model
+        else CLIPImageProcessor()
+    )
+    preprocessor = BatchImagePreprocessor(processor)
+    frames = make_frames(args.batch_size, args.width, args.height)
+
+    def run_processor() -> torch.Tensor:
+        return processor(images=frames, return_tensors="pt")["pixel_values"]
+
+    def run_vectorized() -> torch.Tensor:
+        return preprocessor(frames)["pixel_values"]
+
+    processor_ms = measure(run_processor, args.repeats)
+    vectorized_ms = measure(run_vectorized, args.repeats)
+    difference = (run_processor() - run_vectorized()).abs()
+
+    print(f"{'path':<12}{'ms/batch':>10}{'frames/s':>10}{'speedup':>10}")
+    for name, elapsed in (("processor", processor_ms), ("vectorized", vectorized_ms)):
+        print(
+            f"{name:<12}{elapsed:>10.1f}{args.batch_size / elapsed * 1000:>10.1f}"
+            f"{processor_ms / elapsed:>9.2f}x"
+        )
+
+    print(
+        f"\n{args.batch_size} frames of {args.width}x{args.height}, "
+        f"torch threads: {torch.get_num_threads()}, "
+        f"max abs diff: {difference.max():.4f}, mean abs diff: {difference.mean():.5f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
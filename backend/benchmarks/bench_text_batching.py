@@ -0,0 +1,88 @@
+"""
+Eşzamanlı sorgularda mikro batch'lemenin etkisini ölçen benchmark.
+
+Aynı anda sorgu gönderen istemcileri thread'lerle taklit eder ve sorguları
+tek tek encode etmek ile TextBatcher üzerinden encode etmek arasındaki
+saniyede sorgu (QPS) farkını raporlar. Cache etkisini dışarıda bırakmak
+için her sorgu benzersizdir.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_text_batching --clients 16 --queries 512
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+import numpy as np
+
+from core.feature_extractor import FeatureExtractor
+from core.text_batcher import TextBatcher
+
+SUBJECTS = ["a dog", "a red car", "two people", "a city street", "a kitchen"]
+ACTIONS = ["at night", "in the rain", "from above", "on a sunny day", "in slow motion"]
+
+
+def make_queries(count: int) -> List[str]:
+    """
+    Birbirinden farklı sorgu metinleri üretir.
+    """
+    return [
+        f"{SUBJECTS[i % len(SUBJECTS)]} {ACTIONS[i // len(SUBJECTS) % len(ACTIONS)]} #{i}"
+        for i in range(count)
+    ]
+
+
+def run_clients(
+    encode: Callable[[str], np.ndarray], queries: List[str], clients: int
+) -> float:
+    """
+    Sorguları eşzamanlı istemcilerden gönderir.
+
+    Returns:
+        Saniyede işlenen sorgu sayısı
+    """
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(encode, queries))
+
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=512)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    extractor = FeatureExtractor()
+    extractor.extract_text_features("warm up")
+
+    queries = make_queries(args.queries)
+    batch_sizes = []
+
+    def encode_batch(texts: List[str]) -> np.ndarray:
+        batch_sizes.append(len(texts))
+        return extractor.extract_text_features(texts)
+
+    batcher = TextBatcher(encode_batch, args.max_batch_size, args.max_wait_ms)
+
+    single_qps = run_clients(extractor.extract_text_features, queries, args.clients)
+    batched_qps = run_clients(batcher.encode, queries, args.clients)
+    batcher.close()
+
+    print(f"{'mode':<10}{'qps':>10}{'speedup':>10}")
+    print(f"{'single':<10}{single_qps:>10.1f}{1:>9.2f}x")
+    print(f"{'batched':<10}{batched_qps:>10.1f}{batched_qps / single_qps:>9.2f}x")
+    print(
+        f"\n{args.clients} clients, {len(batch_sizes)} batches, "
+        f"mean batch size {np.mean(batch_sizes):.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
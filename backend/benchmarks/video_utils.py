@@ -0,0 +1,109 @@
+"""
+Benchmark'lar için ortak yardımcı fonksiyonlar.
+
+Sentetik test videoları üretir.
+"""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+def generate_test_video(
+    output_path: Path,
+    duration: float = 60.0,
+    fps: float = 30.0,
+    width: int = 640,
+    height: int = 360,
+) -> Path:
+    """
+    Hareketli bir kare içeren sentetik test videosu üretir.
+
+    Args:
+        output_path: Oluşturulacak video dosya yolu (.mp4)
+        duration: Video süresi (saniye)
+        fps: Video FPS değeri
+        width: Video genişliği
+        height: Video yüksekliği
+
+    Returns:
+        Oluşturulan video dosya yolu
+    """
+    output_path = Path(output_path)
+    writer = cv2.VideoWriter(
+        str(output_path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height)
+    )
+
+    total_frames = int(duration * fps)
+    box = max(8, height // 6)
+
+    for frame_number in range(total_frames):
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        x = (frame_number * 4) % max(1, width - box)
+        y = (frame_number * 2) % max(1, height - box)
+        frame[y : y + box, x : x + box] = (0, 200, 255)
+        cv2.putText(
+            frame,
+            str(frame_number),
+            (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.0,
+            (255, 255, 255),
+            2,
+        )
+        writer.write(frame)
+
+    writer.release()
+    return output_path
+
+
+def generate_scene_video(
+    output_path: Path,
+    scene_lengths: list,
+    fps: float = 30.0,
+    width: int = 640,
+    height: int = 360,
+    fourcc: str = "mp4v",
+) -> Path:
+    """
+    Her sahnesi sabit bir görüntüden oluşan sentetik test videosu üretir.
+
+    Args:
+        output_path: Oluşturulacak video dosya yolu (.mp4)
+        scene_lengths: Sahne süreleri listesi (saniye)
+        fps: Video FPS değeri
+        width: Video genişliği
+        height: Video yüksekliği
+        fourcc: Video codec'i. Sabit karelerin birebir korunması gerekiyorsa
+                .avi dosyasıyla birlikte 'MJPG' kullanılabilir.
+
+    Returns:
+        Oluşturulan video dosya yolu
+    """
+    output_path = Path(output_path)
+    writer = cv2.VideoWriter(
+        str(output_path), cv2.VideoWriter_fourcc(*fourcc), fps, (width, height)
+    )
+
+    for scene, scene_length in enumerate(scene_lengths):
+        # Her sahne farklı bir yöne dönük gradyan ve kare içerir
+        gradient = np.linspace(0, 255, width if scene % 2 == 0 else height)
+        if scene % 2 == 0:
+            plane = np.tile(gradient, (height, 1))
+        else:
+            plane = np.tile(gradient[:, None], (1, width))
+
+        frame = np.stack(
+            [plane, np.full_like(plane, (scene * 80) % 256), 255 - plane], axis=-1
+        ).astype(np.uint8)
+
+        box = height // 3
+        x = (scene * width // 4) % (width - box)
+        frame[box : 2 * box, x : x + box] = 255
+
+        for _ in range(int(scene_length * fps)):
+            writer.write(frame)
+
+    writer.release()
+    return output_path
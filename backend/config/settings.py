@@ -18,9 +18,63 @@ class Settings:
         FRAME_EXTRACTION_DIR: Çıkarılan frame'lerin saklanacağı dizin
         FAISS_INDEX_PATH: FAISS index dosya yolu
         METADATA_PATH: Video metadata dosya yolu
+        INDEX_MMAP: Index dosyası belleğe kopyalanmak yerine memory-mapped açılsın mı
+        COMPACTION_SHARDS: Bu kadar shard birikince arka planda yeni snapshot yazılır
+        INDEX_DELTA_MAX_VECTORS: Ana index'e eklenmeden aranan yeni vektörlerin üst sınırı
+        INDEX_TYPE: FAISS index tipi (auto/flat/ivf_flat/ivf_pq/hnsw/fp16/sq8/pq)
+        ANN_INDEX_TYPE: auto modunda corpus büyüdüğünde geçilecek ANN index tipi
+        ANN_MIN_VECTORS: ANN index'e geçiş (ve IVF eğitimi) için minimum vektör sayısı
+        ANN_DOWNGRADE_RATIO: ANN index'ten Flat'e dönüş eşiğinin ANN_MIN_VECTORS'a oranı
+        IVF_NLIST: IVF küme sayısı (0: 4 * sqrt(N))
+        IVF_PQ_M: IVF-PQ alt quantizer sayısı (0: embedding boyutu / 8)
+        HNSW_M: HNSW grafında düğüm başına bağlantı sayısı
+        HNSW_EF_CONSTRUCTION: HNSW grafı kurulurken kullanılan kuyruk boyutu
+        HNSW_REBUILD_RATIO: Silinmiş vektör oranı bunu aşınca HNSW yeniden kurulur
+        DEFAULT_NPROBE: IVF aramasında varsayılan taranacak liste sayısı
+        DEFAULT_EF_SEARCH: HNSW aramasında varsayılan kuyruk boyutu
+        EXACT_RERANK: Sıkıştırılmış index sonuçları tam vektörlerle yeniden skorlansın mı
+        RERANK_CANDIDATES: Yeniden skorlama için alınan aday sayısı (k'nın katı)
         DEVICE: İşlem için kullanılacak cihaz (cpu/cuda)
         MODEL_NAME: Kullanılacak CLIP model ismi
+        MODEL_WARMUP_TOWERS: Başlangıçta arka planda ısıtılacak tower'lar (image/text)
+        INFERENCE_BACKEND: Model inference backend'i (torch/onnx)
+        ONNX_MODEL_DIR: Export edilen ONNX modellerinin saklanacağı dizin
+        ONNX_QUANTIZE: ONNX backend'inde dinamik int8 quantization kullanılsın mı
+        ONNX_THREADS: ONNX Runtime intra-op thread sayısı (0: otomatik)
+        TEXT_CACHE_SIZE: Cache'te tutulacak sorgu embedding'i sayısı (0: kapalı)
+        TEXT_CACHE_PATH: Sorgu embedding cache'inin kaydedileceği dosya (boşsa kaydedilmez)
+        TEXT_BATCH_MAX_SIZE: Tek forward pass'te birleştirilecek maksimum sorgu sayısı
+        TEXT_BATCH_WAIT_MS: İlk sorgudan sonra diğer sorgular için bekleme süresi (ms)
+        IMAGE_LOADER_WORKERS: Görselleri yükleyip preprocess eden thread sayısı
+        IMAGE_PREFETCH_BATCHES: Model çalışırken önceden hazırlanan batch sayısı
+        VECTORIZED_PREPROCESSING: Frame dizileri batch halinde torch ile mi preprocess edilsin
+        FRAME_EMBEDDING_STORE: Frame embedding'leri içerik hash'ine göre diskte saklansın mı
+        FRAME_EMBEDDING_DIR: Frame embedding deposunun dizini (model ve backend başına alt dizin)
+        FRAME_EMBEDDING_SHARD_ROWS: Bir embedding shard dosyasındaki maksimum satır sayısı
         FRAMES_PER_SECOND: Saniyede kaç frame çıkarılacağı
+        SAMPLING_STRATEGY: Varsayılan örnekleme stratejisi (fixed/keyframe/adaptive)
+        ADAPTIVE_MIN_FPS: Adaptive örneklemede hareketsiz sahnelerdeki örnekleme hızı
+        ADAPTIVE_MAX_FPS: Adaptive örneklemede hareketli sahnelerdeki örnekleme hızı
+        ADAPTIVE_MOTION_THRESHOLD: Maksimum hıza geçilen hareket skoru
+        FRAME_DECODE_MODE: Frame decode stratejisi (read/grab/seek)
+        SEEK_MIN_FRAME_GAP: Seek modunda konumlanma yapılacak minimum frame aralığı
+        EXTRACTION_WORKERS: Paralel frame extraction için process sayısı
+        PARALLEL_EXTRACTION_MIN_DURATION: Paralel extraction için minimum video süresi
+        PARALLEL_EXTRACTION_CHUNK_SECONDS: Paralel extraction'da bir aralığın süresi
+        INGEST_BATCH_SIZE: Ingestion sırasında embedding batch boyutu
+        INGEST_QUEUE_SIZE: Decoder ile model arasındaki kuyruğun maksimum frame sayısı
+        THUMBNAIL_WORKERS: Thumbnail yazan thread sayısı
+        INGEST_COMMIT_FRAMES: Uzun videoların index'e parça parça eklendiği frame sayısı
+        FRAME_DEDUP_METHOD: Near-duplicate frame atlama yöntemi (none/histogram/phash)
+        FRAME_DEDUP_THRESHOLD: Frame'lerin tekrar sayılacağı maksimum imza mesafesi
+        FRAME_DEDUP_MAX_SPAN: Tek bir frame'in temsil edebileceği maksimum süre
+        SEARCH_WORKERS: Arama işlerini (sorgu encode + FAISS) çalıştıran thread sayısı
+        SEARCH_MAX_PENDING: Çalışanlar doluyken sırada bekleyebilecek arama sayısı
+        UPLOAD_WORKERS: Upload işlerini (kopyalama, decode, embedding) çalıştıran thread sayısı
+        UPLOAD_MAX_PENDING: Çalışanlar doluyken sırada bekleyebilecek upload sayısı
+        PENDING_UPLOAD_DIR: İşlenmeyi bekleyen upload dosyalarının dizini
+        JOB_DB_PATH: Ingestion iş kuyruğunun SQLite veritabanı dosyası
+        INGEST_JOB_WORKERS: Aynı anda işlenen upload (ingestion işi) sayısı
         MAX_VIDEO_SIZE_MB: Maksimum video boyutu (MB)
         ALLOWED_VIDEO_FORMATS: İzin verilen video formatları
     """
@@ -29,25 +83,126 @@ class Settings:
     PROJECT_ROOT: Path = Path(__file__).parent.parent
     UPLOAD_DIR: Path = PROJECT_ROOT / "uploads"
     FRAME_EXTRACTION_DIR: Path = PROJECT_ROOT / "frames"
+    PENDING_UPLOAD_DIR: Path = UPLOAD_DIR / "pending"
 
     # Index ve metadata yolları
     FAISS_INDEX_PATH: str = "video_faiss.index"
     METADATA_PATH: str = "video_metadata.npy"
+    # Worker process'leri index'i işletim sisteminin sayfa önbelleğinden paylaşır
+    INDEX_MMAP: bool = os.getenv("INDEX_MMAP", "true").lower() == "true"
+    # Her upload küçük bir shard yazar; shard'lar bu sayıya ulaşınca birleştirilir
+    COMPACTION_SHARDS: int = int(os.getenv("COMPACTION_SHARDS", "8"))
+    # Yeni vektörler önce doğrudan taranan küçük bir delta'da tutulur; ana index
+    # sadece delta bu boyuta ulaşınca kopyalanıp genişletilir
+    INDEX_DELTA_MAX_VECTORS: int = int(os.getenv("INDEX_DELTA_MAX_VECTORS", "8192"))
+
+    # Index tipi ayarları
+    # auto: corpus ANN_MIN_VECTORS'a ulaşana kadar flat, sonra ANN_INDEX_TYPE
+    INDEX_TYPE: str = os.getenv("INDEX_TYPE", "auto")
+    ANN_INDEX_TYPE: str = os.getenv("ANN_INDEX_TYPE", "hnsw")
+    ANN_MIN_VECTORS: int = int(os.getenv("ANN_MIN_VECTORS", "100000"))
+    # ANN index'i corpus ANN_MIN_VECTORS'un bu oranının altına inince Flat'e döner
+    ANN_DOWNGRADE_RATIO: float = float(os.getenv("ANN_DOWNGRADE_RATIO", "0.5"))
+    IVF_NLIST: int = int(os.getenv("IVF_NLIST", "0"))
+    IVF_PQ_M: int = int(os.getenv("IVF_PQ_M", "0"))
+    HNSW_M: int = 32
+    HNSW_EF_CONSTRUCTION: int = 128
+    HNSW_REBUILD_RATIO: float = 0.2
+    DEFAULT_NPROBE: int = int(os.getenv("DEFAULT_NPROBE", "16"))
+    DEFAULT_EF_SEARCH: int = int(os.getenv("DEFAULT_EF_SEARCH", "64"))
+    # Kayıplı index'lerde (fp16/sq8/pq/ivf_pq) adaylar diskteki tam vektörlerle sıralanır
+    EXACT_RERANK: bool = os.getenv("EXACT_RERANK", "true").lower() == "true"
+    RERANK_CANDIDATES: int = 4
 
     # Model ayarları
     DEVICE: Optional[str] = os.getenv("DEVICE", "cpu")
     MODEL_NAME: str = "openai/clip-vit-base-patch32"
+    # Virgülle ayrılmış liste; sadece arama yapan instance'larda "text" yeterlidir
+    MODEL_WARMUP_TOWERS: list = [
+        tower for tower in os.getenv("MODEL_WARMUP_TOWERS", "text").split(",") if tower
+    ]
+
+    # Inference backend ayarları
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "torch")
+    ONNX_MODEL_DIR: Path = PROJECT_ROOT / "onnx_models"
+    ONNX_QUANTIZE: bool = os.getenv("ONNX_QUANTIZE", "false").lower() == "true"
+    ONNX_THREADS: int = int(os.getenv("ONNX_THREADS", "0"))
+
+    # Sorgu embedding cache ayarları
+    TEXT_CACHE_SIZE: int = int(os.getenv("TEXT_CACHE_SIZE", "1024"))
+    TEXT_CACHE_PATH: Optional[str] = os.getenv("TEXT_CACHE_PATH")
+
+    # Eşzamanlı sorguların mikro batch'lenmesi
+    TEXT_BATCH_MAX_SIZE: int = int(os.getenv("TEXT_BATCH_MAX_SIZE", "32"))
+    TEXT_BATCH_WAIT_MS: float = float(os.getenv("TEXT_BATCH_WAIT_MS", "5.0"))
+
+    # Görsel yükleme ayarları (0 worker: yükleme ana thread'de yapılır)
+    IMAGE_LOADER_WORKERS: int = int(os.getenv("IMAGE_LOADER_WORKERS", "4"))
+    IMAGE_PREFETCH_BATCHES: int = 2
+    VECTORIZED_PREPROCESSING: bool = (
+        os.getenv("VECTORIZED_PREPROCESSING", "true").lower() == "true"
+    )
+
+    # Frame embedding deposu (yeniden index'lemede aynı frame'ler için model çalışmaz)
+    FRAME_EMBEDDING_STORE: bool = (
+        os.getenv("FRAME_EMBEDDING_STORE", "true").lower() == "true"
+    )
+    FRAME_EMBEDDING_DIR: Path = PROJECT_ROOT / "embeddings"
+    FRAME_EMBEDDING_SHARD_ROWS: int = 65536
 
     # Video işleme ayarları
     FRAMES_PER_SECOND: int = 1  # Her saniyeden 1 frame çıkar
     MAX_VIDEO_SIZE_MB: int = 500  # Maksimum 500MB
     ALLOWED_VIDEO_FORMATS: set = {".mp4", ".avi", ".mov", ".mkv", ".webm"}
 
+    # Örnekleme stratejisi ayarları (upload başına değiştirilebilir)
+    # fixed: sabit hız, keyframe: sadece I-frame'ler, adaptive: harekete göre
+    SAMPLING_STRATEGY: str = os.getenv("SAMPLING_STRATEGY", "fixed")
+    ADAPTIVE_MIN_FPS: float = 0.2  # Hareketsiz sahnede 5 saniyede bir frame
+    ADAPTIVE_MAX_FPS: float = 4.0  # Hareketli sahnede saniyede 4 frame
+    ADAPTIVE_MOTION_THRESHOLD: float = 0.05  # Ortalama piksel farkı (0-1)
+
+    # Frame decode ayarları
+    # read: her frame decode edilir, grab: sadece örneklenen frame'ler decode edilir,
+    # seek: örnekler arası boşluk büyükse doğrudan hedef frame'e konumlanılır
+    FRAME_DECODE_MODE: str = os.getenv("FRAME_DECODE_MODE", "grab")
+    SEEK_MIN_FRAME_GAP: int = 120  # Bu değerden kısa boşluklar grab() ile geçilir
+
+    # Paralel frame extraction ayarları
+    EXTRACTION_WORKERS: int = int(
+        os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1))
+    )
+    PARALLEL_EXTRACTION_MIN_DURATION: float = 300.0  # Daha kısa videolar seri işlenir
+    # Worker'ların bir seferde decode ettiği süre; bekleyen frame belleğini sınırlar
+    PARALLEL_EXTRACTION_CHUNK_SECONDS: float = 30.0
+
+    # Akış tabanlı ingestion ayarları
+    INGEST_BATCH_SIZE: int = 32
+    INGEST_QUEUE_SIZE: int = 64
+    THUMBNAIL_WORKERS: int = 2
+    # Video işlenirken bu kadar frame biriktikçe index'e eklenir ve aranabilir olur
+    INGEST_COMMIT_FRAMES: int = int(os.getenv("INGEST_COMMIT_FRAMES", "256"))
+
+    # Near-duplicate frame atlama ayarları
+    FRAME_DEDUP_METHOD: str = os.getenv("FRAME_DEDUP_METHOD", "phash")
+    FRAME_DEDUP_THRESHOLD: float = 0.1  # 0-1 aralığında imza mesafesi
+    FRAME_DEDUP_MAX_SPAN: float = 30.0  # Sabit sahnede bile bu sürede bir frame tutulur
+
     # API ayarları
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     CORS_ORIGINS: list = ["*"]
 
+    # İstek havuzları: dolduklarında yeni istekler 503 ile reddedilir
+    SEARCH_WORKERS: int = int(os.getenv("SEARCH_WORKERS", "8"))
+    SEARCH_MAX_PENDING: int = int(os.getenv("SEARCH_MAX_PENDING", "64"))
+    UPLOAD_WORKERS: int = int(os.getenv("UPLOAD_WORKERS", "1"))
+    UPLOAD_MAX_PENDING: int = int(os.getenv("UPLOAD_MAX_PENDING", "4"))
+
+    # Ingestion iş kuyruğu (upload hemen döner, video arka planda işlenir)
+    JOB_DB_PATH: str = os.getenv("JOB_DB_PATH", "ingestion_jobs.db")
+    INGEST_JOB_WORKERS: int = int(os.getenv("INGEST_JOB_WORKERS", "2"))
+
     # Arama ayarları
     DEFAULT_TOP_K: int = 30
     MIN_SIMILARITY_THRESHOLD: float = 0.1
@@ -63,6 +218,7 @@ class Settings:
         Uygulama başlarken upload ve frame extraction dizinlerini oluşturur.
         """
         cls.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        cls.PENDING_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
         cls.FRAME_EXTRACTION_DIR.mkdir(parents=True, exist_ok=True)
 
     @classmethod
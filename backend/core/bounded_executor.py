@@ -0,0 +1,127 @@
+"""
+Bu modül CPU yoğun işleri event loop dışında, sınırlı kapasiteli thread
+havuzlarında çalıştırır. Havuz dolduğunda iş kuyruğa alınmak yerine
+reddedilir; API bu durumda 503 döndürerek yükü istemciye geri yansıtır.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """
+    Havuzda bekleyen iş sayısı sınıra ulaştığında fırlatılır.
+    """
+
+
+class BoundedExecutor:
+    """
+    Aynı anda çalışan ve bekleyen iş sayısı sınırlı thread havuzu.
+
+    En fazla max_workers iş paralel çalışır, max_pending iş de sırada
+    bekleyebilir. Daha fazla iş gönderildiğinde ExecutorSaturatedError
+    fırlatılır; böylece bir iş türünün yükü diğer havuzlardaki işlerin
+    gecikmesini artırmaz.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        """
+        BoundedExecutor instance'ı oluşturur.
+
+        Args:
+            name: Havuzun adı (thread isimlerinde ve loglarda kullanılır)
+            max_workers: Paralel çalışan iş sayısı
+            max_pending: Çalışanlara ek olarak sırada bekleyebilecek iş sayısı
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(0, max_pending)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=name
+        )
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self._lock = threading.Lock()
+        self._active = 0
+
+    @property
+    def active(self) -> int:
+        """
+        Çalışan ve sırada bekleyen iş sayısı.
+        """
+        return self._active
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        İşi havuza gönderir.
+
+        Args:
+            fn: Çalıştırılacak fonksiyon
+            *args: Fonksiyonun argümanları
+            **kwargs: Fonksiyonun keyword argümanları
+
+        Returns:
+            İşin sonucunu taşıyan Future
+
+        Raises:
+            ExecutorSaturatedError: Havuz ve kuyruğu doluysa
+        """
+        if not self._slots.acquire(blocking=False):
+            logger.warning(f"{self.name} executor is saturated ({self._active} jobs)")
+            raise ExecutorSaturatedError(f"{self.name} executor is saturated")
+
+        with self._lock:
+            self._active += 1
+
+        try:
+            return self._executor.submit(self._run_job, fn, args, kwargs)
+        except Exception:
+            self._release()
+            raise
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """
+        İşi havuzda çalıştırır ve sonucunu event loop'u bloklamadan bekler.
+
+        Args:
+            fn: Çalıştırılacak fonksiyon
+            *args: Fonksiyonun argümanları
+            **kwargs: Fonksiyonun keyword argümanları
+
+        Returns:
+            Fonksiyonun dönüş değeri
+
+        Raises:
+            ExecutorSaturatedError: Havuz ve kuyruğu doluysa
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """
+        Yeni iş kabul etmeyi bırakır ve çalışan işlerin bitmesini bekler.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _run_job(self, fn: Callable, args: tuple, kwargs: dict):
+        """
+        İşi çalıştırır; kapasite sonuç Future'a yazılmadan önce serbest bırakılır.
+        """
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """
+        Biten işin kapasitesini serbest bırakır.
+        """
+        with self._lock:
+            self._active -= 1
+
+        self._slots.release()
@@ -0,0 +1,213 @@
+"""
+Bu modül metin sorgusu embedding'leri için sınırlı boyutlu bir LRU cache sağlar.
+Sık tekrar eden sorgularda text tower'ı hiç çalıştırmadan embedding döndürür.
+"""
+
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Thread-safe LRU embedding cache'i.
+
+    Anahtarlar (model_ismi, normalize_sorgu) çiftleridir; böylece model
+    değiştiğinde eski embedding'ler kullanılmaz. Değerler L2 normalize
+    edilmiş, salt okunur float32 vektörlerdir.
+    """
+
+    def __init__(self, max_size: int = 1024, persist_path: Optional[str] = None):
+        """
+        EmbeddingCache instance'ı oluşturur.
+
+        Args:
+            max_size: Cache'te tutulacak maksimum embedding sayısı
+            persist_path: Cache'in kaydedileceği dosya yolu (None ise diske yazılmaz)
+        """
+        self.max_size = max_size
+        self.persist_path = persist_path
+
+        self._entries: OrderedDict[Tuple[str, str], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.persist_path:
+            self.load()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Sorguyu cache anahtarı için normalize eder.
+
+        CLIP tokenizer metni küçük harfe çevirip boşluklara göre böldüğü için
+        büyük/küçük harf ve boşluk farkları aynı embedding'i üretir.
+
+        Args:
+            query: Ham sorgu metni
+
+        Returns:
+            Normalize edilmiş sorgu
+        """
+        return " ".join(query.split()).lower()
+
+    def get(self, model_name: str, query: str) -> Optional[np.ndarray]:
+        """
+        Sorgunun cache'teki embedding'ini döndürür.
+
+        Args:
+            model_name: Embedding'i üreten model ismi
+            query: Sorgu metni
+
+        Returns:
+            Embedding vektörü veya cache'te yoksa None
+        """
+        key = (model_name, self.normalize_query(query))
+
+        with self._lock:
+            embedding = self._entries.get(key)
+
+            if embedding is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, model_name: str, query: str, embedding: np.ndarray) -> np.ndarray:
+        """
+        Sorgunun embedding'ini normalize edip cache'e ekler.
+
+        Cache doluysa en uzun süredir kullanılmayan kayıt çıkarılır.
+
+        Args:
+            model_name: Embedding'i üreten model ismi
+            query: Sorgu metni
+            embedding: Embedding vektörü
+
+        Returns:
+            Cache'e eklenen normalize edilmiş embedding
+        """
+        embedding = _normalize(embedding)
+
+        if self.max_size <= 0:
+            return embedding
+
+        key = (model_name, self.normalize_query(query))
+
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return embedding
+
+    def stats(self) -> Dict:
+        """
+        Cache istatistiklerini döndürür.
+
+        Returns:
+            hits, misses, hit_rate, size ve max_size içeren sözlük
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+    def clear(self) -> None:
+        """
+        Cache'i ve sayaçları temizler.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self) -> None:
+        """
+        Cache kayıtlarını persist_path'e kaydeder.
+        """
+        if not self.persist_path:
+            return
+
+        with self._lock:
+            entries = list(self._entries.items())
+
+        path = Path(self.persist_path)
+        tmp_path = path.with_name(path.name + ".tmp")
+
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entries, f)
+
+        tmp_path.replace(path)
+
+        logger.info(f"Saved {len(entries)} cached text embeddings to {path}")
+
+    def load(self) -> bool:
+        """
+        Kaydedilmiş cache kayıtlarını persist_path'ten yükler.
+
+        Cache kapalıysa (max_size <= 0) hiçbir kayıt yüklenmez.
+
+        Returns:
+            Yükleme başarılıysa True, değilse False
+        """
+        if self.max_size <= 0:
+            return False
+
+        if not self.persist_path or not Path(self.persist_path).exists():
+            return False
+
+        try:
+            with open(self.persist_path, "rb") as f:
+                entries = pickle.load(f)
+
+        # Bozuk veya eski formattaki cache dosyası boş cache ile başlatılır
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as e:
+            logger.error(f"Error loading embedding cache: {e}")
+            return False
+
+        with self._lock:
+            self._entries = OrderedDict(
+                (key, _normalize(embedding))
+                for key, embedding in entries[-self.max_size :]
+            )
+
+        logger.info(
+            f"Loaded {len(self._entries)} cached text embeddings from {self.persist_path}"
+        )
+
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _normalize(embedding: np.ndarray) -> np.ndarray:
+    """Vektörü L2 normalize edip salt okunur float32 kopyasını döndürür."""
+    embedding = np.array(embedding, dtype="float32").reshape(-1)
+    norm = np.linalg.norm(embedding)
+
+    if norm > 0:
+        embedding /= norm
+
+    embedding.setflags(write=False)
+    return embedding
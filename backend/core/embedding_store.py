@@ -0,0 +1,304 @@
+"""
+Bu modül frame embedding'lerini içerik hash'ine göre diskte saklar.
+Aynı frame'ler yeniden index'lenirken (video silinip tekrar yüklendiğinde,
+index tipi değiştiğinde vb.) model yerine diskteki embedding'ler kullanılır.
+"""
+
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:
+    # Windows'ta dosya kilidi yoktur; depo tek bir process'ten kullanılmalıdır
+    fcntl = None
+
+logger = get_logger(__name__)
+
+# Anahtarlar sabit uzunluklu içerik hash'leridir (blake2b, 16 byte)
+KEY_SIZE = 16
+
+
+class EmbeddingStore:
+    """
+    Append-only, memory-mapped embedding deposu.
+
+    Embedding'ler float16 olarak shard dosyalarına, anahtarları ise aynı
+    sırayla yanlarındaki key dosyalarına eklenir:
+
+        meta.json              embedding boyutu
+        shard_00000.f16        (N, dim) float16 satırları
+        shard_00000.keys       N adet 16 byte'lık anahtar
+
+    Bir satırın embedding'i anahtarından önce yazılır; yarım kalan bir yazma
+    açılışta iki dosyanın ortak uzunluğuna kırpılarak temizlenir.
+
+    Aynı dizini birden fazla process (ör. birden fazla API worker'ı)
+    kullanabilir: eklemeler dizindeki writer.lock dosyasının kilidi altında
+    yapılır ve her ekleme önce diğer process'lerin eklediği satırları okur.
+    Okumalar kilit almaz; sadece tamamı yazılmış satırları görür.
+    """
+
+    def __init__(self, directory: Path, shard_rows: int = 65536):
+        """
+        EmbeddingStore instance'ı oluşturur ve mevcut anahtarları yükler.
+
+        Args:
+            directory: Deponun dizini (model başına ayrı olmalıdır)
+            shard_rows: Bir shard dosyasındaki maksimum satır sayısı
+        """
+        self.directory = Path(directory)
+        self.shard_rows = shard_rows
+        self.dim: Optional[int] = None
+
+        self._lock = threading.Lock()
+        # Anahtar -> (shard numarası, satır numarası)
+        self._locations: Dict[bytes, Tuple[int, int]] = {}
+        self._shard_sizes: List[int] = []
+        self._maps: Dict[int, np.memmap] = {}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.directory / "writer.lock"
+
+        with self._file_lock():
+            self._scan()
+
+        logger.info(
+            f"Loaded {len(self._locations)} stored embeddings from {self.directory}"
+        )
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._locations
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def get(self, keys: Sequence[bytes]) -> np.ndarray:
+        """
+        Anahtarların embedding'lerini döndürür.
+
+        Args:
+            keys: Depoda bulunan anahtarlar
+
+        Returns:
+            (N, dim) float32 embedding dizisi
+
+        Raises:
+            KeyError: Anahtarlardan biri depoda yoksa
+        """
+        features = np.empty((len(keys), self.dim or 0), dtype="float32")
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                shard, row = self._locations[key]
+                features[i] = self._shard_map(shard)[row]
+
+        return features
+
+    def put(self, keys: Sequence[bytes], features: np.ndarray) -> None:
+        """
+        Depoda olmayan anahtarların embedding'lerini ekler.
+
+        Args:
+            keys: İçerik anahtarları
+            features: Anahtarlarla aynı sıradaki (N, dim) embedding'ler
+        """
+        if len(keys) != len(features):
+            raise ValueError(
+                f"Keys count ({len(keys)}) doesn't match features count ({len(features)})"
+            )
+
+        with self._lock, self._file_lock():
+            # Diğer process'lerin eklediği satırlar tekrar yazılmaz
+            self._scan()
+
+            if self.dim is None:
+                self.dim = int(features.shape[1])
+                (self.directory / "meta.json").write_text(json.dumps({"dim": self.dim}))
+
+            if features.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {features.shape[1]} doesn't match store "
+                    f"dimension {self.dim}"
+                )
+
+            # Depoda olmayan ve batch içinde tekrar etmeyen satırlar
+            new_rows: Dict[bytes, int] = {}
+            for i, key in enumerate(keys):
+                if key not in self._locations and key not in new_rows:
+                    new_rows[key] = i
+
+            new_keys = list(new_rows)
+            new_features = features[list(new_rows.values())].astype("float16")
+
+            while new_keys:
+                shard = self._writable_shard()
+                count = min(len(new_keys), self.shard_rows - self._shard_sizes[shard])
+                self._append(shard, new_keys[:count], new_features[:count])
+
+                new_keys = new_keys[count:]
+                new_features = new_features[count:]
+
+    def stats(self) -> Dict:
+        """
+        Depo istatistiklerini döndürür.
+
+        Returns:
+            entries, shards ve dim içeren sözlük
+        """
+        return {
+            "entries": len(self._locations),
+            "shards": len(self._shard_sizes),
+            "dim": self.dim,
+        }
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """
+        Depo dizininin process'ler arası yazma kilidini tutar.
+        """
+        if fcntl is None:
+            yield
+            return
+
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _scan(self) -> None:
+        """
+        Meta verisini ve shard'lara bu instance'ın bilmediği satırları yükler.
+
+        Açılışta tüm shard'lar, sonraki çağrılarda sadece son bilinen shard
+        ve yeni shard'lar okunur. Çağıran dosya kilidini tutmalıdır; kilit
+        altında görülen yarım bir yazma ancak çökmüş bir yazıcıdan kalmış
+        olabilir ve kırpılır.
+        """
+        if self.dim is None:
+            meta_path = self.directory / "meta.json"
+            if not meta_path.exists():
+                return
+
+            self.dim = json.loads(meta_path.read_text())["dim"]
+
+        row_size = self.dim * 2
+        first = max(len(self._shard_sizes) - 1, 0)
+        keys_paths = sorted(self.directory.glob("shard_*.keys"))
+
+        for shard, keys_path in enumerate(keys_paths[first:], first):
+            known = self._shard_sizes[shard] if shard < len(self._shard_sizes) else 0
+            data_path = keys_path.with_suffix(".f16")
+            data_size = data_path.stat().st_size if data_path.exists() else 0
+
+            with open(keys_path, "rb") as f:
+                f.seek(known * KEY_SIZE)
+                keys = f.read()
+
+            keys_size = known * KEY_SIZE + len(keys)
+            rows = min(keys_size // KEY_SIZE, data_size // row_size)
+
+            # Yarım kalmış yazmaları temizle
+            if keys_size != rows * KEY_SIZE or data_size != rows * row_size:
+                logger.warning(f"Truncating incomplete embedding shard {keys_path}")
+                with open(keys_path, "r+b") as f:
+                    f.truncate(rows * KEY_SIZE)
+                with open(data_path, "ab") as f:
+                    f.truncate(rows * row_size)
+
+            for row in range(known, rows):
+                offset = (row - known) * KEY_SIZE
+                self._locations.setdefault(
+                    keys[offset : offset + KEY_SIZE], (shard, row)
+                )
+
+            if shard < len(self._shard_sizes):
+                self._shard_sizes[shard] = rows
+            else:
+                self._shard_sizes.append(rows)
+
+            if rows != known:
+                self._maps.pop(shard, None)
+
+    def _writable_shard(self) -> int:
+        """
+        Yazılabilir son shard'ın numarasını döndürür, doluysa yenisini açar.
+        """
+        if not self._shard_sizes or self._shard_sizes[-1] >= self.shard_rows:
+            self._shard_sizes.append(0)
+
+        return len(self._shard_sizes) - 1
+
+    def _append(self, shard: int, keys: List[bytes], features: np.ndarray) -> None:
+        """
+        Satırları shard dosyalarının sonuna ekler.
+
+        Embedding'ler anahtarlardan önce yazılır; böylece bir anahtar asla
+        yazılmamış bir satırı göstermez.
+        """
+        with open(self._shard_path(shard, ".f16"), "ab") as f:
+            f.write(np.ascontiguousarray(features).tobytes())
+
+        with open(self._shard_path(shard, ".keys"), "ab") as f:
+            f.write(b"".join(keys))
+
+        start = self._shard_sizes[shard]
+        for row, key in enumerate(keys, start):
+            self._locations[key] = (shard, row)
+
+        self._shard_sizes[shard] = start + len(keys)
+        # Eski map yeni satırları görmez, bir sonraki okumada yeniden açılır
+        self._maps.pop(shard, None)
+
+    def _shard_map(self, shard: int) -> np.memmap:
+        """
+        Shard'ın salt okunur memory map'ini döndürür.
+        """
+        shard_map = self._maps.get(shard)
+
+        if shard_map is None:
+            shard_map = np.memmap(
+                self._shard_path(shard, ".f16"),
+                dtype="float16",
+                mode="r",
+                shape=(self._shard_sizes[shard], self.dim),
+            )
+            self._maps[shard] = shard_map
+
+        return shard_map
+
+    def _shard_path(self, shard: int, suffix: str) -> Path:
+        return self.directory / f"shard_{shard:05d}{suffix}"
+
+
+def content_key(data: Union[bytes, np.ndarray]) -> bytes:
+    """
+    Görsel içeriğinin depo anahtarını hesaplar.
+
+    Diziler için boyut bilgisi de hash'e katılır; aynı byte'lara sahip farklı
+    boyuttaki frame'ler çakışmaz.
+
+    Args:
+        data: Dosya içeriği veya (H, W, 3) frame dizisi
+
+    Returns:
+        16 byte'lık blake2b özeti
+    """
+    digest = hashlib.blake2b(digest_size=KEY_SIZE)
+
+    if isinstance(data, np.ndarray):
+        digest.update(str(data.shape).encode())
+        data = np.ascontiguousarray(data)
+
+    digest.update(data)
+    return digest.digest()
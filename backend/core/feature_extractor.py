@@ -1,20 +1,61 @@
 """
 Bu modül CLIP modelini kullanarak görsel ve metin feature'ları çıkarır.
 Görsel arama için gerekli embedding'leri oluşturur.
+
+torch ve transformers ilk kullanımda import edilir; image ve text tower'ları
+birbirinden bağımsız olarak ihtiyaç duyulduğunda yüklenir.
 """
 
+import io
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 import numpy as np
 from PIL import Image
-import torch
-from transformers import CLIPModel, CLIPProcessor
 
 from config.settings import settings
+from core.embedding_cache import EmbeddingCache
+from core.embedding_store import EmbeddingStore, content_key
+from core.text_batcher import TextBatcher
 from utils.logger import get_logger
 
+if TYPE_CHECKING:
+    import torch
+
 logger = get_logger(__name__)
 
+MODEL_TOWERS = ("image", "text")
+
+
+class PreparedBatch(NamedTuple):
+    """
+    Loader thread'lerinde hazırlanan görsel batch'i.
+
+    Attributes:
+        keys: Her geçerli görselin depo anahtarı (depo kapalıysa None)
+        cached: Her geçerli görselin embedding'i depoda var mı
+        inputs: Depoda olmayan görsellerin model girdisi (hepsi depodaysa None)
+    """
+
+    keys: List[Optional[bytes]]
+    cached: List[bool]
+    inputs: Optional[Dict[str, "torch.Tensor"]]
+
 
 class FeatureExtractor:
     """
@@ -23,40 +64,237 @@ class FeatureExtractor:
     Görsel ve metin verilerinden embedding'ler çıkarır.
     """
 
-    def __init__(self, model_name: str = None, device: str = None):
+    def __init__(self, model_name: str = None, device: str = None, backend: str = None):
         """
         FeatureExtractor instance'ı oluşturur.
 
+        Model ağırlıkları burada yüklenmez; her tower ilk kullanıldığında
+        yüklenir. Sadece arama yapan bir instance vision ağırlıklarını hiç
+        yüklemez.
+
         Args:
             model_name: CLIP model ismi (varsayılan: settings'den alınır)
             device: İşlem cihazı 'cpu' veya 'cuda' (varsayılan: settings'den alınır)
+            backend: Inference backend'i 'torch' veya 'onnx' (varsayılan: settings'den alınır)
         """
         self.model_name = model_name or settings.MODEL_NAME
         self.device = device or settings.DEVICE
+        self.backend = backend or settings.INFERENCE_BACKEND
+
+        # Tower ismi -> (preprocessor, encoder)
+        self._towers: Dict[str, Tuple[Any, Any]] = {}
+        self._tower_locks = {tower: threading.Lock() for tower in MODEL_TOWERS}
+
+        self.text_cache = EmbeddingCache(
+            max_size=settings.TEXT_CACHE_SIZE, persist_path=settings.TEXT_CACHE_PATH
+        )
+        self.text_batcher = TextBatcher(self.extract_text_features)
+
+        self._frame_store: Optional[EmbeddingStore] = None
+        self._frame_store_lock = threading.Lock()
+
+        logger.info(
+            f"FeatureExtractor initialized with model: {self.model_name}, "
+            f"backend: {self.backend} (towers are loaded on first use)"
+        )
+
+    @property
+    def loaded_towers(self) -> List[str]:
+        """
+        Yüklenmiş tower'ların isimlerini döndürür.
+        """
+        return [tower for tower in MODEL_TOWERS if tower in self._towers]
+
+    @property
+    def embedding_variant(self) -> str:
+        """
+        Saklanan embedding'lerin ait olduğu model varyantının adı.
+
+        Aynı model ONNX backend'inde (özellikle int8 quantization ile) torch
+        ile birebir aynı embedding'leri üretmez; varyantlar ayrı saklanır.
+        Torch varyantı eski depolarla uyumlu kalması için sadece model adıdır.
+        """
+        if self.backend == "torch":
+            return self.model_name
+
+        suffix = "-int8" if self.backend == "onnx" and settings.ONNX_QUANTIZE else ""
+        return f"{self.model_name}@{self.backend}{suffix}"
+
+    @property
+    def frame_store(self) -> Optional[EmbeddingStore]:
+        """
+        Model varyantının frame embedding deposunu döndürür, ilk kullanımda açar.
+
+        Returns:
+            EmbeddingStore veya depo kapalıysa None
+        """
+        if not settings.FRAME_EMBEDDING_STORE:
+            return None
+
+        if self._frame_store is None:
+            with self._frame_store_lock:
+                if self._frame_store is None:
+                    self._frame_store = EmbeddingStore(
+                        Path(settings.FRAME_EMBEDDING_DIR)
+                        / self.embedding_variant.replace("/", "--"),
+                        shard_rows=settings.FRAME_EMBEDDING_SHARD_ROWS,
+                    )
+
+        return self._frame_store
+
+    def warm_up(self, towers: Optional[Sequence[str]] = None) -> None:
+        """
+        Tower'ları yükleyip birer örnek girdi ile çalıştırır.
+
+        İlk gerçek isteğin model yükleme ve ilk forward pass maliyetini
+        ödememesi için başlangıçta arka planda çağrılır.
+
+        Args:
+            towers: Isıtılacak tower'lar (varsayılan: settings'den alınır)
+        """
+        towers = settings.MODEL_WARMUP_TOWERS if towers is None else towers
+
+        for tower in towers:
+            start = time.perf_counter()
+
+            try:
+                if tower == "image":
+                    # Depo atlanır; aksi halde sonraki başlatmalarda model çalışmaz
+                    self._encode_inputs(
+                        self._preprocess_images(
+                            [np.zeros((224, 224, 3), dtype=np.uint8)]
+                        )
+                    )
+                else:
+                    self.extract_text_features(["warm up"])
+
+            except Exception as e:
+                logger.error(f"Warm-up of {tower} tower failed: {e}", exc_info=True)
+                continue
+
+            logger.info(
+                f"Warmed up {tower} tower in {time.perf_counter() - start:.2f}s"
+            )
+
+    def _get_tower(self, tower: str) -> Tuple[Any, Any]:
+        """
+        Tower'ın preprocessor ve encoder'ını döndürür, gerekirse yükler.
+
+        Her tower'ın kendi kilidi vardır; bir tower yüklenirken diğeri
+        kullanılabilir.
+
+        Args:
+            tower: Tower ismi ('image' veya 'text')
+
+        Returns:
+            (preprocessor, encoder) tuple'ı
+        """
+        loaded = self._towers.get(tower)
+        if loaded is not None:
+            return loaded
+
+        with self._tower_locks[tower]:
+            if tower not in self._towers:
+                self._towers[tower] = self._load_tower(tower)
+
+        return self._towers[tower]
+
+    def _load_tower(self, tower: str) -> Tuple[Any, Any]:
+        """
+        Tower'ın preprocessor'ını ve inference encoder'ını yükler.
+
+        Args:
+            tower: Tower ismi ('image' veya 'text')
+
+        Returns:
+            (preprocessor, encoder) tuple'ı
+        """
+        from core.inference_backends import create_encoder
+
+        start = time.perf_counter()
 
         if self.device is None:
+            import torch
+
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
 
         logger.info(
-            f"Initializing FeatureExtractor with model: {self.model_name} on device: {self.device}"
+            f"Loading {tower} tower of {self.model_name} on device: {self.device}"
         )
 
-        self.model = CLIPModel.from_pretrained(self.model_name).to(self.device)
-        self.processor = CLIPProcessor.from_pretrained(self.model_name)
+        if tower == "image":
+            from transformers import CLIPImageProcessor
+
+            preprocessor = CLIPImageProcessor.from_pretrained(self.model_name)
+
+            if settings.VECTORIZED_PREPROCESSING:
+                from core.image_preprocessing import BatchImagePreprocessor
+
+                preprocessor = BatchImagePreprocessor(preprocessor)
+        else:
+            from transformers import CLIPTokenizerFast
+
+            preprocessor = CLIPTokenizerFast.from_pretrained(self.model_name)
+
+        encoder = create_encoder(
+            self.backend,
+            tower,
+            lambda: self._load_tower_model(tower),
+            self.model_name,
+            self.device,
+        )
+
+        logger.info(
+            f"Loaded {tower} tower with {encoder.name} backend "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+        return preprocessor, encoder
+
+    def _load_tower_model(self, tower: str):
+        """
+        Checkpoint'ten sadece istenen tower'ın ağırlıklarını yükler.
+
+        Args:
+            tower: Tower ismi ('image' veya 'text')
+
+        Returns:
+            CLIPVisionModelWithProjection veya CLIPTextModelWithProjection
+        """
+        from transformers import (
+            CLIPTextModelWithProjection,
+            CLIPVisionModelWithProjection,
+        )
 
-        self.model.eval()
+        model_class = (
+            CLIPVisionModelWithProjection
+            if tower == "image"
+            else CLIPTextModelWithProjection
+        )
 
-        logger.info("FeatureExtractor initialized successfully")
+        return model_class.from_pretrained(self.model_name).eval()
 
     def extract_image_features(
-        self, image_paths: Union[Path, List[Path]], batch_size: int = 32
+        self,
+        image_paths: Union[Path, List[Path]],
+        batch_size: int = 32,
+        num_workers: Optional[int] = None,
+        prefetch_batches: Optional[int] = None,
     ) -> np.ndarray:
         """
         Görsel dosyalarından feature'ları çıkarır.
 
+        Görseller bir thread pool'da açılıp preprocess edilir; model N.
+        batch'i işlerken sonraki batch'ler arka planda hazırlanır. Dosya
+        içeriği daha önce encode edildiyse embedding depodan okunur.
+
         Args:
             image_paths: Tek bir görsel yolu veya görsel yolları listesi
             batch_size: Batch processing için boyut
+            num_workers: Görsel yükleyen thread sayısı, 0 ise ana thread'de
+                         yüklenir (varsayılan: settings'den alınır)
+            prefetch_batches: Önceden hazırlanacak batch sayısı
+                              (varsayılan: settings'den alınır)
 
         Returns:
             Feature vektörleri numpy array (N, embedding_dim)
@@ -66,49 +304,265 @@ class FeatureExtractor:
 
         logger.info(f"Extracting features from {len(image_paths)} images")
 
+        batches = [
+            image_paths[i : i + batch_size]
+            for i in range(0, len(image_paths), batch_size)
+        ]
+
         all_features = []
+        processed_count = 0
 
-        for i in range(0, len(image_paths), batch_size):
-            batch_paths = image_paths[i : i + batch_size]
-            batch_images = []
+        for batch_number, (batch_paths, prepared) in enumerate(
+            self._iter_prefetched(
+                batches, self._load_images, num_workers, prefetch_batches
+            )
+        ):
+            processed_count += len(batch_paths)
 
-            # Görselleri yükle ve preprocess et
-            for path in batch_paths:
-                try:
-                    image = Image.open(path).convert("RGB")
-                    batch_images.append(image)
-                except Exception as e:
-                    logger.warning(f"Error loading image {path}: {e}")
-                    continue
+            if prepared.keys:
+                all_features.append(self._encode_prepared(prepared))
+
+            if (batch_number + 1) % 10 == 0:
+                logger.info(f"Processed {processed_count}/{len(image_paths)} images")
+
+        if not all_features:
+            raise ValueError("No features could be extracted from the provided images")
+
+        features_array = np.vstack(all_features).astype("float32")
 
-            if not batch_images:
+        logger.info(f"Feature extraction completed: shape {features_array.shape}")
+
+        return features_array
+
+    def extract_array_features(
+        self,
+        images: List[np.ndarray],
+        batch_size: int = 32,
+        num_workers: Optional[int] = None,
+        prefetch_batches: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Bellekteki RGB görüntü dizilerinden feature'ları çıkarır.
+
+        Decoder'dan gelen frame'ler için JPEG kaydetme/okuma adımlarını atlar.
+        Aynı içeriğe sahip frame'ler daha önce encode edildiyse embedding'leri
+        depodan okunur; yeniden index'leme model çalıştırmadan yapılır.
+
+        Args:
+            images: (H, W, 3) uint8 RGB görüntü dizileri
+            batch_size: Batch processing için boyut
+            num_workers: Preprocess yapan thread sayısı (varsayılan: settings'den alınır)
+            prefetch_batches: Önceden hazırlanacak batch sayısı
+                              (varsayılan: settings'den alınır)
+
+        Returns:
+            Feature vektörleri numpy array (N, embedding_dim)
+        """
+        if not images:
+            raise ValueError("No images provided for feature extraction")
+
+        batches = [
+            images[i : i + batch_size] for i in range(0, len(images), batch_size)
+        ]
+
+        all_features = [
+            self._encode_prepared(prepared)
+            for _, prepared in self._iter_prefetched(
+                batches, self._prepare_arrays, num_workers, prefetch_batches
+            )
+        ]
+
+        return np.vstack(all_features).astype("float32")
+
+    def _iter_prefetched(
+        self,
+        batches: Sequence[Sequence],
+        preprocess: Callable[[Sequence], PreparedBatch],
+        num_workers: Optional[int] = None,
+        prefetch_batches: Optional[int] = None,
+    ) -> Iterator[Tuple[Sequence, PreparedBatch]]:
+        """
+        Batch'leri sırasıyla preprocess edilmiş halde üretir.
+
+        En fazla prefetch_batches kadar batch thread pool'da önceden hazırlanır.
+        PIL decode/resize ve model forward GIL'i bıraktığı için yükleme ile
+        inference örtüşür.
+
+        Args:
+            batches: Ham batch listesi (görsel yolları veya diziler)
+            preprocess: Bir batch'i PreparedBatch'e dönüştüren fonksiyon
+            num_workers: Thread sayısı, 0 ise preprocess ana thread'de yapılır
+            prefetch_batches: Önceden hazırlanacak batch sayısı
+
+        Yields:
+            (ham_batch, hazırlanmış_batch) tuple'ı
+        """
+        num_workers = (
+            settings.IMAGE_LOADER_WORKERS if num_workers is None else num_workers
+        )
+        prefetch_batches = max(
+            1,
+            settings.IMAGE_PREFETCH_BATCHES
+            if prefetch_batches is None
+            else prefetch_batches,
+        )
+
+        if num_workers <= 0:
+            for batch in batches:
+                yield batch, preprocess(batch)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="image-loader"
+        ) as loader:
+            batch_iterator = iter(batches)
+            pending = deque()
+
+            for batch in batch_iterator:
+                pending.append((batch, loader.submit(preprocess, batch)))
+                if len(pending) >= prefetch_batches:
+                    break
+
+            while pending:
+                batch, future = pending.popleft()
+
+                next_batch = next(batch_iterator, None)
+                if next_batch is not None:
+                    pending.append((next_batch, loader.submit(preprocess, next_batch)))
+
+                yield batch, future.result()
+
+    def _load_images(self, image_paths: Sequence[Path]) -> PreparedBatch:
+        """
+        Görsel dosyalarını okur; depoda olmayanları RGB'ye çevirip preprocess eder.
+
+        Açılamayan görseller uyarı ile atlanır.
+
+        Args:
+            image_paths: Görsel yolları
+
+        Returns:
+            Geçerli görsellerin PreparedBatch'i
+        """
+        store = self.frame_store
+        keys, cached, images = [], [], []
+
+        for path in image_paths:
+            try:
+                data = Path(path).read_bytes()
+                key = content_key(data) if store is not None else None
+
+                if key is not None and key in store:
+                    hit = True
+                else:
+                    images.append(Image.open(io.BytesIO(data)).convert("RGB"))
+                    hit = False
+
+            # Okunamayan veya bozuk görseller atlanır
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                logger.warning(f"Error loading image {path}: {e}")
                 continue
 
-            inputs = self.processor(
-                images=batch_images, return_tensors="pt", padding=True
+            keys.append(key)
+            cached.append(hit)
+
+        inputs = self._preprocess_images(images) if images else None
+        return PreparedBatch(keys, cached, inputs)
+
+    def _prepare_arrays(self, images: Sequence[np.ndarray]) -> PreparedBatch:
+        """
+        Frame dizilerinin anahtarlarını hesaplar, depoda olmayanları preprocess eder.
+
+        Args:
+            images: (H, W, 3) uint8 RGB dizileri
+
+        Returns:
+            Frame'lerin PreparedBatch'i
+        """
+        store = self.frame_store
+
+        if store is None:
+            return PreparedBatch(
+                [None] * len(images),
+                [False] * len(images),
+                self._preprocess_images(images),
             )
 
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        keys = [content_key(image) for image in images]
+        cached = [key in store for key in keys]
+        missing = [image for image, hit in zip(images, cached) if not hit]
 
-            with torch.no_grad():
-                features = self.model.get_image_features(**inputs)
+        inputs = self._preprocess_images(missing) if missing else None
+        return PreparedBatch(keys, cached, inputs)
 
-            features = features.cpu().numpy()
-            all_features.append(features)
+    def _preprocess_images(
+        self, images: Sequence[Union[Image.Image, np.ndarray]]
+    ) -> Dict[str, "torch.Tensor"]:
+        """
+        Görselleri model girdisine dönüştürür.
 
-            if (i // batch_size + 1) % 10 == 0:
-                logger.info(
-                    f"Processed {i + len(batch_paths)}/{len(image_paths)} images"
-                )
+        Decoder'dan gelen uint8 diziler vektörize yoldan, diğer görseller
+        CLIPImageProcessor ile işlenir.
 
-        if not all_features:
-            raise ValueError("No features could be extracted from the provided images")
+        Args:
+            images: PIL görselleri veya RGB numpy dizileri
 
-        features_array = np.vstack(all_features).astype("float32")
+        Returns:
+            Model girdisi (pixel_values)
+        """
+        image_processor, _ = self._get_tower("image")
+        return image_processor(images=list(images), return_tensors="pt")
 
-        logger.info(f"Feature extraction completed: shape {features_array.shape}")
+    def _encode_prepared(self, prepared: PreparedBatch) -> np.ndarray:
+        """
+        Hazırlanmış batch'in embedding'lerini görsel sırasıyla döndürür.
 
-        return features_array
+        Depoda olmayan görseller image tower'ından geçirilip depoya eklenir.
+        Depo açıkken tüm embedding'ler depodan okunur; böylece aynı frame
+        ilk ve sonraki index'lemelerde aynı (float16) değeri alır.
+
+        Args:
+            prepared: Loader thread'inde hazırlanmış batch
+
+        Returns:
+            Feature vektörleri numpy array (N, embedding_dim)
+        """
+        features = (
+            self._encode_inputs(prepared.inputs)
+            if prepared.inputs is not None
+            else None
+        )
+
+        store = self.frame_store
+        if store is None:
+            return features
+
+        if features is not None:
+            missing = [
+                key for key, hit in zip(prepared.keys, prepared.cached) if not hit
+            ]
+            store.put(missing, features)
+
+        reused = sum(prepared.cached)
+        if reused:
+            logger.debug(
+                f"Reused {reused}/{len(prepared.keys)} stored frame embeddings"
+            )
+
+        return store.get(prepared.keys)
+
+    def _encode_inputs(self, inputs: Dict[str, "torch.Tensor"]) -> np.ndarray:
+        """
+        Preprocess edilmiş bir görsel batch'ini image tower'ından geçirir.
+
+        Args:
+            inputs: Model girdisi (pixel_values)
+
+        Returns:
+            Feature vektörleri numpy array (N, embedding_dim)
+        """
+        _, image_encoder = self._get_tower("image")
+        return image_encoder.encode(inputs)
 
     def extract_text_features(self, text: Union[str, List[str]]) -> np.ndarray:
         """
@@ -128,16 +582,10 @@ class FeatureExtractor:
 
         logger.debug(f"Extracting features from {len(text)} text(s)")
 
-        inputs = self.processor(
-            text=text, return_tensors="pt", padding=True, truncation=True
-        )
-
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
-
-        with torch.no_grad():
-            features = self.model.get_text_features(**inputs)
+        tokenizer, text_encoder = self._get_tower("text")
+        inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True)
 
-        features = features.cpu().numpy().astype("float32")
+        features = text_encoder.encode(inputs).astype("float32")
 
         if single_input:
             features = features.reshape(-1)
@@ -146,6 +594,68 @@ class FeatureExtractor:
 
         return features
 
+    def extract_query_features(self, query: str) -> np.ndarray:
+        """
+        Arama sorgusunun normalize edilmiş embedding'ini döndürür.
+
+        Sorgu daha önce encode edildiyse embedding cache'ten gelir ve model
+        hiç çalıştırılmaz. Aksi halde eşzamanlı diğer sorgularla aynı batch'te
+        encode edilir.
+
+        Args:
+            query: Arama sorgusu metni
+
+        Returns:
+            L2 normalize edilmiş feature vektörü (embedding_dim,)
+        """
+        cached = self.text_cache.get(self.embedding_variant, query)
+        if cached is not None:
+            return cached
+
+        return self.text_cache.put(
+            self.embedding_variant, query, self.text_batcher.encode(query)
+        )
+
+    def extract_query_features_batch(self, queries: Sequence[str]) -> np.ndarray:
+        """
+        Birden fazla arama sorgusunun normalize edilmiş embedding'lerini döndürür.
+
+        Cache'te olmayan sorgular tek bir text tower batch'inde encode edilir;
+        cache anahtarı aynı olan sorgular bir kez encode edilir.
+
+        Args:
+            queries: Arama sorgusu metinleri
+
+        Returns:
+            L2 normalize edilmiş feature vektörleri (N, embedding_dim)
+        """
+        embeddings: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+
+        for query in queries:
+            key = self.text_cache.normalize_query(query)
+            if key in embeddings or key in missing:
+                continue
+
+            cached = self.text_cache.get(self.embedding_variant, query)
+
+            if cached is not None:
+                embeddings[key] = cached
+            else:
+                missing.setdefault(key, query)
+
+        if missing:
+            features = self.extract_text_features(list(missing.values()))
+
+            for (key, query), feature in zip(missing.items(), features):
+                embeddings[key] = self.text_cache.put(
+                    self.embedding_variant, query, feature
+                )
+
+        return np.stack(
+            [embeddings[self.text_cache.normalize_query(query)] for query in queries]
+        )
+
     def get_embedding_dimension(self) -> int:
         """
         Embedding boyutunu döndürür.
@@ -153,7 +663,9 @@ class FeatureExtractor:
         Returns:
             Embedding vektörünün boyutu
         """
-        return self.model.config.projection_dim
+        from transformers import CLIPConfig
+
+        return CLIPConfig.from_pretrained(self.model_name).projection_dim
 
     def normalize_features(self, features: np.ndarray) -> np.ndarray:
         """
@@ -0,0 +1,106 @@
+"""
+Bu modül birbirine çok benzeyen ardışık frame'leri tespit eder.
+Sabit sahnelerde embedding'i yapılacak frame sayısını azaltmak için kullanılır.
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEDUP_METHODS = ("none", "histogram", "phash")
+
+
+class FrameDeduplicator:
+    """
+    Ucuz görüntü imzalarıyla near-duplicate frame tespiti yapan sınıf.
+
+    Her frame, en son tutulan frame'in imzasıyla karşılaştırılır. İmzalar
+    arasındaki mesafe eşik değerinin altındaysa frame tekrar kabul edilir.
+
+    Yöntemler:
+        histogram: Küçültülmüş HSV histogramları arasındaki Bhattacharyya mesafesi
+        phash: 64 bitlik perceptual hash'ler arasındaki normalize Hamming mesafesi
+    """
+
+    def __init__(self, method: str = "phash", threshold: float = 0.1):
+        """
+        FrameDeduplicator instance'ı oluşturur.
+
+        Args:
+            method: İmza yöntemi ('histogram' veya 'phash')
+            threshold: 0-1 aralığında mesafe eşiği, altındaki frame'ler tekrar sayılır
+        """
+        if method not in DEDUP_METHODS or method == "none":
+            raise ValueError(f"Unknown dedup method: {method}")
+
+        self.method = method
+        self.threshold = threshold
+        self._reference: Optional[np.ndarray] = None
+
+    def is_duplicate(self, frame: np.ndarray) -> bool:
+        """
+        Frame'in son tutulan frame'e çok benzeyip benzemediğini kontrol eder.
+
+        Args:
+            frame: BGR frame görüntüsü
+
+        Returns:
+            Frame tekrar ise True
+        """
+        if self._reference is None:
+            return False
+
+        return self.distance(self._reference, self.signature(frame)) < self.threshold
+
+    def keep(self, frame: np.ndarray) -> None:
+        """
+        Frame'i yeni karşılaştırma referansı olarak kaydeder.
+
+        Args:
+            frame: BGR frame görüntüsü
+        """
+        self._reference = self.signature(frame)
+
+    def signature(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Frame için seçili yöntemle imza hesaplar.
+
+        Args:
+            frame: BGR frame görüntüsü
+
+        Returns:
+            İmza vektörü
+        """
+        if self.method == "histogram":
+            small = cv2.resize(frame, (64, 64), interpolation=cv2.INTER_AREA)
+            hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+            hist = cv2.calcHist(
+                [hsv], [0, 1, 2], None, [8, 8, 8], [0, 180, 0, 256, 0, 256]
+            )
+            return cv2.normalize(hist, hist).flatten()
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+        dct = cv2.dct(small.astype("float32"))[:8, :8]
+        return (dct > np.median(dct)).flatten()
+
+    def distance(self, first: np.ndarray, second: np.ndarray) -> float:
+        """
+        İki imza arasındaki 0-1 aralığındaki mesafeyi döndürür.
+
+        Args:
+            first: İlk imza
+            second: İkinci imza
+
+        Returns:
+            Mesafe (0 = aynı)
+        """
+        if self.method == "histogram":
+            return float(cv2.compareHist(first, second, cv2.HISTCMP_BHATTACHARYYA))
+
+        return float(np.count_nonzero(first != second)) / first.size
@@ -0,0 +1,277 @@
+"""
+Bu modül frame metadata'sını sütun bazlı numpy dizilerinde saklar.
+Her frame için nesne yerine birkaç sayı tutulur; dosyalar açılışta
+memory-mapped okunur ve FrameMetadata sadece istenen satırlar için üretilir.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.settings import settings
+from core.video_processor import FrameMetadata, make_frame_id
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sütun adı -> dtype. Frame id'si ve dosya yolu video_id ile frame_index'ten türetilir
+COLUMNS = {
+    "video_index": "int32",
+    "frame_index": "int32",
+    "frame_number": "int32",
+    "timestamp": "float32",
+    "end_time": "float32",
+}
+# Silinmiş (hiç metadata'sı olmayan) satırların video_index değeri
+MISSING_VIDEO = -1
+
+
+class FrameMetadataStore:
+    """
+    Satır numarası frame id'si olan append-only, sütun bazlı metadata deposu.
+
+    Kaydedilen sütunlar dizinde ayrı .npy dosyalarıdır; video_id'ler ise
+    video_index sırasıyla videos.json'da tutulur:
+
+        videos.json        video_index -> video_id listesi
+        video_index.npy    (N,) int32
+        frame_index.npy    (N,) int32 örnekleme slotu
+        frame_number.npy   (N,) int32
+        timestamp.npy      (N,) float32
+        end_time.npy       (N,) float32 (yoksa NaN)
+
+    Son kayıttan sonra eklenen satırlar kaydedilene kadar bellekte tutulur.
+    """
+
+    def __init__(self):
+        """
+        Boş bir FrameMetadataStore oluşturur.
+        """
+        self.video_ids: List[str] = []
+        self._video_indices: Dict[str, int] = {}
+        # Kaydedilmiş satırlar (load sonrası memory-mapped)
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()
+        }
+        # Kaydedilmemiş satırlar
+        self._tail: Dict[str, list] = {name: [] for name in COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self._columns["video_index"]) + len(self._tail["video_index"])
+
+    def append(self, frame_metadata_list: Sequence[Optional[FrameMetadata]]) -> None:
+        """
+        Frame'leri sıradaki satırlara ekler.
+
+        Args:
+            frame_metadata_list: Eklenecek frame'ler; None metadata'sı olmayan
+                                 (silinmiş) bir satır ekler
+
+        Raises:
+            ValueError: frame_id video_id'den türetilmiş biçimde değilse
+        """
+        for frame_metadata in frame_metadata_list:
+            if frame_metadata is None:
+                row = (MISSING_VIDEO, 0, 0, np.nan, np.nan)
+            else:
+                row = (
+                    self._video_index(frame_metadata.video_id),
+                    _frame_index(frame_metadata),
+                    frame_metadata.frame_number,
+                    frame_metadata.timestamp,
+                    np.nan
+                    if frame_metadata.end_time is None
+                    else frame_metadata.end_time,
+                )
+
+            for name, value in zip(COLUMNS, row):
+                self._tail[name].append(value)
+
+    def get(self, row: int) -> Optional[FrameMetadata]:
+        """
+        Bir satırın FrameMetadata nesnesini üretir.
+
+        Args:
+            row: Frame id'si
+
+        Returns:
+            FrameMetadata veya satırın metadata'sı yoksa None
+        """
+        values = {name: self._value(name, row) for name in COLUMNS}
+
+        if values["video_index"] == MISSING_VIDEO:
+            return None
+
+        video_id = self.video_ids[int(values["video_index"])]
+        frame_id = make_frame_id(video_id, int(values["frame_index"]))
+        end_time = float(values["end_time"])
+
+        return FrameMetadata(
+            frame_id=frame_id,
+            video_id=video_id,
+            frame_path=str(
+                settings.FRAME_EXTRACTION_DIR / video_id / f"{frame_id}.jpg"
+            ),
+            timestamp=float(values["timestamp"]),
+            frame_number=int(values["frame_number"]),
+            end_time=None if np.isnan(end_time) else end_time,
+        )
+
+    def video_id(self, row: int) -> Optional[str]:
+        """
+        Bir satırın ait olduğu video_id'yi döndürür (metadata yoksa None).
+        """
+        video_index = int(self._value("video_index", row))
+        return None if video_index == MISSING_VIDEO else self.video_ids[video_index]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Bir sütunun tüm satırlarını döndürür.
+
+        Args:
+            name: COLUMNS içinden bir sütun adı
+
+        Returns:
+            (len(self),) dizi
+        """
+        if not self._tail[name]:
+            return self._columns[name]
+
+        return np.concatenate(
+            [self._columns[name], np.asarray(self._tail[name], dtype=COLUMNS[name])]
+        )
+
+    def copy(self) -> "FrameMetadataStore":
+        """
+        Depodaki satırların bağımsız bir kopyasını döndürür.
+
+        Kopyaya sonradan eklenen satırlar bu depoyu etkilemez; arka planda
+        kaydetmek için kullanılır.
+        """
+        store = FrameMetadataStore()
+        store.video_ids = list(self.video_ids)
+        store._video_indices = dict(self._video_indices)
+        store._columns = {name: self.column(name) for name in COLUMNS}
+        return store
+
+    def truncate(self, rows: int) -> None:
+        """
+        Depoyu ilk rows satırına kısaltır (kaydedilmemiş satırları atmak için).
+
+        Args:
+            rows: Korunacak satır sayısı
+        """
+        saved = len(self._columns["video_index"])
+
+        for name in COLUMNS:
+            self._columns[name] = self._columns[name][:rows]
+            del self._tail[name][max(0, rows - saved) :]
+
+    def save(self, directory: Path) -> None:
+        """
+        Tüm satırları dizine yazar ve kaydedilen dosyaları yeniden map'ler.
+
+        Her dosya önce geçici adla yazılıp yerine taşınır; okunan eski
+        map'ler yazma sırasında geçerli kalır.
+
+        Args:
+            directory: Deponun dizini
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        for name in COLUMNS:
+            _write_atomic(directory / f"{name}.npy", self.column(name))
+
+        tmp_path = directory / "videos.json.tmp"
+        tmp_path.write_text(json.dumps(self.video_ids))
+        os.replace(tmp_path, directory / "videos.json")
+
+        self._map(directory)
+
+    @classmethod
+    def load(cls, directory: Path) -> "FrameMetadataStore":
+        """
+        Kaydedilmiş depoyu memory-mapped olarak açar.
+
+        Args:
+            directory: Deponun dizini
+
+        Returns:
+            FrameMetadataStore instance'ı
+
+        Raises:
+            FileNotFoundError: Depo dosyaları yoksa
+        """
+        store = cls()
+        store._map(Path(directory))
+
+        logger.info(f"Loaded metadata of {len(store)} frames from {directory}")
+
+        return store
+
+    def _map(self, directory: Path) -> None:
+        """
+        Dizindeki sütunları memory-mapped açar ve bellekteki satırları atar.
+        """
+        self.video_ids = json.loads((directory / "videos.json").read_text())
+        self._video_indices = {
+            video_id: index for index, video_id in enumerate(self.video_ids)
+        }
+
+        columns = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in COLUMNS
+        }
+
+        # Yarım kalan bir kayıtta sütunlar ortak uzunluğa kırpılır
+        rows = min(len(column) for column in columns.values())
+        self._columns = {name: column[:rows] for name, column in columns.items()}
+        self._tail = {name: [] for name in COLUMNS}
+
+    def _video_index(self, video_id: str) -> int:
+        """
+        video_id'nin video_index'ini döndürür; yeni video için yenisini ekler.
+        """
+        if video_id not in self._video_indices:
+            self._video_indices[video_id] = len(self.video_ids)
+            self.video_ids.append(video_id)
+
+        return self._video_indices[video_id]
+
+    def _value(self, name: str, row: int):
+        """
+        Bir sütunun tek bir satırdaki değerini döndürür.
+        """
+        saved = len(self._columns[name])
+
+        if row < saved:
+            return self._columns[name][row]
+
+        return self._tail[name][row - saved]
+
+
+def _frame_index(frame_metadata: FrameMetadata) -> int:
+    """
+    frame_id'den örnekleme slotu numarasını çıkarır.
+    """
+    frame_index = int(frame_metadata.frame_id.rsplit("_frame_", 1)[-1])
+
+    if make_frame_id(frame_metadata.video_id, frame_index) != frame_metadata.frame_id:
+        raise ValueError(f"Unexpected frame id format: {frame_metadata.frame_id}")
+
+    return frame_index
+
+
+def _write_atomic(path: Path, array: np.ndarray) -> None:
+    """
+    Diziyi geçici dosyaya yazıp hedefin yerine taşır.
+    """
+    tmp_path = path.with_suffix(".tmp")
+
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+
+    os.replace(tmp_path, path)
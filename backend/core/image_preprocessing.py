@@ -0,0 +1,183 @@
+"""
+Bu modül decoder'dan gelen frame dizileri için vektörize CLIP preprocessing sağlar.
+Resize, center crop ve normalizasyon her görsel için ayrı ayrı yapılmak yerine
+tüm batch üzerinde tek seferde torch işlemleriyle uygulanır.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BatchImagePreprocessor:
+    """
+    CLIPImageProcessor'ın batch halinde çalışan karşılığı.
+
+    (H, W, 3) uint8 RGB dizilerinden oluşan batch'ler aynı boyuttaki
+    görseller gruplanarak tek bir interpolate çağrısıyla işlenir. Antialias'lı
+    bicubic interpolasyon PIL'in kullandığı kernel ile aynıdır; sonuçlar
+    processor çıktısıyla tolerans dahilinde örtüşür. Diğer girdiler (PIL
+    görselleri vb.) orijinal processor'a devredilir.
+    """
+
+    def __init__(self, processor):
+        """
+        BatchImagePreprocessor instance'ı oluşturur.
+
+        Args:
+            processor: Ayarları kullanılacak ve desteklenmeyen girdilerin
+                       devredileceği CLIPImageProcessor
+        """
+        self.processor = processor
+
+        # Sadece CLIP'in varsayılan adım dizisi vektörize edilir
+        self.supported = (
+            processor.do_resize
+            and processor.do_center_crop
+            and processor.do_rescale
+            and processor.do_normalize
+            and "shortest_edge" in processor.size
+        )
+
+        if not self.supported:
+            logger.warning(
+                "Image processor configuration is not supported by the vectorized "
+                "path, falling back to per-image preprocessing"
+            )
+            return
+
+        self.shortest_edge = processor.size["shortest_edge"]
+        self.crop_size = (processor.crop_size["height"], processor.crop_size["width"])
+
+        # (x * rescale - mean) / std = (x - mean / rescale) / (std / rescale)
+        scale = processor.rescale_factor
+        self._offset = (
+            torch.tensor(processor.image_mean, dtype=torch.float32).view(1, 3, 1, 1)
+            / scale
+        )
+        self._divisor = (
+            torch.tensor(processor.image_std, dtype=torch.float32).view(1, 3, 1, 1)
+            / scale
+        )
+
+    def __call__(self, images: Sequence, return_tensors: str = "pt", **kwargs):
+        """
+        Görselleri model girdisine dönüştürür.
+
+        Args:
+            images: Görsel listesi
+            return_tensors: Dönüş tensor tipi (processor'a devredilirken kullanılır)
+
+        Returns:
+            pixel_values içeren model girdisi
+        """
+        if not self._can_vectorize(images):
+            return self.processor(
+                images=images, return_tensors=return_tensors, **kwargs
+            )
+
+        return {"pixel_values": self.preprocess(images)}
+
+    def preprocess(self, images: Sequence[np.ndarray]) -> torch.Tensor:
+        """
+        uint8 RGB dizilerini normalize edilmiş pixel_values tensor'una dönüştürür.
+
+        Args:
+            images: (H, W, 3) uint8 RGB dizileri
+
+        Returns:
+            (N, 3, crop_height, crop_width) float32 tensor
+        """
+        pixel_values = torch.empty((len(images), 3, *self.crop_size))
+
+        # Aynı boyuttaki görseller tek seferde resize edilir
+        groups: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, image in enumerate(images):
+            groups[image.shape[:2]].append(i)
+
+        for indices in groups.values():
+            batch = np.stack([images[i] for i in indices])
+            pixel_values[indices] = self._preprocess_group(batch)
+
+        return pixel_values
+
+    def _preprocess_group(self, batch: np.ndarray) -> torch.Tensor:
+        """
+        Aynı boyuttaki görsellerden oluşan batch'i işler.
+
+        Args:
+            batch: (N, H, W, 3) uint8 dizisi
+
+        Returns:
+            (N, 3, crop_height, crop_width) float32 tensor
+        """
+        height, width = batch.shape[1:3]
+        new_height, new_width = self._resize_shape(height, width)
+
+        # NHWC -> NCHW görünümü bellekte channels_last olarak kalır; torch'un
+        # uint8 antialias resize'ı bu düzende vektörize çalışır ve processor
+        # gibi sonucu uint8'e yuvarlar
+        x = torch.from_numpy(batch).permute(0, 3, 1, 2)
+
+        if (new_height, new_width) != (height, width):
+            x = F.interpolate(
+                x,
+                size=(new_height, new_width),
+                mode="bicubic",
+                align_corners=False,
+                antialias=True,
+            )
+
+        # Normalizasyon sadece crop edilen bölge üzerinde yapılır
+        crop_height, crop_width = self.crop_size
+        top = (new_height - crop_height) // 2
+        left = (new_width - crop_width) // 2
+        x = x[:, :, top : top + crop_height, left : left + crop_width].float()
+
+        return (x - self._offset) / self._divisor
+
+    def _resize_shape(self, height: int, width: int) -> Tuple[int, int]:
+        """
+        Kısa kenarı shortest_edge olacak şekilde yeni boyutu hesaplar.
+
+        Uzun kenar processor'daki gibi aşağı yuvarlanır.
+        """
+        short, long = (width, height) if width <= height else (height, width)
+        new_short, new_long = self.shortest_edge, int(self.shortest_edge * long / short)
+
+        if width <= height:
+            return new_long, new_short
+
+        return new_short, new_long
+
+    def _can_vectorize(self, images: Sequence) -> bool:
+        """
+        Girdilerin vektörize yoldan işlenip işlenemeyeceğini kontrol eder.
+
+        Crop boyutundan küçük görseller processor'da padding gerektirdiği için
+        desteklenmez.
+        """
+        if not self.supported or not images:
+            return False
+
+        for image in images:
+            if not (
+                isinstance(image, np.ndarray)
+                and image.dtype == np.uint8
+                and image.ndim == 3
+                and image.shape[2] == 3
+            ):
+                return False
+
+            new_height, new_width = self._resize_shape(*image.shape[:2])
+            if new_height < self.crop_size[0] or new_width < self.crop_size[1]:
+                return False
+
+        return True
@@ -0,0 +1,452 @@
+"""
+Bu modül SearchEngine için FAISS index tiplerini oluşturur ve eğitir.
+Küçük corpus'larda tam tarama (Flat), büyüdükçe yaklaşık en yakın komşu
+(IVF-Flat, IVF-PQ, HNSW) index'leri kullanılır. Bellek kısıtlı kurulumlar
+için vektörleri sıkıştırarak saklayan (float16, SQ8, PQ) tipler de vardır.
+
+Tüm index'ler vektörleri kalıcı 64-bit id'lerle saklar; IVF tipleri id'leri
+kendisi tutar, diğer tipler IndexIDMap2 ile sarılır.
+"""
+
+import math
+import os
+from typing import Optional, Sequence
+
+import faiss
+import numpy as np
+
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw", "fp16", "sq8", "pq")
+# Vektör eklenmeden önce eğitim gerektiren tipler
+TRAINED_INDEX_TYPES = ("ivf_flat", "ivf_pq", "sq8", "pq")
+IVF_INDEX_TYPES = ("ivf_flat", "ivf_pq")
+# Vektörleri kayıplı sıkıştırarak saklayan tipler (skorlar yaklaşıktır)
+LOSSY_INDEX_TYPES = ("ivf_pq", "fp16", "sq8", "pq")
+
+# FAISS k-means'in küme başına önerdiği minimum eğitim noktası sayısı
+MIN_POINTS_PER_CENTROID = 39
+# Eğitimde küme başına kullanılan maksimum nokta sayısı (FAISS varsayılanı)
+MAX_POINTS_PER_CENTROID = 256
+
+
+def choose_index_type(
+    n_vectors: int,
+    index_type: Optional[str] = None,
+    current_type: Optional[str] = None,
+) -> str:
+    """
+    Corpus boyutuna göre kullanılacak index tipini seçer.
+
+    'auto' modunda corpus ANN_MIN_VECTORS'a ulaşana kadar Flat, sonra
+    ANN_INDEX_TYPE kullanılır. Eğitim gerektiren tipler açıkça seçilse bile
+    yeterli vektör birikene kadar Flat kullanılır. Mevcut index zaten bu
+    ANN tipindeyse Flat'e dönüş eşiği ANN_DOWNGRADE_RATIO ile düşürülür;
+    eşik çevresinde eklenip silinen videolar index'i sürekli yeniden
+    kurdurmaz.
+
+    Args:
+        n_vectors: Index'teki toplam vektör sayısı
+        index_type: İstenen tip (varsayılan: settings'den alınır)
+        current_type: Mevcut index'in tipi (varsa)
+
+    Returns:
+        INDEX_TYPES içinden bir tip
+
+    Raises:
+        ValueError: Bilinmeyen index tipinde
+    """
+    index_type = index_type or settings.INDEX_TYPE
+    ann_type = settings.ANN_INDEX_TYPE if index_type == "auto" else index_type
+
+    if ann_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type: {ann_type}")
+
+    min_vectors = settings.ANN_MIN_VECTORS
+    if current_type == ann_type:
+        min_vectors *= settings.ANN_DOWNGRADE_RATIO
+
+    if n_vectors < min_vectors and (
+        index_type == "auto" or ann_type in TRAINED_INDEX_TYPES
+    ):
+        return "flat"
+
+    return ann_type
+
+
+def create_index(index_type: str, dim: int, n_vectors: int) -> faiss.Index:
+    """
+    Boş (gerekiyorsa eğitilmemiş) bir inner product index'i oluşturur.
+
+    Args:
+        index_type: INDEX_TYPES içinden bir tip
+        dim: Embedding boyutu
+        n_vectors: Index'e eklenecek vektör sayısı (IVF küme sayısını belirler)
+
+    Returns:
+        FAISS index'i
+
+    Raises:
+        ValueError: Bilinmeyen index tipinde
+    """
+    if index_type == "flat":
+        return faiss.IndexFlatIP(dim)
+
+    if index_type == "fp16":
+        return faiss.index_factory(dim, "SQfp16", faiss.METRIC_INNER_PRODUCT)
+
+    if index_type == "sq8":
+        return faiss.index_factory(dim, "SQ8", faiss.METRIC_INNER_PRODUCT)
+
+    if index_type == "pq":
+        return faiss.index_factory(
+            dim,
+            f"PQ{pq_subquantizers(dim)}x{pq_bits(n_vectors)}",
+            faiss.METRIC_INNER_PRODUCT,
+        )
+
+    if index_type == "hnsw":
+        index = faiss.index_factory(
+            dim, f"HNSW{settings.HNSW_M},Flat", faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = settings.HNSW_EF_CONSTRUCTION
+        return index
+
+    nlist = ivf_nlist(n_vectors)
+
+    if index_type == "ivf_flat":
+        description = f"IVF{nlist},Flat"
+    elif index_type == "ivf_pq":
+        description = f"IVF{nlist},PQ{pq_subquantizers(dim)}x{pq_bits(n_vectors)}"
+    else:
+        raise ValueError(f"Unknown index type: {index_type}")
+
+    return faiss.index_factory(dim, description, faiss.METRIC_INNER_PRODUCT)
+
+
+def build_index(
+    vectors: np.ndarray,
+    index_type: Optional[str] = None,
+    ids: Optional[np.ndarray] = None,
+) -> faiss.Index:
+    """
+    Vektörler için uygun tipte index oluşturur, eğitir ve vektörleri ekler.
+
+    Args:
+        vectors: L2 normalize edilmiş (N, dim) float32 vektörler
+        index_type: İstenen tip (varsayılan: corpus boyutuna göre seçilir)
+        ids: Vektörlerin 64-bit id'leri (varsayılan: 0..N-1)
+
+    Returns:
+        Vektörleri id'leriyle içeren FAISS index'i
+    """
+    index_type = choose_index_type(len(vectors), index_type)
+    index = create_index(index_type, vectors.shape[1], len(vectors))
+
+    if not index.is_trained:
+        train_index(index, vectors)
+
+    if ids is None:
+        ids = np.arange(len(vectors))
+
+    index = with_ids(index)
+    index.add_with_ids(vectors, np.asarray(ids, dtype="int64"))
+
+    logger.info(f"Built {index_type} index with {index.ntotal} vectors")
+
+    return index
+
+
+def with_ids(index: faiss.Index) -> faiss.Index:
+    """
+    Index'i vektörleri verilen id'lerle saklayacak hale getirir.
+
+    IVF index'leri id'leri listelerinde tutar ve id ile silmeyi kendisi
+    destekler; id'den vektöre erişim için hash tablolu direct map açılır.
+    IndexIDMap IVF'te silme sonrası id'leri kaydırdığı için kullanılmaz.
+    Diğer tipler IndexIDMap2 ile sarılır.
+
+    Args:
+        index: Boş, eğitilmiş FAISS index'i
+
+    Returns:
+        add_with_ids ve remove_ids destekleyen index
+    """
+    if get_index_type(index) in IVF_INDEX_TYPES:
+        index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return index
+
+    return faiss.IndexIDMap2(index)
+
+
+def has_ids(index: faiss.Index) -> bool:
+    """
+    Index'in vektörleri kalıcı id'lerle saklayıp saklamadığını döndürür.
+
+    with_ids'ten önce kaydedilmiş index'lerde id'ler ekleme sırasıdır.
+    """
+    if isinstance(index, faiss.IndexIDMap):
+        return True
+
+    return (
+        get_index_type(index) in IVF_INDEX_TYPES
+        and faiss.extract_index_ivf(index).direct_map.type == faiss.DirectMap.Hashtable
+    )
+
+
+def base_index(index: faiss.Index) -> faiss.Index:
+    """
+    IndexIDMap ile sarılmış index'in asıl index'ini döndürür.
+    """
+    if isinstance(index, faiss.IndexIDMap):
+        return faiss.downcast_index(index.index)
+
+    return index
+
+
+def train_index(index: faiss.Index, vectors: np.ndarray) -> None:
+    """
+    Index'i vektörlerden alınan bir örneklemle eğitir.
+
+    Örneklem boyutu öğrenilecek merkez sayısına göre sınırlanır (IVF'de
+    küme, PQ'da alt quantizer başına merkez sayısı).
+
+    Args:
+        index: Eğitilmemiş FAISS index'i
+        vectors: Eğitimde kullanılacak (N, dim) float32 vektörler
+    """
+    index_type = get_index_type(index)
+
+    if index_type in IVF_INDEX_TYPES:
+        centroids = faiss.extract_index_ivf(index).nlist
+    elif index_type == "pq":
+        centroids = base_index(index).pq.ksub
+    else:
+        centroids = len(vectors)
+
+    sample_size = min(len(vectors), centroids * MAX_POINTS_PER_CENTROID)
+
+    if sample_size < len(vectors):
+        rng = np.random.default_rng(0)
+        vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+
+    logger.info(f"Training {index_type} index on {len(vectors)} vectors")
+
+    index.train(vectors)
+
+
+def get_index_type(index: faiss.Index) -> str:
+    """
+    Mevcut bir index'in tipini döndürür.
+
+    Args:
+        index: FAISS index'i
+
+    Returns:
+        INDEX_TYPES içinden bir tip
+    """
+    index = base_index(index)
+
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf_flat"
+
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+
+    if isinstance(index, faiss.IndexPQ):
+        return "pq"
+
+    if isinstance(index, faiss.IndexScalarQuantizer):
+        if index.sq.qtype == faiss.ScalarQuantizer.QT_fp16:
+            return "fp16"
+        return "sq8"
+
+    return "flat"
+
+
+def search_parameters(
+    index: faiss.Index,
+    k: int,
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None,
+    selector: Optional[faiss.IDSelector] = None,
+) -> Optional[faiss.SearchParameters]:
+    """
+    Index tipine uygun arama parametrelerini oluşturur.
+
+    Parametreler her aramaya ayrı verilir; index'in paylaşılan durumu
+    değişmediği için eşzamanlı aramalar farklı değerler kullanabilir.
+
+    Args:
+        index: Aranacak FAISS index'i
+        k: Aramada istenen sonuç sayısı
+        nprobe: IVF'de taranacak liste sayısı (varsayılan: settings'den alınır)
+        ef_search: HNSW arama kuyruğu boyutu (varsayılan: settings'den alınır)
+        selector: Sadece seçilen id'leri döndüren filtre (opsiyonel). Çağıran
+                  arama bitene kadar selector'a referans tutmalıdır.
+
+    Returns:
+        SearchParameters veya filtresiz tarama tipleri için None
+    """
+    index_type = get_index_type(index)
+
+    if index_type in IVF_INDEX_TYPES:
+        nlist = faiss.extract_index_ivf(index).nlist
+        params = faiss.SearchParametersIVF(
+            nprobe=min(nprobe or settings.DEFAULT_NPROBE, nlist)
+        )
+    elif index_type == "hnsw":
+        # efSearch k'dan küçükse HNSW k sonuç döndüremez
+        params = faiss.SearchParametersHNSW(
+            efSearch=max(ef_search or settings.DEFAULT_EF_SEARCH, k)
+        )
+    elif selector is not None:
+        params = faiss.SearchParameters()
+    else:
+        return None
+
+    if selector is not None:
+        params.sel = selector
+
+    return params
+
+
+def reconstruct_ids(index: faiss.Index, ids: Sequence[int]) -> np.ndarray:
+    """
+    Verilen id'lerdeki vektörleri index'ten geri okur.
+
+    Kayıplı tiplerde vektörler sıkıştırılmış kodlardan yaklaşık olarak
+    elde edilir.
+
+    Args:
+        index: build_index ile oluşturulmuş FAISS index'i
+        ids: Index'te bulunan id'ler
+
+    Returns:
+        (len(ids), dim) float32 vektörler
+    """
+    return index.reconstruct_batch(np.asarray(ids, dtype="int64"))
+
+
+def supports_removal(index: faiss.Index) -> bool:
+    """
+    Index'in vektörleri remove_ids ile silip silemediğini döndürür.
+
+    HNSW grafı silmeyi desteklemez; silinen id'ler aramada filtrelenir.
+    """
+    return get_index_type(index) != "hnsw"
+
+
+def remove_range(index: faiss.Index, start: int, end: int) -> int:
+    """
+    [start, end) aralığındaki id'leri index'ten siler.
+
+    IVF'in hash tablolu direct map'i sadece id listesiyle silmeyi
+    desteklediği için aralık id listesine çevrilir.
+
+    Args:
+        index: supports_removal True olan FAISS index'i
+        start: İlk id
+        end: Son id'nin bir fazlası
+
+    Returns:
+        Silinen vektör sayısı
+    """
+    if get_index_type(index) in IVF_INDEX_TYPES:
+        selector = faiss.IDSelectorArray(np.arange(start, end, dtype="int64"))
+    else:
+        selector = faiss.IDSelectorRange(start, end)
+
+    return index.remove_ids(selector)
+
+
+def read_index(path: str, mmap: bool = False) -> faiss.Index:
+    """
+    Index'i dosyadan okur.
+
+    mmap modunda vektör kodları ve IVF listeleri kopyalanmadan dosyadan
+    map'lenir: açılış süresi index boyutundan bağımsızdır ve aynı dosyayı
+    açan process'ler sayfaları paylaşır. Map'lenmiş index salt okunurdur;
+    değiştirilmeden önce writable_copy ile belleğe kopyalanmalıdır.
+
+    Args:
+        path: Index dosya yolu
+        mmap: Dosya memory-mapped açılsın mı
+
+    Returns:
+        FAISS index'i
+    """
+    return faiss.read_index(path, faiss.IO_FLAG_MMAP_IFC if mmap else 0)
+
+
+def write_index(index: faiss.Index, path: str) -> None:
+    """
+    Index'i geçici dosyaya yazıp hedefin yerine taşır.
+
+    Hedef dosya yerinde üzerine yazılmaz; dosyayı map'lemiş process'ler
+    eski içeriği okumaya devam eder.
+
+    Args:
+        index: FAISS index'i
+        path: Index dosya yolu
+    """
+    tmp_path = f"{path}.tmp"
+    faiss.write_index(index, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def writable_copy(index: faiss.Index) -> faiss.Index:
+    """
+    Memory-mapped açılmış index'in bellekte, değiştirilebilir kopyasını döndürür.
+    """
+    return faiss.deserialize_index(faiss.serialize_index(index))
+
+
+def is_lossy(index: faiss.Index) -> bool:
+    """
+    Index'in vektörleri kayıplı sıkıştırıp sıkıştırmadığını döndürür.
+    """
+    return get_index_type(index) in LOSSY_INDEX_TYPES
+
+
+def ivf_nlist(n_vectors: int) -> int:
+    """
+    IVF küme sayısını döndürür.
+
+    Varsayılan 4 * sqrt(N)'dir; her kümeye en az MIN_POINTS_PER_CENTROID
+    eğitim noktası düşecek şekilde sınırlanır.
+    """
+    nlist = settings.IVF_NLIST or int(4 * math.sqrt(n_vectors))
+    return max(1, min(nlist, n_vectors // MIN_POINTS_PER_CENTROID))
+
+
+def pq_subquantizers(dim: int) -> int:
+    """
+    PQ alt quantizer sayısını döndürür.
+
+    Varsayılan olarak her alt quantizer 8 boyutu kodlar; sayı embedding
+    boyutunu tam bölmelidir.
+    """
+    m = settings.IVF_PQ_M or max(1, dim // 8)
+
+    while dim % m:
+        m -= 1
+
+    return m
+
+
+def pq_bits(n_vectors: int) -> int:
+    """
+    PQ kod başına bit sayısını döndürür.
+
+    8 bit (256 merkez) her alt quantizer için yaklaşık 10 bin eğitim noktası
+    gerektirir; daha küçük corpus'larda merkez sayısı azaltılır.
+    """
+    bits = int(math.log2(max(2, n_vectors // MIN_POINTS_PER_CENTROID)))
+    return max(1, min(8, bits))
@@ -0,0 +1,290 @@
+"""
+Bu modül SearchEngine'in diskteki kayıtlarını segment'ler halinde yönetir.
+Her kayıt tüm index'i yeniden yazmak yerine sadece yeni frame'leri içeren
+küçük, değişmez bir shard yazar; shard'lar arka planda tek bir snapshot'ta
+birleştirilir. Hangi dosyaların geçerli olduğunu manifest belirler.
+"""
+
+import json
+import os
+import pickle
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.frame_metadata_store import FrameMetadataStore
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+# Yazılması yarım kalan dizinler bu önekle başlar ve açılışta silinir
+TMP_PREFIX = ".tmp_"
+
+
+class IndexStore:
+    """
+    Manifest, snapshot ve shard dizinlerinden oluşan kayıt deposu.
+
+        manifest.json              geçerli snapshot, shard'lar ve silinen videolar
+        snapshot_000003/
+            index.faiss            FAISS index'i
+            metadata.pkl           video metadata'sı, id aralıkları, next_id
+            frames/                FrameMetadataStore sütunları
+        shard_000004/
+            vectors.npy            shard'daki frame'lerin vektörleri
+            metadata.pkl           frame ve video metadata'sı, id aralığı
+
+    Her dizin geçici adla yazılıp yerine taşınır ve ancak manifest'e
+    girdikten sonra geçerli olur. Manifest de geçici dosyadan rename ile
+    değiştirildiği için yarım kalan bir yazma önceki kaydı bozmaz.
+    """
+
+    def __init__(self, directory: Path):
+        """
+        IndexStore instance'ı oluşturur ve manifest'i okur.
+
+        Manifest'te olmayan (yarım kalmış veya birleştirilmiş) dizinler silinir.
+
+        Args:
+            directory: Deponun dizini
+        """
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self.manifest: Optional[Dict] = None
+        # Son ayrılan dizin sıra numarası; dizin adları tekrar kullanılmaz
+        self._sequence = 0
+
+        manifest_path = self.directory / MANIFEST_NAME
+        if manifest_path.exists():
+            self.manifest = json.loads(manifest_path.read_text())
+            self._sequence = self.manifest["sequence"]
+            self._remove_unreferenced()
+
+    @property
+    def snapshot(self) -> Optional[Path]:
+        """
+        Geçerli snapshot dizini (henüz snapshot yoksa None).
+        """
+        if self.manifest is None:
+            return None
+
+        return self.directory / self.manifest["snapshot"]
+
+    @property
+    def shards(self) -> List[Path]:
+        """
+        Snapshot'tan sonra yazılmış shard dizinleri (yazılma sırasıyla).
+        """
+        if self.manifest is None:
+            return []
+
+        return [self.directory / name for name in self.manifest["shards"]]
+
+    @property
+    def removed(self) -> List[Tuple[str, Optional[int]]]:
+        """
+        Snapshot'tan sonra silinen videolar (silinme sırasıyla).
+
+        Her kayıt (video_id, before_id) çiftidir; silme videonun before_id'den
+        önce başlayan id aralıklarını kapsar. Eski kayıtlarda before_id None'dır.
+        """
+        if not self.manifest:
+            return []
+
+        return [
+            (entry, None)
+            if isinstance(entry, str)
+            else (entry["video_id"], entry["before_id"])
+            for entry in self.manifest["removed"]
+        ]
+
+    @staticmethod
+    def snapshot_files(snapshot: Path) -> Tuple[Path, Path, Path]:
+        """
+        Snapshot dizinindeki (index, metadata, frames) yollarını döndürür.
+        """
+        return snapshot / "index.faiss", snapshot / "metadata.pkl", snapshot / "frames"
+
+    def write_shard(self, vectors: np.ndarray, metadata: Dict) -> Path:
+        """
+        Yeni bir shard yazar ve manifest'e ekler.
+
+        Args:
+            vectors: Shard'daki frame'lerin (N, dim) vektörleri
+            metadata: Frame ve video metadata'sı (pickle ile saklanır)
+
+        Returns:
+            Shard dizini
+
+        Raises:
+            RuntimeError: Henüz snapshot yoksa
+        """
+        with self._lock:
+            if self.manifest is None:
+                raise RuntimeError("Cannot write a shard before the first snapshot")
+
+            name = self._next_name("shard")
+            tmp_dir = self._tmp_dir(name)
+
+            with open(tmp_dir / "vectors.npy", "wb") as f:
+                np.save(f, np.ascontiguousarray(vectors, dtype="float32"))
+                _sync(f)
+            with open(tmp_dir / "metadata.pkl", "wb") as f:
+                pickle.dump(metadata, f)
+                _sync(f)
+
+            os.replace(tmp_dir, self.directory / name)
+
+            self._write_manifest(
+                dict(self.manifest, shards=self.manifest["shards"] + [name])
+            )
+
+        logger.info(f"Wrote shard {name} with {len(vectors)} vectors")
+
+        return self.directory / name
+
+    @staticmethod
+    def read_shard(shard: Path) -> Tuple[np.ndarray, Dict]:
+        """
+        Bir shard'ın vektörlerini ve metadata'sını okur.
+
+        Returns:
+            (vektörler, metadata) tuple'ı
+        """
+        vectors = np.load(shard / "vectors.npy")
+
+        with open(shard / "metadata.pkl", "rb") as f:
+            metadata = pickle.load(f)
+
+        return vectors, metadata
+
+    def add_removal(self, video_id: str, before_id: int) -> None:
+        """
+        Silinen bir videoyu manifest'e ekler.
+
+        Henüz snapshot yoksa diskte silinecek bir şey olmadığı için atlanır.
+
+        Args:
+            video_id: Silinen video ID'si
+            before_id: Silme anındaki kaydedilmiş id sınırı; aynı video_id ile
+                       sonradan eklenen frame'ler silmeye dahil edilmez
+        """
+        entry = {"video_id": video_id, "before_id": before_id}
+
+        with self._lock:
+            if self.manifest is None:
+                return
+
+            self._write_manifest(
+                dict(self.manifest, removed=self.manifest["removed"] + [entry])
+            )
+
+    def write_snapshot(
+        self,
+        index_data: np.ndarray,
+        metadata: Dict,
+        frames: FrameMetadataStore,
+        merged_shards: List[Path],
+        merged_removals: int,
+    ) -> Path:
+        """
+        Yeni bir snapshot yazar ve birleştirdiği shard'ların yerine geçirir.
+
+        Snapshot yazılırken eklenen shard'lar ve silmeler manifest'te kalır.
+
+        Args:
+            index_data: faiss.serialize_index çıktısı
+            metadata: Video metadata'sı, id aralıkları ve next_id
+            frames: Snapshot'taki frame metadata'sı
+            merged_shards: Snapshot'ın içerdiği shard dizinleri
+            merged_removals: Snapshot'a uygulanmış silme sayısı (manifest başından)
+
+        Returns:
+            Snapshot dizini
+        """
+        # Snapshot kilit dışında yazılır; bu sırada shard ve silmeler eklenebilir
+        with self._lock:
+            name = self._next_name("snapshot")
+
+        tmp_dir = self._tmp_dir(name)
+        index_path, metadata_path, frames_path = self.snapshot_files(tmp_dir)
+
+        with open(index_path, "wb") as f:
+            f.write(index_data.tobytes())
+            _sync(f)
+        with open(metadata_path, "wb") as f:
+            pickle.dump(metadata, f)
+            _sync(f)
+        frames.save(frames_path)
+
+        os.replace(tmp_dir, self.directory / name)
+
+        with self._lock:
+            previous = self.manifest or {"shards": [], "removed": []}
+            merged = {shard.name for shard in merged_shards}
+
+            self._write_manifest(
+                {
+                    "snapshot": name,
+                    "shards": [s for s in previous["shards"] if s not in merged],
+                    "removed": previous["removed"][merged_removals:],
+                }
+            )
+            self._remove_unreferenced()
+
+        logger.info(f"Wrote snapshot {name} merging {len(merged_shards)} shards")
+
+        return self.directory / name
+
+    def _next_name(self, kind: str) -> str:
+        """
+        Sıradaki dizin adını ayırır (kilit altında çağrılmalıdır).
+        """
+        self._sequence += 1
+        return f"{kind}_{self._sequence:06d}"
+
+    def _tmp_dir(self, name: str) -> Path:
+        """
+        Bir dizin için boş geçici dizin oluşturur.
+        """
+        tmp_dir = self.directory / f"{TMP_PREFIX}{name}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        return tmp_dir
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        """
+        Manifest'i geçici dosyaya yazıp rename ile değiştirir.
+        """
+        manifest = dict(manifest, sequence=self._sequence)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{TMP_PREFIX}{MANIFEST_NAME}"
+
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+            _sync(f)
+
+        os.replace(tmp_path, self.directory / MANIFEST_NAME)
+        self.manifest = manifest
+
+    def _remove_unreferenced(self) -> None:
+        """
+        Manifest'te olmayan snapshot, shard ve geçici dizinleri siler.
+        """
+        referenced = {self.manifest["snapshot"], *self.manifest["shards"]}
+
+        for path in self.directory.iterdir():
+            if path.is_dir() and path.name not in referenced:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+def _sync(f) -> None:
+    """
+    Dosyanın içeriğini diske yazdırır.
+    """
+    f.flush()
+    os.fsync(f.fileno())
@@ -0,0 +1,315 @@
+"""
+Bu modül CLIP image ve text tower'larını çalıştıran inference backend'lerini içerir.
+PyTorch backend'i tower'ı doğrudan çalıştırır; ONNX backend'i tower'ı ONNX'e
+export edip ONNX Runtime ile (isteğe bağlı int8 quantization ile) çalıştırır.
+Her encoder tek bir tower'dan sorumludur, böylece tower'lar birbirinden
+bağımsız yüklenebilir.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+import torch
+
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INFERENCE_BACKENDS = ("torch", "onnx")
+TOWERS = ("image", "text")
+
+# Tower başına model girdileri
+_INPUT_NAMES = {
+    "image": ["pixel_values"],
+    "text": ["input_ids", "attention_mask"],
+}
+
+
+class TorchEncoder:
+    """
+    Bir CLIP tower'ını PyTorch ile çalıştıran encoder.
+    """
+
+    name = "torch"
+
+    def __init__(self, model, tower: str, device: str):
+        """
+        TorchEncoder instance'ı oluşturur.
+
+        Args:
+            model: Tower'ı içeren model (CLIPModel veya tek tower'lı CLIP modeli)
+            tower: Tower ismi ('image' veya 'text')
+            device: İşlem cihazı 'cpu' veya 'cuda'
+        """
+        self.tower = tower
+        self.device = device
+        self.module = _tower_module(model, tower).to(device).eval()
+
+    def encode(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        """
+        Preprocess edilmiş batch'i tower'dan geçirir.
+
+        Args:
+            inputs: Processor/tokenizer çıktısı
+
+        Returns:
+            Feature vektörleri numpy array (N, embedding_dim)
+        """
+        inputs = {
+            name: inputs[name].to(self.device) for name in _INPUT_NAMES[self.tower]
+        }
+
+        with torch.no_grad():
+            features = self.module(**inputs)
+
+        return features.cpu().numpy()
+
+
+class OnnxEncoder:
+    """
+    Bir CLIP tower'ını ONNX Runtime ile çalıştıran encoder.
+
+    Tower ilk kullanımda model_dir altına export edilir, sonraki başlatmalarda
+    diskteki dosya kullanılır ve PyTorch ağırlıkları hiç yüklenmez.
+    quantize=True ise ağırlıklar dinamik int8 quantization ile küçültülür
+    (aktivasyonlar çalışma anında quantize edilir, kalibrasyon verisi gerekmez).
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        load_model: Callable[[], torch.nn.Module],
+        tower: str,
+        model_name: str,
+        device: str = "cpu",
+        quantize: Optional[bool] = None,
+        model_dir: Optional[Path] = None,
+        num_threads: Optional[int] = None,
+    ):
+        """
+        OnnxEncoder instance'ı oluşturur.
+
+        Args:
+            load_model: Export gerektiğinde tower modelini yükleyen fonksiyon
+            tower: Tower ismi ('image' veya 'text')
+            model_name: Model ismi (export dizinini belirler)
+            device: İşlem cihazı 'cpu' veya 'cuda'
+            quantize: Dinamik int8 quantization kullanılsın mı (varsayılan: settings'den alınır)
+            model_dir: ONNX dosyalarının saklanacağı dizin (varsayılan: settings'den alınır)
+            num_threads: ONNX Runtime intra-op thread sayısı, 0 ise otomatik
+                         (varsayılan: settings'den alınır)
+
+        Raises:
+            RuntimeError: onnxruntime kurulu değilse
+        """
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError(
+                "The onnx inference backend requires onnxruntime to be installed"
+            ) from e
+
+        self.tower = tower
+        self.quantize = settings.ONNX_QUANTIZE if quantize is None else quantize
+        self.model_dir = Path(
+            model_dir or settings.ONNX_MODEL_DIR
+        ) / model_name.replace("/", "--")
+        num_threads = settings.ONNX_THREADS if num_threads is None else num_threads
+
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = num_threads
+
+        providers = ["CPUExecutionProvider"]
+        if device == "cuda":
+            providers.insert(0, "CUDAExecutionProvider")
+
+        model_path = self._ensure_model(load_model)
+        self.session = onnxruntime.InferenceSession(
+            str(model_path), session_options, providers=providers
+        )
+
+        logger.info(
+            f"OnnxEncoder for {tower} tower initialized from {model_path} "
+            f"({'int8' if self.quantize else 'fp32'})"
+        )
+
+    def encode(self, inputs: Dict[str, torch.Tensor]) -> np.ndarray:
+        """
+        Preprocess edilmiş batch'i tower'dan geçirir.
+
+        Args:
+            inputs: Processor/tokenizer çıktısı
+
+        Returns:
+            Feature vektörleri numpy array (N, embedding_dim)
+        """
+        dtype = "float32" if self.tower == "image" else "int64"
+        feed = {
+            name: np.asarray(inputs[name], dtype=dtype)
+            for name in _INPUT_NAMES[self.tower]
+        }
+        return self.session.run(None, feed)[0]
+
+    def _ensure_model(self, load_model: Callable[[], torch.nn.Module]) -> Path:
+        """
+        Tower'ın ONNX dosyasını döndürür, yoksa export eder.
+
+        Args:
+            load_model: Tower modelini yükleyen fonksiyon
+
+        Returns:
+            Kullanılacak ONNX dosya yolu
+        """
+        fp32_path = self.model_dir / f"{self.tower}.onnx"
+        int8_path = self.model_dir / f"{self.tower}.int8.onnx"
+
+        if not fp32_path.exists():
+            logger.info(f"Exporting {self.tower} tower to {fp32_path}")
+            self.model_dir.mkdir(parents=True, exist_ok=True)
+
+            module = _tower_module(load_model(), self.tower).eval()
+            input_names = _INPUT_NAMES[self.tower]
+
+            # Batch (ve metinde sequence) boyutu çalışma anında değişebilir
+            axes = (
+                {0: "batch"} if self.tower == "image" else {0: "batch", 1: "sequence"}
+            )
+            dynamic_axes = {name: axes for name in input_names}
+            dynamic_axes["features"] = {0: "batch"}
+
+            tmp_path = fp32_path.with_suffix(".onnx.tmp")
+            with torch.no_grad():
+                torch.onnx.export(
+                    module,
+                    module.example_inputs(),
+                    str(tmp_path),
+                    input_names=input_names,
+                    output_names=["features"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=17,
+                    dynamo=False,
+                )
+            tmp_path.replace(fp32_path)
+
+        if not self.quantize:
+            return fp32_path
+
+        if not int8_path.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            logger.info(f"Quantizing {self.tower} tower to {int8_path}")
+
+            tmp_path = int8_path.with_suffix(".onnx.tmp")
+            quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+            tmp_path.replace(int8_path)
+
+        return int8_path
+
+
+class _ImageTower(torch.nn.Module):
+    """pixel_values -> image embedding hesaplayan modül."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.vision_model = model.vision_model
+        self.visual_projection = model.visual_projection
+
+    def forward(self, pixel_values):
+        pooled = self.vision_model(pixel_values=pixel_values).pooler_output
+        return self.visual_projection(pooled)
+
+    def example_inputs(self) -> tuple:
+        size = self.vision_model.config.image_size
+        return (torch.zeros(1, 3, size, size),)
+
+
+class _TextTower(torch.nn.Module):
+    """(input_ids, attention_mask) -> text embedding hesaplayan modül."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.text_model = model.text_model
+        self.text_projection = model.text_projection
+
+    def forward(self, input_ids, attention_mask):
+        pooled = self.text_model(
+            input_ids=input_ids, attention_mask=attention_mask
+        ).pooler_output
+        return self.text_projection(pooled)
+
+    def example_inputs(self) -> tuple:
+        return (
+            torch.ones(1, 8, dtype=torch.long),
+            torch.ones(1, 8, dtype=torch.long),
+        )
+
+
+def _tower_module(model, tower: str) -> torch.nn.Module:
+    """
+    Modelden istenen tower'ı embedding döndüren bir modül olarak ayırır.
+
+    CLIPModel ile CLIPVisionModelWithProjection / CLIPTextModelWithProjection
+    aynı alt modül isimlerini kullandığı için ikisi de desteklenir.
+    """
+    if tower == "image":
+        return _ImageTower(model)
+
+    return _TextTower(model)
+
+
+def create_encoder(
+    backend: str,
+    tower: str,
+    load_model: Callable[[], torch.nn.Module],
+    model_name: str,
+    device: str,
+) -> Union[TorchEncoder, OnnxEncoder]:
+    """
+    İsmine göre bir tower için inference encoder'ı oluşturur.
+
+    Args:
+        backend: Backend ismi ('torch' veya 'onnx')
+        tower: Tower ismi ('image' veya 'text')
+        load_model: Tower modelini yükleyen fonksiyon
+        model_name: Model ismi
+        device: İşlem cihazı
+
+    Returns:
+        Encoder instance'ı
+
+    Raises:
+        ValueError: Bilinmeyen backend veya tower isminde
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend}")
+
+    if tower not in TOWERS:
+        raise ValueError(f"Unknown model tower: {tower}")
+
+    if backend == "onnx":
+        return OnnxEncoder(load_model, tower, model_name, device)
+
+    return TorchEncoder(load_model(), tower, device)
+
+
+def compare_encoders(reference, candidate, inputs: Dict[str, torch.Tensor]) -> float:
+    """
+    İki encoder'ın aynı girdiler için ürettiği embedding'leri karşılaştırır.
+
+    Args:
+        reference: Referans encoder (genellikle TorchEncoder)
+        candidate: Karşılaştırılacak encoder
+        inputs: Preprocess edilmiş batch
+
+    Returns:
+        Satır satır cosine benzerliklerinin en düşüğü
+    """
+    first = reference.encode(inputs)
+    second = candidate.encode(inputs)
+
+    first = first / np.linalg.norm(first, axis=1, keepdims=True)
+    second = second / np.linalg.norm(second, axis=1, keepdims=True)
+    return float(np.min(np.sum(first * second, axis=1)))
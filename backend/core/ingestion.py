@@ -0,0 +1,357 @@
+"""
+Bu modül video ingestion akışını yönetir.
+Decoder'dan gelen frame'leri JPEG olarak yazıp geri okumadan doğrudan
+embedding batch'lerine aktarır, thumbnail'ları ise yan tarafta diske yazar.
+Embedding'ler index'e parça parça eklendiği için uzun videolar işlenirken
+aranabilir hale gelir.
+"""
+
+import dataclasses
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.settings import settings
+from core.feature_extractor import FeatureExtractor
+from core.search_engine import SearchEngine
+from core.video_processor import (
+    FrameMetadata,
+    SamplingOptions,
+    VideoMetadata,
+    VideoProcessor,
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Decoder thread'inin akışın bittiğini bildirmek için kullandığı işaret
+_END_OF_STREAM = object()
+
+
+class IngestionPipeline:
+    """
+    Akış tabanlı video ingestion sınıfı.
+
+    Decode ve model inference'ı örtüştürür: decoder ayrı bir thread'de
+    frame'leri sınırlı boyutlu bir kuyruğa koyar, ana thread bu kuyruktan
+    batch'ler oluşturup FeatureExtractor'a verir. Embedding'i çıkarılan
+    frame'ler commit_frames kadar biriktikçe index'e eklenir; videonun
+    indexed_until değeri aranabilir kısmın sonunu gösterir.
+    """
+
+    def __init__(
+        self,
+        video_processor: VideoProcessor,
+        feature_extractor: FeatureExtractor,
+        search_engine: SearchEngine,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        commit_frames: Optional[int] = None,
+    ):
+        """
+        IngestionPipeline instance'ı oluşturur.
+
+        Args:
+            video_processor: Frame'leri üreten VideoProcessor
+            feature_extractor: Embedding'leri çıkaran FeatureExtractor
+            search_engine: Embedding'lerin ekleneceği SearchEngine
+            batch_size: Embedding batch boyutu (varsayılan: settings'den alınır)
+            queue_size: Decoder kuyruğunun maksimum frame sayısı (varsayılan: settings'den alınır)
+            commit_frames: Index'e bir seferde eklenen frame sayısı (varsayılan: settings'den alınır)
+        """
+        self.video_processor = video_processor
+        self.feature_extractor = feature_extractor
+        self.search_engine = search_engine
+        self.batch_size = batch_size or settings.INGEST_BATCH_SIZE
+        self.queue_size = queue_size or settings.INGEST_QUEUE_SIZE
+        self.commit_frames = commit_frames or settings.INGEST_COMMIT_FRAMES
+
+        logger.info(
+            f"IngestionPipeline initialized with batch size {self.batch_size}, "
+            f"queue size {self.queue_size}, commit size {self.commit_frames}"
+        )
+
+    def run(
+        self,
+        video_file_path: Path,
+        original_filename: str,
+        options: Optional[SamplingOptions] = None,
+        content_hash: Optional[str] = None,
+        video_id: Optional[str] = None,
+        progress: Optional[Callable[..., None]] = None,
+    ) -> Tuple[str, List[FrameMetadata], VideoMetadata]:
+        """
+        Video'yu doğrular, frame'lerini embedding'e dönüştürür ve index'e ekler.
+
+        Frame'ler index'e commit_frames'lik parçalar halinde eklenir; video
+        işlenirken eklenen kısmı aranabilir. İşlem yarıda kesilirse videonun
+        eklenen parçaları index'te kalır, çağıran bunları silmelidir.
+
+        Args:
+            video_file_path: Video dosya yolu (geçici dosya)
+            original_filename: Orijinal dosya adı
+            options: Upload'a özel örnekleme seçenekleri
+            content_hash: Video dosyasının içerik hash'i (tekrar upload tespiti için)
+            video_id: Önceden atanmış video ID'si (verilmezse yenisi üretilir)
+            progress: İlerleme bildirimi; stage, frames_processed ve percent
+                      keyword argümanlarıyla çağrılır
+
+        Returns:
+            (video_id, frame_metadata_list, video_metadata) tuple'ı; video_metadata
+            videonun tamamen index'lenmiş son halidir
+
+        Raises:
+            ValueError: Video geçersizse veya hiç frame çıkarılamadıysa
+        """
+        video_id, video_path = self.video_processor.prepare_video(
+            video_file_path, original_filename, video_id
+        )
+        video_metadata, frames = self.video_processor.iter_frames(
+            video_path, video_id, original_filename, options
+        )
+        video_metadata.content_hash = content_hash
+
+        logger.info(f"Starting streaming ingestion for video {video_id}")
+
+        video_metadata.indexed_until = 0.0
+
+        frame_metadata_list: List[FrameMetadata] = []
+        # Henüz index'e eklenmemiş embedding'ler ve frame'leri
+        pending_features: List[np.ndarray] = []
+        pending_metadata: List[FrameMetadata] = []
+
+        with ThreadPoolExecutor(
+            max_workers=settings.THUMBNAIL_WORKERS, thread_name_prefix="thumbnail"
+        ) as thumbnail_writer:
+            for batch_metadata, batch_frames in self._iter_batches(
+                frames, thumbnail_writer
+            ):
+                # Son parça boş kalmasın diye dolan parça bir sonraki batch
+                # geldiğinde eklenir; son parça videonun sonunu işaretler
+                if len(pending_metadata) >= self.commit_frames:
+                    video_metadata = self._commit(
+                        pending_features, pending_metadata, video_metadata
+                    )
+                    pending_features, pending_metadata = [], []
+
+                pending_features.append(
+                    self.feature_extractor.extract_array_features(
+                        batch_frames, batch_size=self.batch_size
+                    )
+                )
+                pending_metadata.extend(batch_metadata)
+                frame_metadata_list.extend(batch_metadata)
+
+                logger.info(
+                    f"Embedded {len(frame_metadata_list)} frames of video {video_id}"
+                )
+
+                if progress:
+                    progress(
+                        stage="extracting",
+                        frames_processed=len(frame_metadata_list),
+                        percent=_percent(batch_metadata[-1], video_metadata),
+                    )
+
+        if not frame_metadata_list:
+            raise ValueError("No frames could be extracted from the video")
+
+        if progress:
+            progress(stage="indexing", percent=100.0)
+
+        video_metadata = self._commit(
+            pending_features,
+            pending_metadata,
+            video_metadata,
+            indexed_until=video_metadata.duration,
+        )
+
+        logger.info(
+            f"Streaming ingestion completed for video {video_id}: "
+            f"{len(frame_metadata_list)} frames"
+        )
+
+        return video_id, frame_metadata_list, video_metadata
+
+    def _commit(
+        self,
+        features: List[np.ndarray],
+        frame_metadata_list: List[FrameMetadata],
+        video_metadata: VideoMetadata,
+        indexed_until: Optional[float] = None,
+    ) -> VideoMetadata:
+        """
+        Biriken embedding'leri index'e ekler.
+
+        Yayınlanmış görünümler eski metadata nesnesini paylaştığı için
+        indexed_until güncellenmiş yeni bir kopya oluşturulur. Parçalar
+        SearchEngine'in delta'sına eklendiğinden her commit ana index'i
+        kopyalamaz; maliyeti parçanın boyutuyla orantılıdır.
+
+        Args:
+            features: Embedding batch'leri
+            frame_metadata_list: Batch'lerin frame metadata'sı
+            video_metadata: Videonun güncel metadata'sı
+            indexed_until: Aranabilir kısmın sonu (varsayılan: son frame'in bitişi)
+
+        Returns:
+            Index'e eklenen video metadata'sı
+        """
+        if indexed_until is None:
+            last = frame_metadata_list[-1]
+            indexed_until = last.end_time or last.timestamp
+
+        video_metadata = dataclasses.replace(
+            video_metadata, indexed_until=indexed_until
+        )
+        self.search_engine.build_index(
+            np.vstack(features), frame_metadata_list, video_metadata
+        )
+
+        logger.info(
+            f"Indexed video {video_metadata.video_id} up to {indexed_until:.1f}s"
+        )
+
+        return video_metadata
+
+    def _iter_batches(
+        self,
+        frames: Iterator[Tuple[FrameMetadata, np.ndarray]],
+        thumbnail_writer: ThreadPoolExecutor,
+    ) -> Iterator[Tuple[List[FrameMetadata], List[np.ndarray]]]:
+        """
+        Decoder thread'ini başlatır ve kuyruktan gelen frame'leri batch'ler.
+
+        Args:
+            frames: VideoProcessor.iter_frames'ten gelen frame iterator'ı
+            thumbnail_writer: Thumbnail'ları yazan thread pool
+
+        Yields:
+            (frame_metadata_listesi, rgb_frame_listesi) tuple'ı
+        """
+        frame_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop_event = threading.Event()
+
+        decoder = threading.Thread(
+            target=self._decode,
+            args=(frames, frame_queue, thumbnail_writer, stop_event),
+            name="frame-decoder",
+            daemon=True,
+        )
+        decoder.start()
+
+        try:
+            batch_metadata: List[FrameMetadata] = []
+            batch_frames: List[np.ndarray] = []
+
+            while True:
+                item = frame_queue.get()
+
+                if item is _END_OF_STREAM:
+                    break
+
+                if isinstance(item, Exception):
+                    raise item
+
+                frame_metadata, frame = item
+                batch_metadata.append(frame_metadata)
+                batch_frames.append(frame)
+
+                if len(batch_frames) >= self.batch_size:
+                    yield batch_metadata, batch_frames
+                    batch_metadata, batch_frames = [], []
+
+            if batch_frames:
+                yield batch_metadata, batch_frames
+
+        finally:
+            stop_event.set()
+            decoder.join()
+
+    def _decode(
+        self,
+        frames: Iterator[Tuple[FrameMetadata, np.ndarray]],
+        frame_queue: queue.Queue,
+        thumbnail_writer: ThreadPoolExecutor,
+        stop_event: threading.Event,
+    ) -> None:
+        """
+        Decoder thread gövdesi: frame'leri kuyruğa koyar, thumbnail yazımını başlatır.
+
+        Args:
+            frames: VideoProcessor.iter_frames'ten gelen frame iterator'ı
+            frame_queue: Tüketiciye frame aktaran sınırlı kuyruk
+            thumbnail_writer: Thumbnail'ları yazan thread pool
+            stop_event: Tüketici durduğunda set edilen event
+        """
+        # Yazılmayı bekleyen thumbnail sayısını sınırlar
+        pending_writes = threading.BoundedSemaphore(self.queue_size)
+
+        try:
+            for frame_metadata, frame in frames:
+                if stop_event.is_set():
+                    break
+
+                pending_writes.acquire()
+                future = thumbnail_writer.submit(
+                    self._write_thumbnail, frame_metadata.frame_path, frame
+                )
+                future.add_done_callback(lambda _: pending_writes.release())
+
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+                if not self._put(frame_queue, (frame_metadata, rgb_frame), stop_event):
+                    break
+
+        except Exception as e:
+            logger.error(f"Frame decoding failed: {e}", exc_info=True)
+            self._put(frame_queue, e, stop_event)
+
+        finally:
+            frames.close()
+            self._put(frame_queue, _END_OF_STREAM, stop_event)
+
+    @staticmethod
+    def _put(frame_queue: queue.Queue, item, stop_event: threading.Event) -> bool:
+        """
+        Kuyruğa eleman koyar, tüketici durmuşsa beklemeyi bırakır.
+
+        Returns:
+            Eleman kuyruğa konduysa True
+        """
+        while not stop_event.is_set():
+            try:
+                frame_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    @staticmethod
+    def _write_thumbnail(frame_path: str, frame: np.ndarray) -> None:
+        """
+        Frame'i thumbnail olarak diske yazar.
+
+        Args:
+            frame_path: Hedef JPEG dosya yolu
+            frame: BGR frame görüntüsü
+        """
+        if not cv2.imwrite(frame_path, frame):
+            logger.warning(f"Could not write thumbnail: {frame_path}")
+
+
+def _percent(frame_metadata: FrameMetadata, video_metadata: VideoMetadata) -> float:
+    """
+    Son işlenen frame'e göre videonun işlenen yüzdesini döndürür.
+    """
+    if video_metadata.duration <= 0:
+        return 0.0
+
+    end_time = frame_metadata.end_time or frame_metadata.timestamp
+    return min(100.0, 100.0 * end_time / video_metadata.duration)
@@ -0,0 +1,371 @@
+"""
+Bu modül video ingestion işlerini SQLite'ta saklanan bir kuyrukta yürütür.
+Upload isteği işi kuyruğa ekleyip hemen döner; frame çıkarma, embedding ve
+index'e ekleme arka plandaki worker'larda yapılır. Kuyruk diskte tutulduğu
+için yarım kalan işler uygulama yeniden başladığında kaldığı yerden alınır.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# İş durumları: queued -> running -> completed / failed
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    original_filename TEXT NOT NULL,
+    content_hash TEXT,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    frames_processed INTEGER NOT NULL DEFAULT 0,
+    percent REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    updated_at REAL NOT NULL,
+    finished_at REAL
+)
+"""
+
+
+@dataclass
+class Job:
+    """
+    Bir ingestion işinin durumunu tutan veri sınıfı.
+
+    Attributes:
+        job_id: İş ID'si
+        video_id: İşin index'e ekleyeceği video ID'si (upload sırasında atanır)
+        file_path: İşlenecek video dosyasının yolu
+        original_filename: Orijinal dosya adı
+        content_hash: Video dosyasının içerik hash'i
+        options: Örnekleme seçenekleri (SamplingOptions alanları)
+        status: İş durumu (queued/running/completed/failed)
+        stage: Çalışan işin aşaması (ör. extracting/indexing/saving)
+        frames_processed: Embedding'i çıkarılan frame sayısı
+        percent: Videonun işlenen kısmı (0-100)
+        error: Başarısız işin hata mesajı
+        created_at: Kuyruğa eklenme zamanı (Unix zamanı)
+        started_at: Son çalıştırmanın başlangıç zamanı
+        updated_at: Son güncelleme zamanı
+        finished_at: Bitiş zamanı
+    """
+
+    job_id: str
+    video_id: str
+    file_path: str
+    original_filename: str
+    content_hash: Optional[str]
+    options: Dict = field(default_factory=dict)
+    status: str = QUEUED
+    stage: str = QUEUED
+    frames_processed: int = 0
+    percent: float = 0.0
+    error: Optional[str] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    updated_at: float = 0.0
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        """
+        İş tamamlandı veya başarısız oldu mu.
+        """
+        return self.status in (COMPLETED, FAILED)
+
+    @property
+    def frames_per_second(self) -> float:
+        """
+        Son çalıştırmadaki ortalama işleme hızı (frame/saniye).
+        """
+        if self.started_at is None:
+            return 0.0
+
+        elapsed = (self.finished_at or self.updated_at) - self.started_at
+        return self.frames_processed / elapsed if elapsed > 0 else 0.0
+
+
+class JobQueue:
+    """
+    SQLite'ta saklanan, worker thread'leriyle işlenen ingestion kuyruğu.
+
+    İşler eklenme sırasıyla alınır. Uygulama bir iş çalışırken kapanırsa iş
+    açılışta tekrar kuyruğa konur; handler işi baştan çalıştırabilmelidir.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        handler: Callable[[Job, Callable[..., None]], None],
+        workers: int = 1,
+    ):
+        """
+        JobQueue instance'ı oluşturur ve yarım kalmış işleri kuyruğa geri koyar.
+
+        Args:
+            db_path: SQLite veritabanı dosyası
+            handler: İşi yürüten fonksiyon; iş ve ilerleme bildirme fonksiyonunu
+                     (JobQueue.update ile aynı keyword argümanları) alır
+            workers: Aynı anda çalışan iş sayısı
+        """
+        self.db_path = db_path
+        self.handler = handler
+        self.workers = max(1, workers)
+
+        # Bağlantı worker'lar arasında paylaşılır; erişim kilitle sıralanır
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(_SCHEMA)
+            resumed = self._db.execute(
+                "UPDATE jobs SET status = ?, stage = ? WHERE status = ?",
+                (QUEUED, QUEUED, RUNNING),
+            ).rowcount
+
+        if resumed:
+            logger.info(f"Re-queued {resumed} interrupted ingestion jobs")
+
+    def start(self) -> None:
+        """
+        Worker thread'lerini başlatır.
+        """
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"ingestion-job-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        logger.info(f"JobQueue started with {self.workers} workers")
+
+    def submit(
+        self,
+        video_id: str,
+        file_path: str,
+        original_filename: str,
+        content_hash: Optional[str] = None,
+        options: Optional[Dict] = None,
+    ) -> Tuple[Job, bool]:
+        """
+        Aynı içerik için bekleyen veya çalışan iş yoksa yeni bir iş ekler.
+
+        Kontrol ve ekleme tek bir yazma transaction'ında yapılır; aynı
+        videonun eşzamanlı upload'ları (aynı veritabanını kullanan başka
+        process'lerden gelse bile) tek bir iş oluşturur.
+
+        Args:
+            video_id: İşin index'e ekleyeceği video ID'si
+            file_path: İşlenecek video dosyasının yolu
+            original_filename: Orijinal dosya adı
+            content_hash: Video dosyasının içerik hash'i (None ise kontrol yapılmaz)
+            options: Örnekleme seçenekleri
+
+        Returns:
+            (iş, eklendi) tuple'ı; aktif bir iş varsa o iş ve False döner
+        """
+        now = time.time()
+        job = Job(
+            job_id=str(uuid.uuid4()),
+            video_id=video_id,
+            file_path=file_path,
+            original_filename=original_filename,
+            content_hash=content_hash,
+            options=options or {},
+            created_at=now,
+            updated_at=now,
+        )
+
+        with self._wakeup:
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                row = (
+                    self._db.execute(
+                        "SELECT * FROM jobs WHERE content_hash = ? "
+                        "AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                        (content_hash, QUEUED, RUNNING),
+                    ).fetchone()
+                    if content_hash is not None
+                    else None
+                )
+
+                if row is None:
+                    self._db.execute(
+                        "INSERT INTO jobs (job_id, video_id, file_path, "
+                        "original_filename, content_hash, options, status, stage, "
+                        "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            job.job_id,
+                            job.video_id,
+                            job.file_path,
+                            job.original_filename,
+                            job.content_hash,
+                            json.dumps(job.options),
+                            job.status,
+                            job.stage,
+                            job.created_at,
+                            job.updated_at,
+                        ),
+                    )
+
+            if row is not None:
+                return _to_job(row), False
+
+            self._wakeup.notify()
+
+        logger.info(f"Queued ingestion job {job.job_id} for video {video_id}")
+
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        İşin güncel durumunu döndürür.
+
+        Args:
+            job_id: İş ID'si
+
+        Returns:
+            Job veya iş yoksa None
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+
+        return _to_job(row) if row else None
+
+    def update(self, job_id: str, **fields) -> None:
+        """
+        İşin alanlarını günceller.
+
+        Args:
+            job_id: İş ID'si
+            **fields: Güncellenecek Job alanları (ör. stage, frames_processed, percent)
+        """
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+
+        with self._lock, self._db:
+            self._db.execute(
+                f"UPDATE jobs SET {columns} WHERE job_id = ?",
+                (*fields.values(), job_id),
+            )
+
+    def close(self) -> None:
+        """
+        Worker'ları durdurur; çalışan işlerin bitmesi beklenir.
+
+        Kuyrukta bekleyen işler bir sonraki açılışta çalıştırılır.
+        """
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify_all()
+
+        for thread in self._threads:
+            thread.join()
+
+        self._db.close()
+
+    def _run(self) -> None:
+        """
+        Worker thread gövdesi: kuyruktaki işleri sırayla alıp çalıştırır.
+        """
+        while True:
+            job = self._claim()
+
+            if job is None:
+                return
+
+            self._execute(job)
+
+    def _claim(self) -> Optional[Job]:
+        """
+        En eski bekleyen işi çalışıyor olarak işaretleyip döndürür.
+
+        Kuyruk boşsa yeni iş eklenene kadar bekler; kuyruk kapandıysa None döner.
+        """
+        with self._wakeup:
+            while not self._closed:
+                row = self._db.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (QUEUED,),
+                ).fetchone()
+
+                if row is None:
+                    self._wakeup.wait()
+                    continue
+
+                now = time.time()
+                with self._db:
+                    self._db.execute(
+                        "UPDATE jobs SET status = ?, stage = ?, frames_processed = 0, "
+                        "percent = 0, started_at = ?, updated_at = ? WHERE job_id = ?",
+                        (RUNNING, RUNNING, now, now, row["job_id"]),
+                    )
+
+                job = _to_job(row)
+                job.status = job.stage = RUNNING
+                job.started_at = job.updated_at = now
+                return job
+
+        return None
+
+    def _execute(self, job: Job) -> None:
+        """
+        İşi handler ile çalıştırır ve sonucunu kaydeder.
+        """
+        logger.info(f"Starting ingestion job {job.job_id} for video {job.video_id}")
+
+        try:
+            self.handler(job, lambda **fields: self.update(job.job_id, **fields))
+        except Exception as e:
+            logger.exception(f"Ingestion job {job.job_id} failed")
+            self.update(
+                job.job_id,
+                status=FAILED,
+                stage=FAILED,
+                error=str(e),
+                finished_at=time.time(),
+            )
+            return
+
+        self.update(
+            job.job_id,
+            status=COMPLETED,
+            stage=COMPLETED,
+            percent=100.0,
+            finished_at=time.time(),
+        )
+
+        logger.info(f"Ingestion job {job.job_id} completed")
+
+
+def _to_job(row: sqlite3.Row) -> Job:
+    """
+    Veritabanı satırını Job nesnesine dönüştürür.
+    """
+    values = dict(row)
+    values["options"] = json.loads(values["options"])
+    return Job(**values)
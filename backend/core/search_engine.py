@@ -3,24 +3,94 @@ Bu modül FAISS tabanlı benzerlik araması yapar.
 Feature vektörlerini indeksler ve hızlı arama sağlar.
 """
 
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 import numpy as np
 import faiss
 import pickle
+import threading
 
 from config.settings import settings
 from utils.logger import get_logger
+from core import index_factory
+from core.frame_metadata_store import FrameMetadataStore
+from core.index_store import IndexStore
+from core.vector_file import VectorFile
 from core.video_processor import FrameMetadata, VideoMetadata
 
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class IndexView:
+    """
+    Aramaların kullandığı, yayınlandıktan sonra değişmeyen index görünümü.
+
+    Yazma işlemleri sonraki durumu görünümün dışında hazırlar ve yeni bir
+    görünüm olarak yayınlar. Arama başında aldığı görünümü sonuna kadar
+    kullanır; devam eden bir yüklemeyi beklemez ve yarım kalmış durumunu
+    görmez. Frame metadata deposu ve vektör dosyası append-only olduğu için
+    paylaşılır; görünüm bunların sadece next_id'den küçük satırlarını okur.
+    Ana index'e henüz eklenmemiş frame'ler (delta) vektör dosyasından
+    doğrudan taranır.
+    """
+
+    version: int
+    index: Optional[faiss.Index]
+    frames: FrameMetadataStore
+    vectors: Optional[VectorFile]
+    video_metadata_dict: Dict[str, VideoMetadata]
+    video_id_ranges: Dict[str, List[Tuple[int, int]]]
+    next_id: int
+    # HNSW'de silinmiş id'leri dışlayan filtre (IDSelectorBatch, IDSelectorNot)
+    removed_filter: Optional[Tuple[faiss.IDSelector, faiss.IDSelector]] = None
+    # Ana index'te olmayan, silinmemiş delta id'leri (artan sırada)
+    delta_ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype="int64"))
+
+    @property
+    def frame_count(self) -> int:
+        """
+        Görünümde aranabilir frame sayısını döndürür.
+        """
+        return _range_count(self.video_id_ranges)
+
+    def has_exact_vectors(self) -> bool:
+        """
+        Görünümdeki her vektörün tam hassasiyetli kopyası var mı.
+        """
+        return self.vectors is not None and len(self.vectors) >= self.next_id
+
+    def frame_metadata(self, frame_id: int) -> Optional[FrameMetadata]:
+        """
+        Bir arama sonucunun FrameMetadata nesnesini üretir.
+
+        Silinmiş videolara ait id'ler için None döner.
+        """
+        video_id = self.frames.video_id(frame_id)
+        ranges = self.video_id_ranges.get(video_id, [])
+
+        if not any(start <= frame_id < end for start, end in ranges):
+            return None
+
+        return self.frames.get(frame_id)
+
+
 class SearchEngine:
     """
     FAISS tabanlı arama motoru sınıfı.
 
-    Feature vektörlerini indeksler ve benzerlik araması yapar.
+    Feature vektörlerini indeksler ve benzerlik araması yapar. Yazma
+    işlemleri (ekleme, silme, yükleme, kaydetme) bir kilitle sıralanır;
+    aramalar kilit almaz ve son yayınlanan IndexView üzerinde çalışır.
+
+    Yayınlanmış index değiştirilemediği için her değişiklik index'in bir
+    kopyasını gerektirir. Eklemelerde bu maliyet corpus boyutunda olduğundan
+    yeni frame'ler önce delta'da tutulur: vektörleri zaten vektör dosyasında
+    olduğu için aramalarda doğrudan taranır. Delta INDEX_DELTA_MAX_VECTORS'a
+    ulaşınca (veya snapshot yazılmadan ya da index tipi değişmeden önce)
+    ana index'e tek seferde eklenir; index en fazla bu kadar eklemede bir
+    kopyalanır.
     """
 
     def __init__(
@@ -30,18 +100,72 @@ class SearchEngine:
         SearchEngine instance'ı oluşturur.
 
         Args:
-            index_path: FAISS index dosya yolu
-            metadata_path: Metadata dosya yolu
+            index_path: FAISS index dosya yolu; kayıt deposu ve vektör dosyası
+                        bu yolun yanında tutulur
+            metadata_path: Tek dosyalı eski kayıtların metadata dosya yolu
         """
         self.index_path = index_path or settings.FAISS_INDEX_PATH
         self.metadata_path = metadata_path or settings.METADATA_PATH
+        # Id sırasıyla tam hassasiyetli vektörler (yeniden skorlama için)
+        self.vectors_path = f"{self.index_path}.vectors"
+        # Snapshot ve shard'lardan oluşan kayıt deposu
+        self.store = IndexStore(Path(self.index_path).with_suffix(".store"))
+        # Diske yazılmış son frame id'sinin bir fazlası (None: snapshot gerekir)
+        self._persisted_next_id: Optional[int] = None
+        self._compaction: Optional[threading.Thread] = None
+        # Yazma işlemlerini sıralar; save_index içinden compact çağrıldığı için RLock
+        self._lock = threading.RLock()
 
         self.index: Optional[faiss.Index] = None
-        self.frame_metadata_list: List[FrameMetadata] = []
+        # Index dosyadan memory-mapped açıldıysa salt okunurdur
+        self._index_mapped = False
+        self.vectors: Optional[VectorFile] = None
+        # Satır numarası frame id'si olan metadata; id'ler silmelerden sonra da değişmez
+        self.frames = FrameMetadataStore()
         self.video_metadata_dict: Dict[str, VideoMetadata] = {}
+        # İçerik hash'i -> video_id tablosu (tekrar upload tespiti için)
+        self.content_hash_index: Dict[str, str] = {}
+        # video_id -> videonun frame'lerinin index'teki [başlangıç, bitiş) id
+        # aralıkları. Video parça parça eklenirken başka videolar araya
+        # girebildiği için birden fazla aralık olabilir. Listeler yerinde
+        # değiştirilmez; yayınlanan görünümler aynı listeleri paylaşır
+        self.video_id_ranges: Dict[str, List[Tuple[int, int]]] = {}
+        # Bir sonraki frame'e verilecek id; silinen id'ler tekrar kullanılmaz
+        self.next_id = 0
+        # Ana index'e henüz eklenmemiş (delta'daki) ilk frame id'si
+        self.delta_start = 0
+        # HNSW'de silinen ama graftan çıkarılamayan id aralıkları
+        self.removed_ranges: List[Tuple[int, int]] = []
+        # removed_ranges için arama filtresi (IDSelectorBatch, IDSelectorNot)
+        self._removed_filter: Optional[Tuple[faiss.IDSelector, faiss.IDSelector]] = None
+        # Aramaların kullandığı son yayınlanan görünüm
+        self.view = IndexView(
+            version=0,
+            index=None,
+            frames=self.frames,
+            vectors=None,
+            video_metadata_dict={},
+            video_id_ranges={},
+            next_id=0,
+        )
 
         logger.info("SearchEngine initialized")
 
+    @property
+    def index_type(self) -> Optional[str]:
+        """
+        Kullanılan index tipini döndürür (index yoksa None).
+        """
+        index = self.view.index
+        return index_factory.get_index_type(index) if index is not None else None
+
+    @property
+    def frame_count(self) -> int:
+        """
+        Aranabilir frame sayısını döndürür.
+        """
+        return _range_count(self.video_id_ranges)
+
     def build_index(
         self,
         features: np.ndarray,
@@ -51,95 +175,318 @@ class SearchEngine:
         """
         Feature vektörlerinden FAISS index oluşturur.
 
+        Index tipi corpus boyutuna göre seçilir; corpus büyüyüp başka bir
+        tip gerektirdiğinde index mevcut vektörlerden yeniden kurulur.
+        Frame'ler ardışık yeni id'ler alır ve vektörlerin tam hassasiyetli
+        kopyaları index'in yanındaki dosyada id'lerine karşılık gelen
+        satırlara eklenir. Video zaten index'teyse frame'ler videoya eklenir
+        ve video metadata'sı (ör. indexed_until) güncellenir; böylece uzun
+        videolar parça parça aranabilir hale gelir. Index varsa yeni frame'ler
+        delta'ya eklenir ve ana index kopyalanmaz.
+
         Args:
             features: Feature vektörleri (N, dim)
             frame_metadata_list: Frame metadata listesi
             video_metadata: Video metadata
         """
-        logger.info(f"Building FAISS index with {len(features)} vectors")
+        with self._lock:
+            logger.info(f"Building FAISS index with {len(features)} vectors")
+
+            if len(features) != len(frame_metadata_list):
+                raise ValueError(
+                    f"Features count ({len(features)}) doesn't match "
+                    f"metadata count ({len(frame_metadata_list)})"
+                )
+
+            # L2 normalizasyonu (cosine similarity için)
+            faiss.normalize_L2(features)
+
+            # Videonun frame'leri index'te ardışık id'ler alır
+            start = self.next_id
+            ids = np.arange(start, start + len(features), dtype="int64")
+
+            # FAISS index oluştur (Inner Product = Cosine Similarity normalized vektörler için)
+            if self.index is None:
+                # Yeni index: önceki index'e ait vektörler geçersizdir
+                self.vectors = VectorFile(self.vectors_path, features.shape[1])
+                self.vectors.truncate(0)
+                self.vectors.append(features)
+
+                self.index = index_factory.build_index(features, ids=ids)
+                self._index_mapped = False
+                self.delta_start = start + len(features)
+                logger.info(
+                    f"Created new FAISS index with dimension {features.shape[1]}"
+                )
+            elif self._has_exact_vectors():
+                # Delta aramalarda vektör dosyasından taranır
+                self.vectors.append(features)
+            else:
+                # Vektör dosyası eksikse delta kullanılamaz; doğrudan eklenir
+                self.vectors.append(features)
+                self._ensure_writable()
+                self.index.add_with_ids(features, ids)
+                self.delta_start = start + len(features)
+
+            self.next_id += len(features)
+            self.frames.append(frame_metadata_list)
+            self.video_metadata_dict[video_metadata.video_id] = video_metadata
+            self.video_id_ranges[video_metadata.video_id] = _append_range(
+                self.video_id_ranges.get(video_metadata.video_id, []),
+                start,
+                self.next_id,
+            )
 
-        if len(features) != len(frame_metadata_list):
-            raise ValueError(
-                f"Features count ({len(features)}) doesn't match "
-                f"metadata count ({len(frame_metadata_list)})"
+            if video_metadata.content_hash:
+                self.content_hash_index[video_metadata.content_hash] = (
+                    video_metadata.video_id
+                )
+
+            if self.next_id - self.delta_start >= settings.INDEX_DELTA_MAX_VECTORS:
+                self._merge_delta()
+
+            self._migrate_index()
+
+            logger.info(
+                f"Index built successfully. Total vectors: {self.frame_count} "
+                f"({self.next_id - self.delta_start} in delta)"
             )
 
-        # L2 normalizasyonu (cosine similarity için)
-        faiss.normalize_L2(features)
+            self._publish()
 
-        # FAISS index oluştur (Inner Product = Cosine Similarity normalized vektörler için)
-        embedding_dim = features.shape[1]
+    def save_index(self) -> None:
+        """
+        Son kayıttan sonra eklenen frame'leri diske kaydeder.
+
+        İlk kayıtta index'in tamamı snapshot olarak yazılır. Sonraki
+        kayıtlar sadece yeni frame'lerin vektörlerini ve metadata'sını küçük
+        bir shard olarak ekler; yazma maliyeti kütüphanenin değil yüklemenin
+        boyutuyla orantılıdır. COMPACTION_SHARDS shard biriktiğinde shard'lar
+        arka planda yeni bir snapshot'ta birleştirilir. Silmeler remove_video
+        sırasında kaydedilir.
+        """
+        with self._lock:
+            if self.index is None:
+                logger.warning("No index to save")
+                return
 
-        if self.index is None:
-            self.index = faiss.IndexFlatIP(embedding_dim)
-            logger.info(f"Created new FAISS index with dimension {embedding_dim}")
+            if self.store.snapshot is None or self._persisted_next_id is None:
+                self.compact()
+                return
 
-        self.index.add(features)
+            if self._persisted_next_id < self.next_id:
+                self._write_shard()
 
-        self.frame_metadata_list.extend(frame_metadata_list)
-        self.video_metadata_dict[video_metadata.video_id] = video_metadata
+            if len(self.store.shards) >= settings.COMPACTION_SHARDS:
+                self.compact(background=True)
 
-        logger.info(f"Index built successfully. Total vectors: {self.index.ntotal}")
+    def compact(self, background: bool = False) -> None:
+        """
+        Index'in tamamını yeni bir snapshot olarak yazar ve shard'ları birleştirir.
 
-    def save_index(self) -> None:
+        Yazılacak durum çağıran thread'de kopyalanır. background True ise
+        dosyalar arka plan thread'inde yazılır; bu sırada arama, yükleme ve
+        silme devam edebilir, bunların kayıtları manifest'te korunur.
+
+        Args:
+            background: Snapshot arka planda yazılsın mı
         """
-        Index ve metadata'yı diske kaydeder.
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                logger.info("Compaction already running")
+                return
+
+            logger.info(
+                f"Compacting index: {self.frame_count} frames, "
+                f"{len(self.store.shards)} shards"
+            )
+
+            # Snapshot'taki index delta dahil tüm frame'leri içermelidir
+            if self.delta_start < self.next_id:
+                self._merge_delta()
+                self._publish()
+
+            snapshot = {
+                "index_data": faiss.serialize_index(self.index),
+                "metadata": {
+                    "video_metadata_dict": dict(self.video_metadata_dict),
+                    "content_hash_index": dict(self.content_hash_index),
+                    "video_id_ranges": dict(self.video_id_ranges),
+                    "next_id": self.next_id,
+                    "removed_ranges": list(self.removed_ranges),
+                },
+                "frames": self.frames.copy(),
+                "merged_shards": self.store.shards,
+                "merged_removals": len(self.store.removed),
+            }
+
+            if not background:
+                self._write_snapshot(snapshot, self.frames)
+                return
+
+            self._compaction = threading.Thread(
+                target=self._write_snapshot,
+                args=(snapshot, self.frames),
+                name="index-compaction",
+                daemon=True,
+            )
+            self._compaction.start()
+
+    def wait_for_compaction(self) -> None:
         """
-        if self.index is None:
-            logger.warning("No index to save")
-            return
+        Arka planda süren bir birleştirme varsa bitmesini bekler.
+        """
+        if self._compaction is not None:
+            self._compaction.join()
 
-        logger.info(f"Saving index to {self.index_path}")
+    def _write_snapshot(self, snapshot: Dict, frames: FrameMetadataStore) -> None:
+        """
+        compact'ın kopyaladığı durumu snapshot olarak yazar.
 
-        faiss.write_index(self.index, self.index_path)
+        Yazma başarılı olursa canlı frame deposu snapshot'ın memory-mapped
+        sütunlarıyla değiştirilir; böylece bellekte tutulan satırlar
+        birleştirmeden sonra serbest kalır.
 
-        metadata = {
-            "frame_metadata_list": self.frame_metadata_list,
-            "video_metadata_dict": self.video_metadata_dict,
-        }
+        Args:
+            snapshot: IndexStore.write_snapshot argümanları
+            frames: Kopyanın alındığı canlı frame deposu
+        """
+        try:
+            self.store.write_snapshot(**snapshot)
+        except Exception as e:
+            logger.error(f"Error writing index snapshot: {e}")
+            return
+
+        next_id = snapshot["metadata"]["next_id"]
+        with self._lock:
+            self._persisted_next_id = max(self._persisted_next_id or 0, next_id)
 
-        with open(self.metadata_path, "wb") as f:
-            pickle.dump(metadata, f)
+            # Depo bu sırada yeniden yüklendiyse değiştirilmez
+            if self.frames is frames:
+                self._swap_frames(snapshot["frames"])
 
         logger.info(
-            f"Index and metadata saved successfully. "
-            f"Total frames: {len(self.frame_metadata_list)}, "
-            f"Videos: {len(self.video_metadata_dict)}"
+            f"Index snapshot saved successfully. Total frames up to id {next_id}"
         )
 
-    def load_index(self) -> bool:
+    def _swap_frames(self, mapped: FrameMetadataStore) -> None:
         """
-        Kaydedilmiş index ve metadata'yı yükler.
+        Canlı frame deposunu snapshot'a kaydedilmiş kopyasıyla değiştirir.
 
-        Returns:
-            Yükleme başarılıysa True, değilse False
-        """
-        if not Path(self.index_path).exists() or not Path(self.metadata_path).exists():
-            logger.warning("Index or metadata file not found")
-            return False
+        Snapshot yazılırken eklenen satırlar kopyaya aktarılır. Yayınlanmış
+        görünümler eski depoyu kullanmaya devam eder.
 
-        logger.info("Loading existing index and metadata")
+        Args:
+            mapped: Snapshot'a kaydedilip memory-mapped açılmış depo
+        """
+        mapped.append(
+            [self.frames.get(row) for row in range(len(mapped), len(self.frames))]
+        )
+        self.frames = mapped
+        self._publish()
 
-        try:
-            self.index = faiss.read_index(self.index_path)
+    def _write_shard(self) -> None:
+        """
+        Son kayıttan sonra eklenen frame'leri yeni bir shard'a yazar.
+        """
+        start, end = self._persisted_next_id, self.next_id
+        video_id_ranges = _ranges_from(self.video_id_ranges, start)
 
-            with open(self.metadata_path, "rb") as f:
-                metadata = pickle.load(f)
+        metadata = {
+            "start_id": start,
+            "next_id": end,
+            "frames": [self.frames.get(frame_id) for frame_id in range(start, end)],
+            "video_metadata_dict": {
+                video_id: self.video_metadata_dict[video_id]
+                for video_id in video_id_ranges
+            },
+            "video_id_ranges": video_id_ranges,
+        }
 
-            self.frame_metadata_list = metadata["frame_metadata_list"]
-            self.video_metadata_dict = metadata["video_metadata_dict"]
+        self.store.write_shard(self.vectors.get_range(start, end), metadata)
+        self._persisted_next_id = end
 
-            logger.info(
-                f"Index loaded successfully. "
-                f"Total frames: {len(self.frame_metadata_list)}, "
-                f"Videos: {len(self.video_metadata_dict)}"
-            )
+    def load_index(self) -> bool:
+        """
+        Kaydedilmiş index ve metadata'yı yükler.
 
-            return True
+        Snapshot okunur, sonra shard'lar yazılma sırasıyla index'e eklenir ve
+        snapshot'tan sonra silinen videolar tekrar silinir. INDEX_MMAP açıksa
+        snapshot index'i memory-mapped açılır ve ilk değişikliğe kadar
+        kopyalanmaz. Kayıt deposu yoksa tek dosyalı eski kayıt okunur.
 
-        except Exception as e:
-            logger.error(f"Error loading index: {e}")
-            return False
+        Returns:
+            Yükleme başarılıysa True, değilse False
+        """
+        with self._lock:
+            if self.store.snapshot is not None:
+                index_path, metadata_path, frames_path = IndexStore.snapshot_files(
+                    self.store.snapshot
+                )
+            elif Path(self.index_path).exists() and Path(self.metadata_path).exists():
+                index_path = Path(self.index_path)
+                metadata_path = Path(self.metadata_path)
+                frames_path = metadata_path.with_suffix(".frames")
+            else:
+                logger.warning("Index or metadata file not found")
+                return False
+
+            logger.info(f"Loading existing index and metadata from {index_path}")
+
+            try:
+                self.index = index_factory.read_index(
+                    str(index_path), mmap=settings.INDEX_MMAP
+                )
+                self._index_mapped = settings.INDEX_MMAP
+
+                with open(metadata_path, "rb") as f:
+                    metadata = pickle.load(f)
+
+                self._load_frames(metadata, frames_path)
+
+                self.video_metadata_dict = metadata["video_metadata_dict"]
+                self.content_hash_index = metadata.get("content_hash_index", {})
+                self.video_id_ranges = {
+                    video_id: _as_range_list(id_ranges)
+                    for video_id, id_ranges in metadata.get(
+                        "video_id_ranges", {}
+                    ).items()
+                } or _video_id_ranges(self.frames)
+                self.removed_ranges = metadata.get("removed_ranges", [])
+                self._removed_filter = None
+
+                self.vectors = VectorFile(self.vectors_path, self.index.d)
+
+                if not index_factory.has_ids(self.index):
+                    self._assign_ids()
+
+                for shard in self.store.shards:
+                    self._apply_shard(shard)
+
+                self._persisted_next_id = self.next_id
+                self.delta_start = self.next_id
+                self._sync_vectors()
+
+                for video_id, before_id in self.store.removed:
+                    # Kaydedilmeden silinmiş videolar depoda hiç yoktur
+                    if video_id in self.video_metadata_dict:
+                        self._remove_video(video_id, before_id)
+
+                # Index tipi ayarı değiştiyse index yeni tipe taşınır
+                self._migrate_index()
+                self._publish()
+
+                logger.info(
+                    f"Index loaded successfully. "
+                    f"Total frames: {self.frame_count}, "
+                    f"Videos: {len(self.video_metadata_dict)}"
+                )
+
+                return True
+
+            except Exception as e:
+                logger.error(f"Error loading index: {e}")
+                return False
 
     def search(
         self,
@@ -147,6 +494,8 @@ class SearchEngine:
         k: int = None,
         similarity_threshold: float = None,
         video_id: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
     ) -> List[Dict]:
         """
         Query feature'ına en benzer frame'leri bulur.
@@ -156,63 +505,612 @@ class SearchEngine:
             k: Döndürülecek maksimum sonuç sayısı
             similarity_threshold: Minimum benzerlik eşiği
             video_id: Belirli bir video ID (opsiyonel, belirtilmezse tüm videolarda arar)
+            nprobe: IVF index'lerinde taranacak liste sayısı (opsiyonel)
+            ef_search: HNSW index'inde arama kuyruğu boyutu (opsiyonel)
 
         Returns:
             Sonuç listesi (her biri frame_metadata, video_metadata ve score içerir)
         """
-        if self.index is None:
+        results = self._search_queries(
+            self.view,
+            query_features.reshape(1, -1),
+            k,
+            similarity_threshold,
+            video_id,
+            nprobe,
+            ef_search,
+        )[0]
+
+        if video_id:
+            logger.info(
+                f"Search completed for video {video_id}: {len(results)} results found"
+            )
+        else:
+            logger.info(
+                f"Search completed across all videos: {len(results)} results found"
+            )
+
+        return results
+
+    def search_batch(
+        self,
+        query_features: np.ndarray,
+        k: int = None,
+        similarity_threshold: float = None,
+        video_id: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[List[Dict]]:
+        """
+        Birden fazla query feature'ı için en benzer frame'leri bulur.
+
+        Tüm sorgular aynı görünümde tek bir çok satırlı FAISS aramasıyla
+        aranır; sonuçlar search ile aynı biçimdedir.
+
+        Args:
+            query_features: Query feature vektörleri (N, dim)
+            k: Sorgu başına döndürülecek maksimum sonuç sayısı
+            similarity_threshold: Minimum benzerlik eşiği
+            video_id: Belirli bir video ID (opsiyonel, belirtilmezse tüm videolarda arar)
+            nprobe: IVF index'lerinde taranacak liste sayısı (opsiyonel)
+            ef_search: HNSW index'inde arama kuyruğu boyutu (opsiyonel)
+
+        Returns:
+            Her sorgu için search ile aynı biçimde sonuç listesi
+        """
+        results = self._search_queries(
+            self.view,
+            query_features,
+            k,
+            similarity_threshold,
+            video_id,
+            nprobe,
+            ef_search,
+        )
+
+        logger.info(
+            f"Batch search of {len(results)} queries completed: "
+            f"{sum(len(query_results) for query_results in results)} results found"
+        )
+
+        return results
+
+    def _search_queries(
+        self,
+        view: IndexView,
+        query_features: np.ndarray,
+        k: Optional[int],
+        similarity_threshold: Optional[float],
+        video_id: Optional[str],
+        nprobe: Optional[int],
+        ef_search: Optional[int],
+    ) -> List[List[Dict]]:
+        """
+        Sorguları tek bir görünümde arar ve sonuçlarını oluşturur.
+
+        Args:
+            view: Aramanın kullandığı görünüm; arama boyunca değişmez
+            query_features: Query feature vektörleri (N, dim)
+            k: Sorgu başına döndürülecek maksimum sonuç sayısı
+            similarity_threshold: Minimum benzerlik eşiği
+            video_id: Belirli bir video ID (None ise tüm videolarda arar)
+            nprobe: IVF index'lerinde taranacak liste sayısı
+            ef_search: HNSW index'inde arama kuyruğu boyutu
+
+        Returns:
+            Her sorgu için sonuç listesi
+        """
+        if view.index is None:
             raise RuntimeError("Index is not loaded or built")
 
         k = k or settings.DEFAULT_TOP_K
         similarity_threshold = similarity_threshold or settings.MIN_SIMILARITY_THRESHOLD
 
-        # Query feature'ı normalize et
-        query_features = query_features.reshape(1, -1).astype("float32")
+        # Query feature'larını normalize et
+        query_features = np.array(query_features, dtype="float32", ndmin=2)
         faiss.normalize_L2(query_features)
+        rows = len(query_features)
 
-        # Eğer video_id belirtilmişse, filtreleme sonrası k'dan az sonuç kalabilir
-        search_k = k * 10 if video_id else k
+        if video_id:
+            scores, indices = self._search_video(view, query_features, video_id, k)
+        elif view.frame_count:
+            k = min(k, view.frame_count)
+            scores, indices = self._search_index(
+                view, query_features, k, nprobe, ef_search
+            )
 
-        scores, indices = self.index.search(
-            query_features, min(search_k, self.index.ntotal)
-        )
+            if len(view.delta_ids):
+                scores, indices = _merge_results(
+                    (scores, indices), self._search_delta(view, query_features, k), k
+                )
+        else:
+            scores, indices = _empty_result(rows)
 
         results = []
-        for idx, (index, score) in enumerate(zip(indices[0], scores[0])):
-            if index == -1 or score < similarity_threshold:
-                continue
+        for row_indices, row_scores in zip(indices, scores):
+            query_results = []
+
+            for index, score in zip(row_indices, row_scores):
+                if index == -1 or score < similarity_threshold:
+                    continue
+
+                frame_metadata = view.frame_metadata(int(index))
+                if frame_metadata is None:
+                    continue
+
+                video_metadata = view.video_metadata_dict[frame_metadata.video_id]
+
+                query_results.append(
+                    {
+                        "rank": len(query_results) + 1,
+                        "score": float(score),
+                        "frame_metadata": frame_metadata,
+                        "video_metadata": video_metadata,
+                    }
+                )
 
-            frame_metadata = self.frame_metadata_list[index]
+            results.append(query_results)
 
-            # Eğer video_id belirtilmişse, sadece o video'nun frame'lerini al
-            if video_id and frame_metadata.video_id != video_id:
-                continue
+        return results
+
+    def _search_index(
+        self,
+        view: IndexView,
+        query_features: np.ndarray,
+        k: int,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        selector: Optional[faiss.IDSelector] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        FAISS index'inde arama yapar.
+
+        Sıkıştırılmış index'lerde daha fazla aday alınıp tam vektörlerle
+        yeniden sıralanır. HNSW'de silinmiş id'ler filtreyle dışlanır.
+
+        Args:
+            view: Aramanın kullandığı görünüm
+            query_features: Normalize edilmiş (N, dim) sorgu vektörleri
+            k: Döndürülecek sonuç sayısı
+            nprobe: IVF index'lerinde taranacak liste sayısı
+            ef_search: HNSW index'inde arama kuyruğu boyutu
+            selector: Sadece seçilen id'leri döndüren FAISS filtresi
+
+        Returns:
+            index.search ile aynı biçimde (skorlar, id'ler)
+        """
+        if view.index.ntotal == 0:
+            return _empty_result(len(query_features))
 
-            video_metadata = self.video_metadata_dict[frame_metadata.video_id]
+        if selector is None and view.removed_filter is not None:
+            selector = view.removed_filter[1]
 
-            results.append(
-                {
-                    "rank": len(results) + 1,  # Filtrelemeden sonra yeniden rank
-                    "score": float(score),
-                    "frame_metadata": frame_metadata,
-                    "video_metadata": video_metadata,
-                }
+        rerank = (
+            settings.EXACT_RERANK
+            and index_factory.is_lossy(view.index)
+            and view.has_exact_vectors()
+        )
+        candidates_k = (
+            min(k * settings.RERANK_CANDIDATES, view.index.ntotal) if rerank else k
+        )
+
+        params = index_factory.search_parameters(
+            view.index,
+            candidates_k,
+            nprobe=nprobe,
+            ef_search=ef_search,
+            selector=selector,
+        )
+
+        scores, indices = view.index.search(query_features, candidates_k, params=params)
+
+        if rerank:
+            scores, indices = self._rerank(view, query_features, indices, k)
+
+        return scores, indices
+
+    def _search_delta(
+        self, view: IndexView, query_features: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ana index'e henüz eklenmemiş frame'leri tam vektörleriyle tarar.
+
+        Delta en fazla INDEX_DELTA_MAX_VECTORS frame içerdiği için maliyeti
+        corpus boyutundan bağımsızdır.
+
+        Args:
+            view: Aramanın kullandığı görünüm
+            query_features: Normalize edilmiş (N, dim) sorgu vektörleri
+            k: Döndürülecek sonuç sayısı
+
+        Returns:
+            index.search ile aynı biçimde (skorlar, id'ler)
+        """
+        scores, indices = faiss.knn(
+            query_features,
+            view.vectors.get(view.delta_ids),
+            min(k, len(view.delta_ids)),
+            metric=faiss.METRIC_INNER_PRODUCT,
+        )
+
+        return scores, view.delta_ids[indices]
+
+    def _search_video(
+        self,
+        view: IndexView,
+        query_features: np.ndarray,
+        video_id: str,
+        k: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sadece bir videonun frame'leri içinde arama yapar.
+
+        Videonun vektörleri id aralıklarından toplanıp doğrudan taranır;
+        maliyet videonun boyutuyla orantılıdır. FAISS id filtreleri bu
+        garantiyi vermez: IndexIDMap2 sarmalı index'te filtre her kayıtlı id
+        için ayrı ayrı kontrol edilir, IVF ve HNSW'de ise budanan
+        listeler/graf video içindeki komşuları kaçırabilir.
+
+        Args:
+            view: Aramanın kullandığı görünüm
+            query_features: Normalize edilmiş (N, dim) sorgu vektörleri
+            video_id: Aranacak video
+            k: Döndürülecek sonuç sayısı
+
+        Returns:
+            index.search ile aynı biçimde (skorlar, id'ler)
+        """
+        ranges = view.video_id_ranges.get(video_id, [])
+        k = min(k, _range_count({video_id: ranges}))
+
+        if k <= 0:
+            return _empty_result(len(query_features))
+
+        ids = _range_ids(ranges)
+        vectors = (
+            view.vectors.get(ids)
+            if view.has_exact_vectors()
+            else index_factory.reconstruct_ids(view.index, ids)
+        )
+        scores, indices = faiss.knn(
+            query_features, vectors, k, metric=faiss.METRIC_INNER_PRODUCT
+        )
+
+        return scores, ids[indices]
+
+    def _rerank(
+        self, view: IndexView, query_features: np.ndarray, indices: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aday sonuçları tam hassasiyetli vektörlerle yeniden skorlar.
+
+        Args:
+            view: Aramanın kullandığı görünüm
+            query_features: Normalize edilmiş (N, dim) sorgu vektörleri
+            indices: Index aramasından gelen (N, aday_sayısı) aday id'leri
+            k: Döndürülecek sonuç sayısı
+
+        Returns:
+            index.search ile aynı biçimde (skorlar, id'ler); aday sayısı k'dan
+            az olan satırlar -1 id'leriyle doldurulur
+        """
+        valid = indices >= 0
+        candidates = view.vectors.get(np.where(valid, indices, 0).ravel()).reshape(
+            *indices.shape, -1
+        )
+        exact_scores = np.einsum("ncd,nd->nc", candidates, query_features)
+        exact_scores[~valid] = -np.inf
+
+        order = np.argsort(-exact_scores, axis=1, kind="stable")[:, :k]
+        scores = np.take_along_axis(exact_scores, order, axis=1)
+        ids = np.take_along_axis(np.where(valid, indices, -1), order, axis=1)
+        return scores, ids
+
+    def _merge_delta(self) -> None:
+        """
+        Delta'daki silinmemiş frame'leri ana index'e ekler.
+
+        Ana index'in kopyalandığı tek ekleme yoludur.
+        """
+        ids = self._delta_ids()
+
+        if len(ids):
+            logger.info(f"Merging {len(ids)} delta vectors into the index")
+
+            self._ensure_writable()
+            self.index.add_with_ids(self.vectors.get(ids), ids)
+
+        self.delta_start = self.next_id
+
+    def _delta_ids(self) -> np.ndarray:
+        """
+        Delta'daki silinmemiş frame id'lerini artan sırada döndürür.
+        """
+        return _range_ids(
+            sorted(
+                id_range
+                for ranges in _ranges_from(
+                    self.video_id_ranges, self.delta_start
+                ).values()
+                for id_range in ranges
             )
+        )
 
-            # İstenen sonuç sayısına ulaşıldıysa dur
-            if len(results) >= k:
-                break
+    def _ensure_writable(self) -> None:
+        """
+        Yayınlanmış veya memory-mapped index'i değiştirmeden önce kopyalar.
+
+        Yayınlanan görünümdeki index'i aramalar kilitsiz kullandığı için
+        değişiklikler bir kopya üzerinde yapılır ve kopya _publish ile
+        yayınlanır. Map'lenmiş index'e vektör eklemek veya silmek FAISS'te
+        process'i sonlandırdığı için bu index belleğe okunarak kopyalanır.
+        Kopya yayınlanana kadar sadece bir kez alınır. Kopyanın maliyeti
+        corpus boyutunda olduğundan eklemeler bunu sadece delta
+        birleştirilirken öder; silme ve tip değişikliği her seferinde öder.
+        """
+        if self._index_mapped:
+            logger.info("Copying memory-mapped index into memory before modifying it")
 
-        if video_id:
-            logger.info(
-                f"Search completed for video {video_id}: {len(results)} results found"
+            self.index = index_factory.writable_copy(self.index)
+            self._index_mapped = False
+
+        elif self.index is self.view.index:
+            self.index = faiss.clone_index(self.index)
+
+    def _publish(self) -> None:
+        """
+        Yazma işleminin sonucunu yeni bir görünüm olarak aramalara açar.
+
+        Görünüm atanması tek bir referans değişikliğidir; aramalar ya önceki
+        ya da yeni görünümün tamamını görür.
+        """
+        self.view = IndexView(
+            version=self.view.version + 1,
+            index=self.index,
+            frames=self.frames,
+            vectors=self.vectors,
+            video_metadata_dict=dict(self.video_metadata_dict),
+            video_id_ranges=dict(self.video_id_ranges),
+            next_id=self.next_id,
+            removed_filter=self._removed_selector(),
+            delta_ids=self._delta_ids(),
+        )
+
+    def _load_frames(self, metadata: Dict, frames_path: Path) -> None:
+        """
+        Frame metadata deposunu açar ve next_id'yi ayarlar.
+
+        Eski kayıtlarda frame'ler pickle içinde tutulur; bunlar depoya
+        aktarılır ve bir sonraki save_index'te sütun dosyalarına yazılır.
+
+        Args:
+            metadata: Metadata dosyasından okunan sözlük
+            frames_path: Frame metadata deposunun dizini
+
+        Raises:
+            ValueError: Depoda index'teki id'ler kadar satır yoksa
+        """
+        self.frames = FrameMetadataStore()
+
+        if "frame_metadata_list" in metadata:
+            # Frame'ler index'e eklenme sırasıyla listede tutulur
+            self.frames.append(metadata["frame_metadata_list"])
+            self.next_id = self.index.ntotal
+            return
+
+        self.next_id = metadata["next_id"]
+
+        if "frame_metadata_by_id" in metadata:
+            frames = metadata["frame_metadata_by_id"]
+            self.frames.append([frames.get(i) for i in range(self.next_id)])
+            return
+
+        self.frames = FrameMetadataStore.load(frames_path)
+
+        if len(self.frames) < self.next_id:
+            raise ValueError(
+                f"Frame metadata in {frames_path} has {len(self.frames)} rows, "
+                f"expected {self.next_id}"
             )
-        else:
-            logger.info(
-                f"Search completed across all videos: {len(results)} results found"
+
+        # Kaydedilmemiş satırlar atılır
+        self.frames.truncate(self.next_id)
+
+    def _has_exact_vectors(self) -> bool:
+        """
+        Index'teki her vektörün tam hassasiyetli kopyası var mı.
+        """
+        return self.vectors is not None and len(self.vectors) >= self.next_id
+
+    def _live_ids(self) -> np.ndarray:
+        """
+        Silinmemiş tüm frame id'lerini artan sırada döndürür.
+        """
+        return _range_ids(
+            sorted(
+                id_range
+                for ranges in self.video_id_ranges.values()
+                for id_range in ranges
             )
+        )
 
-        return results
+    def _removed_selector(
+        self,
+    ) -> Optional[Tuple[faiss.IDSelector, faiss.IDSelector]]:
+        """
+        HNSW'de silinmiş id'leri dışlayan arama filtresini döndürür.
+
+        Filtre silmeler değişene kadar önbellekte tutulur; FAISS filtreleri
+        Python referansı tutulmadığında serbest bırakıldığı için iki nesne
+        birlikte saklanır ve (IDSelectorBatch, IDSelectorNot) olarak döner.
+        """
+        if not self.removed_ranges:
+            return None
+
+        if self._removed_filter is None:
+            removed = np.concatenate(
+                [
+                    np.arange(start, end, dtype="int64")
+                    for start, end in self.removed_ranges
+                ]
+            )
+            batch = faiss.IDSelectorBatch(removed)
+            self._removed_filter = (batch, faiss.IDSelectorNot(batch))
+
+        return self._removed_filter
+
+    def _assign_ids(self) -> None:
+        """
+        Id'siz kaydedilmiş eski index'i kalıcı id'li index'e çevirir.
+
+        Eski index'lerde id'ler ekleme sırasıdır. IVF index'leri id'leri
+        zaten sakladığı için sadece id tablosu açılır, diğer tipler aynı
+        vektörlerle yeniden kurulur.
+        """
+        index_type = index_factory.get_index_type(self.index)
+
+        logger.info(f"Assigning stable ids to {index_type} index")
+
+        if index_type in index_factory.IVF_INDEX_TYPES:
+            self._ensure_writable()
+            self.index = index_factory.with_ids(self.index)
+            return
+
+        vectors = (
+            self.vectors.get_range(0, self.index.ntotal)
+            if len(self.vectors) >= self.index.ntotal
+            else self.index.reconstruct_n(0, self.index.ntotal)
+        )
+        self.index = index_factory.build_index(vectors, index_type)
+        self._index_mapped = False
+
+    def _sync_vectors(self) -> None:
+        """
+        Vektör dosyasını yüklenen index ile hizalar.
+
+        Kaydedilmemiş eklemeler dosyadan atılır. Dosya eksikse ve index
+        vektörleri kayıpsız saklıyorsa dosya index'ten yeniden oluşturulur;
+        silinmiş id'lerin satırları sıfır kalır.
+        """
+        stored = len(self.vectors)
+
+        if stored > self.next_id:
+            self.vectors.truncate(self.next_id)
+
+        elif stored < self.next_id:
+            if index_factory.is_lossy(self.index):
+                logger.warning(
+                    f"Exact vectors file {self.vectors_path} is incomplete "
+                    f"({stored}/{self.next_id}); exact re-ranking is disabled"
+                )
+                return
+
+            ids = self._live_ids()
+            vectors = np.zeros((self.next_id, self.index.d), dtype="float32")
+            vectors[ids] = index_factory.reconstruct_ids(self.index, ids)
+
+            self.vectors.truncate(0)
+            self.vectors.append(vectors)
+
+    def _apply_shard(self, shard: Path) -> None:
+        """
+        Bir shard'ın frame'lerini yüklenen index'e ve metadata'ya ekler.
+
+        Snapshot'ın zaten içerdiği id'ler (shard yazılırken arka planda
+        birleştirme sürdüyse) atlanır.
+
+        Args:
+            shard: Shard dizini
+
+        Raises:
+            ValueError: Shard önceki kayıtlarla ardışık değilse
+        """
+        vectors, metadata = IndexStore.read_shard(shard)
+        start = metadata["start_id"]
+
+        if metadata["next_id"] <= self.next_id:
+            return
+
+        if start > self.next_id:
+            raise ValueError(
+                f"Shard {shard} starts at id {start}, expected {self.next_id} or less"
+            )
+
+        video_id_ranges = _ranges_from(
+            {
+                video_id: _as_range_list(id_ranges)
+                for video_id, id_ranges in metadata["video_id_ranges"].items()
+            },
+            self.next_id,
+        )
+        ids = _range_ids(
+            [id_range for ranges in video_id_ranges.values() for id_range in ranges]
+        )
+
+        if len(ids):
+            self._ensure_writable()
+            self.index.add_with_ids(vectors[ids - start], ids)
+
+        # Vektör dosyası shard'dan önce kesildiyse tam vektörler shard'dan tamamlanır
+        if len(self.vectors) == self.next_id:
+            self.vectors.append(vectors[self.next_id - start :])
+
+        self.frames.append(metadata["frames"][self.next_id - start :])
+        self.next_id = metadata["next_id"]
+
+        for video_id, ranges in video_id_ranges.items():
+            for start, end in ranges:
+                self.video_id_ranges[video_id] = _append_range(
+                    self.video_id_ranges.get(video_id, []), start, end
+                )
+
+            video_metadata = metadata["video_metadata_dict"][video_id]
+            self.video_metadata_dict[video_id] = video_metadata
+
+            if video_metadata.content_hash:
+                self.content_hash_index[video_metadata.content_hash] = video_id
+
+    def _migrate_index(self) -> None:
+        """
+        Index'i corpus boyutunun gerektirdiği tipe taşır.
+        """
+        current_type = index_factory.get_index_type(self.index)
+        target_type = index_factory.choose_index_type(
+            self.frame_count, current_type=current_type
+        )
+
+        if target_type == current_type:
+            return
+
+        logger.info(
+            f"Migrating index from {current_type} to {target_type} "
+            f"({self.frame_count} vectors)"
+        )
+
+        self._rebuild_index(target_type)
+
+    def _rebuild_index(self, index_type: str) -> None:
+        """
+        Silinmemiş vektörlerden verilen tipte yeni bir index kurar.
+
+        Vektörler tam hassasiyetli vektör dosyasından (yoksa mevcut
+        index'ten) okunur; model tekrar çalıştırılmaz ve id'ler korunur.
+
+        Args:
+            index_type: INDEX_TYPES içinden bir tip
+        """
+        ids = self._live_ids()
+        vectors = (
+            self.vectors.get(ids)
+            if self._has_exact_vectors()
+            else index_factory.reconstruct_ids(self.index, ids)
+        )
+
+        self.index = index_factory.build_index(vectors, index_type, ids=ids)
+        self._index_mapped = False
+        self.delta_start = self.next_id
+        self.removed_ranges = []
+        self._removed_filter = None
 
     def get_video_metadata(self, video_id: str) -> Optional[VideoMetadata]:
         """
@@ -224,7 +1122,20 @@ class SearchEngine:
         Returns:
             VideoMetadata veya None
         """
-        return self.video_metadata_dict.get(video_id)
+        return self.view.video_metadata_dict.get(video_id)
+
+    def find_video_by_hash(self, content_hash: str) -> Optional[VideoMetadata]:
+        """
+        İçerik hash'ine göre daha önce index'lenmiş videoyu bulur.
+
+        Args:
+            content_hash: Video dosyasının içerik hash'i
+
+        Returns:
+            VideoMetadata veya None
+        """
+        video_id = self.content_hash_index.get(content_hash)
+        return self.video_metadata_dict.get(video_id) if video_id else None
 
     def get_all_videos(self) -> List[VideoMetadata]:
         """
@@ -233,23 +1144,38 @@ class SearchEngine:
         Returns:
             VideoMetadata listesi
         """
-        return list(self.video_metadata_dict.values())
+        return list(self.view.video_metadata_dict.values())
 
     def clear_index(self) -> None:
         """
         Index ve metadata'yı temizler.
         """
-        self.index = None
-        self.frame_metadata_list = []
-        self.video_metadata_dict = {}
-
-        logger.info("Index and metadata cleared")
+        with self._lock:
+            self.index = None
+            self._index_mapped = False
+            self.frames = FrameMetadataStore()
+            self.video_metadata_dict = {}
+            self.content_hash_index = {}
+            self.video_id_ranges = {}
+            self.next_id = 0
+            self.delta_start = 0
+            self.removed_ranges = []
+            self._removed_filter = None
+            self._persisted_next_id = None
+
+            logger.info("Index and metadata cleared")
+
+            self._publish()
 
     def remove_video(self, video_id: str) -> bool:
         """
         Belirli bir video'nun verilerini index'ten kaldırır.
 
-        Not: Bu işlem index'i yeniden oluşturmayı gerektirir.
+        Videonun vektörleri id aralıklarıyla index'ten silinir; index yeniden
+        kurulmaz ve diğer frame'lerin id'leri değişmez. Silme kayıt deposunun
+        manifest'ine o ana kadar kaydedilmiş id sınırıyla birlikte hemen
+        yazılır ve yüklemede tekrar uygulanır; aynı video_id ile sonradan
+        eklenen frame'ler silinmez.
 
         Args:
             video_id: Kaldırılacak video ID'si
@@ -257,31 +1183,197 @@ class SearchEngine:
         Returns:
             İşlem başarılıysa True
         """
-        if video_id not in self.video_metadata_dict:
-            logger.warning(f"Video {video_id} not found in index")
-            return False
+        with self._lock:
+            if video_id not in self.video_metadata_dict:
+                logger.warning(f"Video {video_id} not found in index")
+                return False
+
+            logger.info(f"Removing video {video_id} from index")
+
+            removed_count = self._remove_video(video_id)
+            self._publish()
+
+            # Kaydedilmemiş frame'ler shard'lara hiç yazılmayacağı için
+            # silmenin sadece kaydedilmiş id'leri kapsaması yeterlidir
+            before_id = (
+                self.next_id
+                if self._persisted_next_id is None
+                else self._persisted_next_id
+            )
+            self.store.add_removal(video_id, before_id)
+
+        logger.info(f"Removed {removed_count} frames from video {video_id}")
+
+        return True
+
+    def _remove_video(self, video_id: str, before_id: Optional[int] = None) -> int:
+        """
+        Videonun vektörlerini ve metadata'sını bellekteki index'ten siler.
+
+        Args:
+            video_id: Index'te bulunan video ID'si
+            before_id: Verilirse sadece bu id'den önce başlayan aralıklar
+                       silinir; video sonraki aralıklarıyla index'te kalır
+
+        Returns:
+            Silinen frame sayısı
+        """
+        ranges = self.video_id_ranges.pop(video_id, [])
+        removed = [r for r in ranges if before_id is None or r[0] < before_id]
+        remaining = [r for r in ranges if r not in removed]
+
+        if remaining:
+            self.video_id_ranges[video_id] = remaining
+        else:
+            video_metadata = self.video_metadata_dict.pop(video_id)
+            self.content_hash_index.pop(video_metadata.content_hash, None)
+
+        if self.index is not None:
+            for start, end in removed:
+                # Delta'daki frame'ler ana index'te yoktur; aralıklardan
+                # çıkarılmaları aramalardan dışlanmaları için yeterlidir
+                if start < self.delta_start:
+                    self._remove_ids(start, min(end, self.delta_start))
+
+        return _range_count({video_id: removed})
+
+    def _remove_ids(self, start: int, end: int) -> None:
+        """
+        [start, end) aralığındaki id'leri index'ten siler.
+
+        HNSW silmeyi desteklemediği için id'ler aramada filtrelenir; silinmiş
+        vektörlerin oranı HNSW_REBUILD_RATIO'yu aşınca graf kalan
+        vektörlerden yeniden kurulur.
+
+        Args:
+            start: İlk id
+            end: Son id'nin bir fazlası
+        """
+        if index_factory.supports_removal(self.index):
+            self._ensure_writable()
+            index_factory.remove_range(self.index, start, end)
+            return
+
+        self.removed_ranges.append((start, end))
+        self._removed_filter = None
+
+        removed = sum(end - start for start, end in self.removed_ranges)
+
+        if removed > settings.HNSW_REBUILD_RATIO * self.index.ntotal:
+            logger.info(
+                f"Rebuilding HNSW index without {removed} removed vectors "
+                f"({self.frame_count} remaining)"
+            )
+            self._rebuild_index(
+                index_factory.choose_index_type(
+                    self.frame_count,
+                    current_type=index_factory.get_index_type(self.index),
+                )
+            )
+
+
+def _empty_result(rows: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sonuçsuz bir aramanın (skorlar, id'ler) çiftini döndürür.
+    """
+    return np.empty((rows, 0), dtype="float32"), np.empty((rows, 0), dtype="int64")
 
-        logger.info(f"Removing video {video_id} from index")
 
-        # Bu video'ya ait olmayan frame'leri filtrele
-        new_frame_metadata_list = [
-            fm for fm in self.frame_metadata_list if fm.video_id != video_id
+def _merge_results(
+    first: Tuple[np.ndarray, np.ndarray], second: Tuple[np.ndarray, np.ndarray], k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    İki aramanın (skorlar, id'ler) sonuçlarını satır bazında birleştirip ilk k'yı döndürür.
+    """
+    scores = np.concatenate([first[0], second[0]], axis=1)
+    indices = np.concatenate([first[1], second[1]], axis=1)
+
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return (
+        np.take_along_axis(scores, order, axis=1),
+        np.take_along_axis(indices, order, axis=1),
+    )
+
+
+def _video_id_ranges(frames: FrameMetadataStore) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Frame satırlarından her videonun [başlangıç, bitiş) id aralıklarını çıkarır.
+
+    Aralık bilgisi olmadan kaydedilmiş metadata'lar için kullanılır.
+    """
+    video_index = frames.column("video_index")
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+
+    for index in np.unique(video_index[video_index >= 0]):
+        rows = np.flatnonzero(video_index == index)
+        # Ardışık olmayan satırlar ayrı aralıklara bölünür
+        breaks = np.flatnonzero(np.diff(rows) > 1) + 1
+        ranges[frames.video_ids[index]] = [
+            (int(run[0]), int(run[-1]) + 1) for run in np.split(rows, breaks)
         ]
 
-        removed_count = len(self.frame_metadata_list) - len(new_frame_metadata_list)
+    return ranges
 
-        # Video metadata'sını kaldır
-        del self.video_metadata_dict[video_id]
 
-        # Yeni metadata listesini kaydet
-        self.frame_metadata_list = new_frame_metadata_list
+def _as_range_list(id_ranges) -> List[Tuple[int, int]]:
+    """
+    Kayıtlı id aralığını aralık listesine dönüştürür.
 
-        # Index'i yeniden oluşturulması gerekecek
-        self.index = None
+    Eski kayıtlarda her videonun tek bir (başlangıç, bitiş) aralığı vardır.
+    """
+    if len(id_ranges) == 2 and isinstance(id_ranges[0], (int, np.integer)):
+        return [(int(id_ranges[0]), int(id_ranges[1]))]
 
-        logger.info(
-            f"Removed {removed_count} frames from video {video_id}. "
-            "Index needs to be rebuilt."
-        )
+    return [(int(start), int(end)) for start, end in id_ranges]
 
-        return True
+
+def _append_range(
+    ranges: List[Tuple[int, int]], start: int, end: int
+) -> List[Tuple[int, int]]:
+    """
+    [start, end) aralığını ekleyen yeni bir liste döndürür.
+
+    Önceki aralığın hemen devamıysa aralıklar birleştirilir. Verilen liste
+    yayınlanmış görünümlerde paylaşıldığı için değiştirilmez.
+    """
+    if ranges and ranges[-1][1] == start:
+        return ranges[:-1] + [(ranges[-1][0], end)]
+
+    return ranges + [(start, end)]
+
+
+def _ranges_from(
+    video_id_ranges: Dict[str, List[Tuple[int, int]]], start: int
+) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Aralıkların start id'sinden itibaren olan kısımlarını döndürür.
+
+    Hiç aralığı kalmayan videolar sonuca girmez.
+    """
+    clipped: Dict[str, List[Tuple[int, int]]] = {}
+
+    for video_id, ranges in video_id_ranges.items():
+        ranges = [(max(s, start), e) for s, e in ranges if e > start]
+        if ranges:
+            clipped[video_id] = ranges
+
+    return clipped
+
+
+def _range_count(video_id_ranges: Dict[str, List[Tuple[int, int]]]) -> int:
+    """
+    Aralıklardaki toplam id sayısını döndürür.
+    """
+    return sum(
+        end - start for ranges in video_id_ranges.values() for start, end in ranges
+    )
+
+
+def _range_ids(ranges: List[Tuple[int, int]]) -> np.ndarray:
+    """
+    Aralıklardaki id'leri sırayla içeren int64 dizi döndürür.
+    """
+    return np.concatenate(
+        [np.arange(start, end, dtype="int64") for start, end in ranges]
+        or [np.empty(0, dtype="int64")]
+    )
@@ -88,10 +88,16 @@ class SegmentMerger:
                 timestamp = frame["frame_metadata"].timestamp
                 half_duration = segment_duration / 2.0
 
+                # Tekrar eden frame'ler atlandıysa frame daha uzun bir aralığı temsil eder
+                end_time = timestamp + half_duration
+                span_end = frame["frame_metadata"].end_time
+                if span_end is not None:
+                    end_time = max(end_time, span_end)
+
                 segment = {
                     "video_id": video_id,
                     "start_time": max(0, timestamp - half_duration),
-                    "end_time": timestamp + half_duration,
+                    "end_time": end_time,
                     "score": frame["score"],
                     "frame": frame,
                 }
@@ -0,0 +1,178 @@
+"""
+Bu modül eşzamanlı metin encode isteklerini mikro batch'lerde birleştirir.
+Yük altında tek elemanlı çok sayıda forward pass yerine text tower'ı az sayıda
+batch ile çalıştırır.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TextBatcher:
+    """
+    Metin encode isteklerini birleştiren sınıf.
+
+    İlk istek geldikten sonra en fazla max_wait_ms boyunca (veya batch
+    max_batch_size'a ulaşana kadar) gelen diğer istekler beklenir, hepsi tek
+    bir encode çağrısıyla işlenir ve her çağırana kendi vektörü döndürülür.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ):
+        """
+        TextBatcher instance'ı oluşturur.
+
+        Args:
+            encode_fn: Metin listesini (N, embedding_dim) feature'lara dönüştüren fonksiyon
+            max_batch_size: Tek batch'teki maksimum metin sayısı (varsayılan: settings'den alınır)
+            max_wait_ms: İlk istekten sonra diğer istekler için bekleme süresi
+                         (varsayılan: settings'den alınır)
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size or settings.TEXT_BATCH_MAX_SIZE
+        self.max_wait_ms = (
+            settings.TEXT_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms
+        )
+
+        self._requests: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, text: str) -> Future:
+        """
+        Metni bir sonraki batch'e ekler.
+
+        Args:
+            text: Encode edilecek metin
+
+        Returns:
+            Metnin feature vektörünü (embedding_dim,) döndürecek Future
+        """
+        future: Future = Future()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("TextBatcher is closed")
+
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="text-batcher", daemon=True
+                )
+                self._worker.start()
+
+            self._requests.put((text, future))
+
+        return future
+
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Metni diğer isteklerle birlikte encode eder ve sonucu bekler.
+
+        Args:
+            text: Encode edilecek metin
+
+        Returns:
+            Feature vektörü (embedding_dim,)
+        """
+        return self.submit(text).result()
+
+    def close(self) -> None:
+        """
+        Worker thread'ini durdurur; kuyruktaki istekler önce işlenir.
+        """
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            worker = self._worker
+
+        if worker is not None:
+            self._requests.put(None)
+            worker.join()
+
+    def _run(self) -> None:
+        """
+        Worker thread gövdesi: istekleri toplayıp batch'ler halinde encode eder.
+        """
+        while True:
+            batch = self._collect_batch()
+
+            if batch is None:
+                return
+
+            self._encode_batch(batch)
+
+    def _collect_batch(self) -> Optional[List[Tuple[str, Future]]]:
+        """
+        İlk isteği bekler, ardından bekleme penceresi içinde gelenleri toplar.
+
+        Returns:
+            (metin, future) listesi veya close() çağrıldıysa None
+        """
+        first = self._requests.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+
+            try:
+                if remaining > 0:
+                    item = self._requests.get(timeout=remaining)
+                else:
+                    item = self._requests.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is None:
+                # close() sinyali bir sonraki turda işlenmek üzere geri konur
+                self._requests.put(None)
+                break
+
+            batch.append(item)
+
+        return batch
+
+    def _encode_batch(self, batch: List[Tuple[str, Future]]) -> None:
+        """
+        Batch'i tek encode çağrısıyla işler ve sonuçları dağıtır.
+
+        Aynı batch'teki tekrar eden metinler bir kez encode edilir.
+
+        Args:
+            batch: (metin, future) listesi
+        """
+        texts = list(dict.fromkeys(text for text, _ in batch))
+
+        try:
+            features = self.encode_fn(texts)
+        except Exception as e:
+            logger.error(f"Text batch encoding failed: {e}", exc_info=True)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        positions = {text: i for i, text in enumerate(texts)}
+        for text, future in batch:
+            future.set_result(features[positions[text]])
+
+        logger.debug(f"Encoded text batch of {len(texts)} unique queries")
@@ -0,0 +1,116 @@
+"""
+Bu modül index'teki vektörlerin tam hassasiyetli kopyalarını diskte saklar.
+Sıkıştırılmış index'lerde aday sonuçlar bu dosyadaki vektörlerle yeniden
+skorlanır; dosya memory-mapped okunduğu için RAM'e tamamen yüklenmez.
+"""
+
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class VectorFile:
+    """
+    float32 vektörleri index sırasıyla tutan append-only dosya.
+
+    Dosyada başlık yoktur; satır sayısı dosya boyutundan hesaplanır.
+    """
+
+    def __init__(self, path: Path, dim: int):
+        """
+        VectorFile instance'ı oluşturur.
+
+        Args:
+            path: Vektör dosyasının yolu
+            dim: Vektör boyutu
+        """
+        self.path = Path(path)
+        self.dim = dim
+        self._map: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        if not self.path.exists():
+            return 0
+
+        return self.path.stat().st_size // (self.dim * 4)
+
+    def append(self, vectors: np.ndarray) -> None:
+        """
+        Vektörleri dosyanın sonuna ekler.
+
+        Args:
+            vectors: (N, dim) vektörler
+        """
+        with open(self.path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype="float32").tobytes())
+
+        # Eski map yeni satırları görmez, bir sonraki okumada yeniden açılır
+        self._map = None
+
+    def get(self, ids: Sequence[int]) -> np.ndarray:
+        """
+        Verilen satırlardaki vektörleri döndürür.
+
+        Args:
+            ids: Satır numaraları
+
+        Returns:
+            (len(ids), dim) float32 vektörler
+        """
+        return np.asarray(self._vectors()[np.asarray(ids)])
+
+    def get_range(self, start: int, end: int) -> np.ndarray:
+        """
+        [start, end) aralığındaki vektörleri döndürür.
+
+        Args:
+            start: İlk satır
+            end: Son satırın bir fazlası
+
+        Returns:
+            (end - start, dim) float32 vektörler
+        """
+        return np.asarray(self._vectors()[start:end])
+
+    def read_all(self) -> np.ndarray:
+        """
+        Tüm vektörleri belleğe okur.
+
+        Returns:
+            (N, dim) float32 vektörler
+        """
+        return np.array(self._vectors())
+
+    def truncate(self, rows: int) -> None:
+        """
+        Dosyayı ilk rows satırına kısaltır.
+
+        Args:
+            rows: Korunacak satır sayısı
+        """
+        self._map = None
+
+        with open(self.path, "ab") as f:
+            f.truncate(rows * self.dim * 4)
+
+    def _vectors(self) -> np.memmap:
+        """
+        Dosyanın salt okunur memory map'ini döndürür.
+
+        append başka bir thread'de map'i sıfırlayabildiği için map yerel
+        değişkende tutulur.
+        """
+        vectors = self._map
+
+        if vectors is None:
+            vectors = np.memmap(
+                self.path, dtype="float32", mode="r", shape=(len(self), self.dim)
+            )
+            self._map = vectors
+
+        return vectors
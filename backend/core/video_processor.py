@@ -4,17 +4,29 @@ OpenCV kullanarak video işleme operasyonlarını gerçekleştirir.
 """
 
 import cv2
+import math
 import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterator
 from dataclasses import dataclass
 
 
 from config.settings import settings
+from core.frame_deduplicator import DEDUP_METHODS, FrameDeduplicator
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+DECODE_MODES = ("read", "grab", "seek")
+SAMPLING_STRATEGIES = ("fixed", "keyframe", "adaptive")
+
+# Kayan nokta hatalarının slot sınırındaki frame'leri kaydırmasını önler
+_SLOT_EPSILON = 1e-6
+
 
 @dataclass
 class FrameMetadata:
@@ -27,6 +39,9 @@ class FrameMetadata:
         frame_path: Frame dosya yolu
         timestamp: Videodaki zaman damgası (saniye)
         frame_number: Frame numarası
+        end_time: Frame'in temsil ettiği zaman aralığının sonu (saniye).
+                  Tekrar eden frame'ler atlandığında aralık bir sonraki
+                  tutulan frame'e kadar uzar.
     """
 
     frame_id: str
@@ -34,6 +49,7 @@ class FrameMetadata:
     frame_path: str
     timestamp: float
     frame_number: int
+    end_time: Optional[float] = None
 
 
 @dataclass
@@ -50,6 +66,10 @@ class VideoMetadata:
         total_frames: Toplam frame sayısı
         width: Video genişliği
         height: Video yüksekliği
+        content_hash: Video dosyasının SHA-256 içerik hash'i
+        indexed_until: Aranabilir frame'lerin kapsadığı süre (saniye); video
+                       işlenirken artar, None videonun tamamen index'lendiğini
+                       belirtir (eski kayıtlar)
     """
 
     video_id: str
@@ -60,6 +80,65 @@ class VideoMetadata:
     total_frames: int
     width: int
     height: int
+    content_hash: Optional[str] = None
+    indexed_until: Optional[float] = None
+
+    @property
+    def fully_indexed(self) -> bool:
+        """
+        Videonun tüm frame'leri index'e eklendi mi.
+        """
+        return self.indexed_until is None or self.indexed_until >= self.duration
+
+
+@dataclass
+class SamplingOptions:
+    """
+    Frame örnekleme seçenekleri.
+
+    None bırakılan alanlar settings'deki varsayılanlarla doldurulur, böylece
+    her upload kendi örnekleme ayarlarını seçebilir.
+
+    Attributes:
+        strategy: Örnekleme stratejisi (fixed/keyframe/adaptive)
+        frames_per_second: Saniyede örneklenecek frame sayısı (fixed için hız,
+                           keyframe için üst sınır)
+        decode_mode: Decode stratejisi (read/grab/seek)
+        dedup_method: Near-duplicate frame atlama yöntemi (none/histogram/phash)
+    """
+
+    strategy: Optional[str] = None
+    frames_per_second: Optional[float] = None
+    decode_mode: Optional[str] = None
+    dedup_method: Optional[str] = None
+
+    def resolve(self) -> "SamplingOptions":
+        """
+        Boş alanları settings'den doldurur ve değerleri doğrular.
+
+        Returns:
+            Tüm alanları dolu yeni SamplingOptions
+
+        Raises:
+            ValueError: Geçersiz bir seçenek verilmişse
+        """
+        resolved = SamplingOptions(
+            strategy=self.strategy or settings.SAMPLING_STRATEGY,
+            frames_per_second=self.frames_per_second or settings.FRAMES_PER_SECOND,
+            decode_mode=self.decode_mode or settings.FRAME_DECODE_MODE,
+            dedup_method=self.dedup_method or settings.FRAME_DEDUP_METHOD,
+        )
+
+        if resolved.strategy not in SAMPLING_STRATEGIES:
+            raise ValueError(f"Unknown sampling strategy: {resolved.strategy}")
+        if resolved.decode_mode not in DECODE_MODES:
+            raise ValueError(f"Unknown decode mode: {resolved.decode_mode}")
+        if resolved.dedup_method not in DEDUP_METHODS:
+            raise ValueError(f"Unknown dedup method: {resolved.dedup_method}")
+        if resolved.frames_per_second <= 0:
+            raise ValueError("frames_per_second must be positive")
+
+        return resolved
 
 
 class VideoProcessor:
@@ -134,34 +213,32 @@ class VideoProcessor:
             "duration": duration,
         }
 
-    def extract_frames(
-        self, video_path: Path, video_id: str, original_filename: str
-    ) -> Tuple[List[FrameMetadata], VideoMetadata]:
+    def _read_video_metadata(
+        self,
+        cap: cv2.VideoCapture,
+        video_path: Path,
+        video_id: str,
+        original_filename: str,
+    ) -> VideoMetadata:
         """
-        Videodan frame'leri çıkarır ve metadata oluşturur.
+        Açık bir VideoCapture nesnesinden video metadata'sı oluşturur.
 
         Args:
+            cap: Açık VideoCapture nesnesi
             video_path: Video dosya yolu
             video_id: Video benzersiz ID'si
             original_filename: Orijinal dosya adı
 
         Returns:
-            (frame_metadata_listesi, video_metadata) tuple'ı
+            VideoMetadata nesnesi
         """
-        logger.info(f"Starting frame extraction from {video_path}")
-
-        cap = cv2.VideoCapture(str(video_path))
-
-        if not cap.isOpened():
-            raise ValueError(f"Cannot open video: {video_path}")
-
         fps = cap.get(cv2.CAP_PROP_FPS)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         duration = total_frames / fps if fps > 0 else 0
 
-        video_metadata = VideoMetadata(
+        return VideoMetadata(
             video_id=video_id,
             original_filename=original_filename,
             video_path=str(video_path),
@@ -172,65 +249,720 @@ class VideoProcessor:
             height=height,
         )
 
-        frame_interval = int(fps / self.frames_per_second) if fps > 0 else 1
-        frame_metadata_list: List[FrameMetadata] = []
-        frame_dir = settings.get_frame_dir(video_id)
+    def _iter_sampled_frames(
+        self,
+        cap: cv2.VideoCapture,
+        fps: float,
+        total_frames: int,
+        decode_mode: str,
+        sample_rate: float,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+    ) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+        """
+        Sabit örnekleme hızında frame'leri üretir.
+
+        Zaman ekseni 1/sample_rate uzunluğunda slotlara bölünür ve her slota
+        düşen ilk frame örneklenir. Zaman damgaları container'daki PTS
+        değerlerinden okunduğu için kesirli ve değişken frame rate'li
+        videolarda da örnekler kaymaz.
+
+        Modlar:
+            read: Her frame read() ile tamamen decode edilir (eski davranış)
+            grab: Atlanan frame'ler grab() ile geçilir, sadece örneklenen
+                  frame'ler retrieve() ile BGR görüntüye dönüştürülür
+            seek: Örnekler arası boşluk SEEK_MIN_FRAME_GAP'ten büyükse hedef
+                  frame'e doğrudan konumlanılır, küçük boşluklar grab() ile
+                  geçilir (sabit frame rate varsayar)
+
+        Args:
+            cap: Açık VideoCapture nesnesi
+            fps: Video FPS değeri
+            total_frames: Videodaki toplam frame sayısı
+            decode_mode: Decode stratejisi
+            sample_rate: Saniyede örneklenecek frame sayısı
+            start_frame: Okumaya başlanacak frame numarası
+            end_frame: Okumanın duracağı frame numarası (dahil değil, None ise video sonu)
+
+        Yields:
+            (frame_index, frame_number, timestamp, frame) tuple'ı.
+            frame_index örneğin düştüğü slotun numarasıdır.
+        """
+        if decode_mode == "seek" and total_frames > 0 and fps > 0:
+            yield from self._iter_seek_frames(
+                cap, fps, total_frames, sample_rate, start_frame, end_frame
+            )
+            return
+
+        previous_slot = -1
+
+        if start_frame > 0:
+            # Önceki frame'in slotu, aralığın ilk frame'inin örneklenip
+            # örneklenmeyeceğini belirler
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame - 1)
+            if cap.grab():
+                previous_slot = _sample_slot(
+                    self._frame_timestamp(cap, start_frame - 1, fps), sample_rate
+                )
+
+        frame_number = start_frame
+
+        while end_frame is None or frame_number < end_frame:
+            if decode_mode == "read":
+                ret, frame = cap.read()
+
+                if not ret:
+                    break
+            elif not cap.grab():
+                break
+
+            timestamp = self._frame_timestamp(cap, frame_number, fps)
+            slot = _sample_slot(timestamp, sample_rate)
+
+            if slot > previous_slot:
+                previous_slot = slot
+
+                if decode_mode != "read":
+                    ret, frame = cap.retrieve()
 
-        frame_count = 0
-        extracted_count = 0
+                    if not ret:
+                        break
+
+                yield slot, frame_number, timestamp, frame
+
+            frame_number += 1
+
+    def _iter_seek_frames(
+        self,
+        cap: cv2.VideoCapture,
+        fps: float,
+        total_frames: int,
+        sample_rate: float,
+        start_frame: int,
+        end_frame: Optional[int],
+    ) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+        """
+        Seek modunda her slotun ilk frame'ine konumlanarak frame üretir.
+
+        Args:
+            cap: Açık VideoCapture nesnesi
+            fps: Video FPS değeri
+            total_frames: Videodaki toplam frame sayısı
+            sample_rate: Saniyede örneklenecek frame sayısı
+            start_frame: Okumaya başlanacak frame numarası
+            end_frame: Okumanın duracağı frame numarası (dahil değil)
+
+        Yields:
+            (frame_index, frame_number, timestamp, frame) tuple'ı
+        """
+        stop = total_frames if end_frame is None else min(end_frame, total_frames)
+        slot = _sample_slot(start_frame / fps, sample_rate)
+        position = 0
+        previous_target = -1
 
         while True:
-            ret, frame = cap.read()
+            # Slotun başlangıç zamanına eşit veya sonraki ilk frame
+            target = math.ceil((slot - _SLOT_EPSILON) * fps / sample_rate)
+            slot += 1
+
+            if target < start_frame or target <= previous_target:
+                continue
+            if target >= stop:
+                return
 
+            if target - position > settings.SEEK_MIN_FRAME_GAP:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                position = target
+
+            while position < target:
+                if not cap.grab():
+                    return
+                position += 1
+
+            if not cap.grab():
+                return
+            position += 1
+
+            ret, frame = cap.retrieve()
             if not ret:
-                break
+                return
 
-            if frame_count % frame_interval == 0:
-                frame_id = f"{video_id}_frame_{extracted_count:06d}"
-                frame_filename = f"{frame_id}.jpg"
-                frame_path = frame_dir / frame_filename
+            previous_target = target
+            timestamp = target / fps
 
-                cv2.imwrite(str(frame_path), frame)
+            yield _sample_slot(timestamp, sample_rate), target, timestamp, frame
 
-                timestamp = frame_count / fps if fps > 0 else frame_count
+    def _iter_keyframes(
+        self, video_path: Path, fps: float, sample_rate: float
+    ) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+        """
+        Sadece I-frame'leri decode ederek frame üretir.
+
+        Decoder'a key olmayan frame'leri atlaması söylendiği için P/B
+        frame'ler hiç decode edilmez. Yoğun keyframe içeren videolarda
+        (ör. intra-only codec'ler) sample_rate üst sınır olarak uygulanır.
+        PyAV kütüphanesini gerektirir.
 
-                metadata = FrameMetadata(
-                    frame_id=frame_id,
-                    video_id=video_id,
-                    frame_path=str(frame_path),
-                    timestamp=timestamp,
-                    frame_number=frame_count,
+        Args:
+            video_path: Video dosya yolu
+            fps: Video FPS değeri (frame numarası hesabı için)
+            sample_rate: Saniyede en fazla örneklenecek frame sayısı
+
+        Yields:
+            (frame_index, frame_number, timestamp, frame) tuple'ı
+        """
+        try:
+            import av
+        except ImportError as e:
+            raise RuntimeError(
+                "Keyframe sampling requires PyAV. Install it with 'pip install av'"
+            ) from e
+
+        with av.open(str(video_path)) as container:
+            stream = container.streams.video[0]
+            stream.codec_context.skip_frame = "NONKEY"
+            start_pts = stream.start_time or 0
+            previous_slot = -1
+
+            for frame in container.decode(stream):
+                if frame.pts is None:
+                    continue
+
+                timestamp = float((frame.pts - start_pts) * stream.time_base)
+                slot = _sample_slot(timestamp, sample_rate)
+
+                if slot <= previous_slot:
+                    continue
+
+                previous_slot = slot
+                frame_number = round(timestamp * fps) if fps > 0 else slot
+
+                yield slot, frame_number, timestamp, frame.to_ndarray(format="bgr24")
+
+    def _iter_adaptive_frames(
+        self, probe_frames: Iterator[Tuple[int, int, float, np.ndarray]]
+    ) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+        """
+        Hareket skoruna göre örnekleme yoğunluğunu ayarlar.
+
+        Probe frame'leri ADAPTIVE_MAX_FPS hızında gelir. Her probe ile bir
+        öncekisi arasındaki küçültülmüş gri tonlu fark hareket skorunu verir.
+        Skor ADAPTIVE_MOTION_THRESHOLD'a ulaştığında her probe tutulur,
+        skor düştükçe iki örnek arasındaki süre 1/ADAPTIVE_MIN_FPS'e kadar uzar.
+
+        Args:
+            probe_frames: Sabit hızda örneklenmiş probe frame'leri
+
+        Yields:
+            (frame_index, frame_number, timestamp, frame) tuple'ı
+        """
+        previous_signature = None
+        last_kept_time = None
+
+        for frame_index, frame_number, timestamp, frame in probe_frames:
+            signature = cv2.resize(
+                cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY),
+                (64, 36),
+                interpolation=cv2.INTER_AREA,
+            ).astype(np.float32)
+
+            motion = 0.0
+            if previous_signature is not None:
+                motion = float(np.mean(np.abs(signature - previous_signature))) / 255.0
+            previous_signature = signature
+
+            weight = min(1.0, motion / settings.ADAPTIVE_MOTION_THRESHOLD)
+            required_gap = (1.0 - weight) / settings.ADAPTIVE_MIN_FPS
+
+            if (
+                last_kept_time is None
+                or timestamp - last_kept_time >= required_gap - _SLOT_EPSILON
+            ):
+                last_kept_time = timestamp
+                yield frame_index, frame_number, timestamp, frame
+
+    def _iter_strategy_frames(
+        self,
+        cap: cv2.VideoCapture,
+        video_path: Path,
+        fps: float,
+        total_frames: int,
+        options: SamplingOptions,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+    ) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+        """
+        Seçili örnekleme stratejisine göre frame üretir.
+
+        Args:
+            cap: Açık VideoCapture nesnesi
+            video_path: Video dosya yolu
+            fps: Video FPS değeri
+            total_frames: Videodaki toplam frame sayısı
+            options: Çözümlenmiş örnekleme seçenekleri
+            start_frame: Okumaya başlanacak frame numarası (sadece fixed)
+            end_frame: Okumanın duracağı frame numarası (sadece fixed)
+
+        Yields:
+            (frame_index, frame_number, timestamp, frame) tuple'ı
+        """
+        if options.strategy == "keyframe":
+            return self._iter_keyframes(video_path, fps, options.frames_per_second)
+
+        if options.strategy == "adaptive":
+            return self._iter_adaptive_frames(
+                self._iter_sampled_frames(
+                    cap,
+                    fps,
+                    total_frames,
+                    options.decode_mode,
+                    settings.ADAPTIVE_MAX_FPS,
                 )
+            )
 
-                frame_metadata_list.append(metadata)
-                extracted_count += 1
+        return self._iter_sampled_frames(
+            cap,
+            fps,
+            total_frames,
+            options.decode_mode,
+            options.frames_per_second,
+            start_frame,
+            end_frame,
+        )
 
-                if extracted_count % 100 == 0:
-                    logger.info(f"Extracted {extracted_count} frames...")
+    @staticmethod
+    def _frame_timestamp(cap: cv2.VideoCapture, frame_number: int, fps: float) -> float:
+        """
+        Son grab edilen frame'in zaman damgasını döndürür.
 
-            frame_count += 1
+        Container PTS değeri kullanılır. Backend PTS sağlamıyorsa
+        frame_number / fps değerine düşülür.
 
-        cap.release()
+        Args:
+            cap: Açık VideoCapture nesnesi
+            frame_number: Frame numarası
+            fps: Video FPS değeri
+
+        Returns:
+            Zaman damgası (saniye)
+        """
+        position_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+
+        if position_msec > 0 or frame_number == 0:
+            return position_msec / 1000.0
+
+        return frame_number / fps if fps > 0 else float(frame_number)
+
+    def _iter_distinct_frames(
+        self,
+        sampled_frames: Iterator[Tuple[int, int, float, np.ndarray]],
+        stream_end: float,
+        dedup_method: str,
+    ) -> Iterator[Tuple[int, int, float, np.ndarray, float]]:
+        """
+        Örneklenen frame'lerden son tutulan frame'e çok benzeyenleri atlar.
+
+        Her tutulan frame, bir sonraki tutulan frame'e kadar olan zaman
+        aralığını temsil eder. Bu yüzden frame'ler bir adım gecikmeli üretilir.
+        Frame sıra numaraları örnekleme slotlarından geldiği için frame ID'leri
+        dedup açık veya kapalıyken aynı kalır.
+
+        Args:
+            sampled_frames: (frame_index, frame_number, timestamp, frame) iterator'ı
+            stream_end: Son frame'in aralığının bitiş zamanı (saniye)
+            dedup_method: Dedup yöntemi ('none' ise hiçbir frame atlanmaz)
+
+        Yields:
+            (frame_index, frame_number, timestamp, frame, end_time) tuple'ı
+        """
+        deduplicator = (
+            FrameDeduplicator(dedup_method, settings.FRAME_DEDUP_THRESHOLD)
+            if dedup_method != "none"
+            else None
+        )
+
+        pending = None
+        skipped_count = 0
+
+        for frame_index, frame_number, timestamp, frame in sampled_frames:
+            if (
+                pending is not None
+                and deduplicator is not None
+                and timestamp - pending[2] < settings.FRAME_DEDUP_MAX_SPAN
+                and deduplicator.is_duplicate(frame)
+            ):
+                skipped_count += 1
+                continue
+
+            if pending is not None:
+                yield (*pending, timestamp)
+
+            pending = (frame_index, frame_number, timestamp, frame)
+
+            if deduplicator is not None:
+                deduplicator.keep(frame)
+
+        if pending is not None:
+            yield (*pending, max(stream_end, pending[2]))
+
+        if skipped_count:
+            logger.info(f"Skipped {skipped_count} near-duplicate frames")
+
+    def _build_frame_metadata(
+        self,
+        video_id: str,
+        frame_index: int,
+        frame_number: int,
+        timestamp: float,
+        end_time: Optional[float] = None,
+    ) -> FrameMetadata:
+        """
+        Örneklenen bir frame için metadata oluşturur.
+
+        Args:
+            video_id: Video benzersiz ID'si
+            frame_index: Örnekleme slotu numarası
+            frame_number: Videodaki frame numarası
+            timestamp: Videodaki zaman damgası (saniye)
+            end_time: Frame'in temsil ettiği aralığın sonu (saniye)
+
+        Returns:
+            FrameMetadata nesnesi
+        """
+        frame_id = make_frame_id(video_id, frame_index)
+        frame_path = settings.get_frame_dir(video_id) / f"{frame_id}.jpg"
+
+        return FrameMetadata(
+            frame_id=frame_id,
+            video_id=video_id,
+            frame_path=str(frame_path),
+            timestamp=timestamp,
+            frame_number=frame_number,
+            end_time=end_time,
+        )
+
+    def _save_frame(
+        self,
+        frame: np.ndarray,
+        video_id: str,
+        frame_index: int,
+        frame_number: int,
+        timestamp: float,
+        end_time: Optional[float] = None,
+    ) -> FrameMetadata:
+        """
+        Frame'i JPEG olarak kaydeder ve metadata'sını oluşturur.
+
+        Args:
+            frame: BGR frame görüntüsü
+            video_id: Video benzersiz ID'si
+            frame_index: Örnekleme slotu numarası
+            frame_number: Videodaki frame numarası
+            timestamp: Videodaki zaman damgası (saniye)
+            end_time: Frame'in temsil ettiği aralığın sonu (saniye)
+
+        Returns:
+            FrameMetadata nesnesi
+        """
+        metadata = self._build_frame_metadata(
+            video_id, frame_index, frame_number, timestamp, end_time
+        )
+        cv2.imwrite(metadata.frame_path, frame)
+
+        return metadata
+
+    def _should_extract_in_parallel(
+        self, duration: float, total_frames: int, options: SamplingOptions
+    ) -> bool:
+        """
+        Videonun paralel olarak işlenip işlenmeyeceğine karar verir.
+
+        Sadece sabit hızlı örnekleme paralelleştirilebilir; keyframe ve
+        adaptive stratejileri videonun tamamını sırayla dolaşır.
+
+        Args:
+            duration: Video süresi (saniye)
+            total_frames: Toplam frame sayısı
+            options: Çözümlenmiş örnekleme seçenekleri
+
+        Returns:
+            Paralel extraction kullanılacaksa True
+        """
+        return (
+            options.strategy == "fixed"
+            and settings.EXTRACTION_WORKERS > 1
+            and total_frames > 0
+            and duration >= settings.PARALLEL_EXTRACTION_MIN_DURATION
+        )
+
+    def _iter_parallel_frames(
+        self,
+        video_path: Path,
+        fps: float,
+        total_frames: int,
+        options: SamplingOptions,
+    ) -> Iterator[Tuple[int, int, float, np.ndarray]]:
+        """
+        Videoyu kısa frame aralıklarına böler, aralıkları process pool'da
+        decode eder ve örneklenen frame'leri sırayla üretir.
+
+        Örnekleme kararı sadece frame'in ve bir önceki frame'in zaman
+        damgasına bağlı olduğundan, her worker seri yol ile aynı frame
+        numaralarını ve slotlarını üretir. Aralıklar en fazla
+        PARALLEL_EXTRACTION_CHUNK_SECONDS uzunluğundadır ve aynı anda en
+        fazla EXTRACTION_WORKERS aralık bekler; bellekte tutulan frame sayısı
+        video süresinden bağımsızdır. Dedup çağıran tarafından birleştirilmiş
+        akışa uygulanır.
+
+        Args:
+            video_path: Video dosya yolu
+            fps: Video FPS değeri
+            total_frames: Toplam frame sayısı
+            options: Çözümlenmiş örnekleme seçenekleri
+
+        Yields:
+            (frame_index, frame_number, timestamp, frame) tuple'ı
+        """
+        workers = settings.EXTRACTION_WORKERS
+        chunk_size = -(-total_frames // workers)
+        if fps > 0:
+            chunk_size = min(
+                chunk_size,
+                max(int(settings.PARALLEL_EXTRACTION_CHUNK_SECONDS * fps), 1),
+            )
+
+        starts = list(range(0, total_frames, chunk_size))
+        # Son aralık video sonuna kadar okunur (frame sayısı tahmini hatalı olabilir)
+        ranges = iter(zip(starts, starts[1:] + [None]))
 
         logger.info(
-            f"Frame extraction completed: {extracted_count} frames "
-            f"extracted from {total_frames} total frames"
+            f"Extracting frames in parallel: {len(starts)} chunks of "
+            f"{chunk_size} frames"
+        )
+
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(starts)))
+        pending = deque()
+
+        def submit(count: int) -> None:
+            for start, end in islice(ranges, count):
+                pending.append(
+                    executor.submit(
+                        _decode_frame_range,
+                        str(video_path),
+                        fps,
+                        total_frames,
+                        options,
+                        start,
+                        end,
+                    )
+                )
+
+        try:
+            submit(workers)
+
+            while pending:
+                frames = pending.popleft().result()
+                submit(1)
+                yield from frames
+        finally:
+            # Tüketici erken durursa bekleyen aralıklar decode edilmez
+            executor.shutdown(cancel_futures=True)
+
+    def _iter_video_frames(
+        self,
+        cap: cv2.VideoCapture,
+        video_path: Path,
+        video_metadata: VideoMetadata,
+        options: SamplingOptions,
+        parallel: Optional[bool] = None,
+    ) -> Iterator[Tuple[int, int, float, np.ndarray, float]]:
+        """
+        Örneklenen frame'leri seri veya paralel decode ile üretir ve dedup uygular.
+
+        Dedup paralel yolda da aralıklar sırayla birleştirildikten sonra
+        uygulanır; aralık sınırlarındaki tekrarlar atlanır ve end_time
+        değerleri seri yol ile aynı olur.
+
+        Args:
+            cap: Açık VideoCapture nesnesi (paralel yolda kapatılır)
+            video_path: Video dosya yolu
+            video_metadata: Videonun metadata'sı
+            options: Çözümlenmiş örnekleme seçenekleri
+            parallel: Process pool ile paralel decode (None ise video
+                      süresine göre otomatik seçilir)
+
+        Yields:
+            (frame_index, frame_number, timestamp, frame, end_time) tuple'ı
+        """
+        fps = video_metadata.fps
+        total_frames = video_metadata.total_frames
+
+        if parallel is None:
+            parallel = self._should_extract_in_parallel(
+                video_metadata.duration, total_frames, options
+            )
+
+        if parallel and options.strategy == "fixed" and total_frames > 0:
+            cap.release()
+            sampled_frames = self._iter_parallel_frames(
+                video_path, fps, total_frames, options
+            )
+        else:
+            sampled_frames = self._iter_strategy_frames(
+                cap, video_path, fps, total_frames, options
+            )
+
+        return self._iter_distinct_frames(
+            sampled_frames, video_metadata.duration, options.dedup_method
+        )
+
+    def extract_frames(
+        self,
+        video_path: Path,
+        video_id: str,
+        original_filename: str,
+        options: Optional[SamplingOptions] = None,
+        parallel: Optional[bool] = None,
+    ) -> Tuple[List[FrameMetadata], VideoMetadata]:
+        """
+        Videodan frame'leri çıkarır ve metadata oluşturur.
+
+        Args:
+            video_path: Video dosya yolu
+            video_id: Video benzersiz ID'si
+            original_filename: Orijinal dosya adı
+            options: Örnekleme seçenekleri (boş alanlar settings'den alınır)
+            parallel: Process pool ile paralel extraction (None ise video
+                      süresine göre otomatik seçilir)
+
+        Returns:
+            (frame_metadata_listesi, video_metadata) tuple'ı
+        """
+        options = (options or SamplingOptions()).resolve()
+
+        logger.info(
+            f"Starting frame extraction from {video_path} "
+            f"({options.strategy} sampling, {options.decode_mode} mode)"
+        )
+
+        cap = cv2.VideoCapture(str(video_path))
+
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open video: {video_path}")
+
+        video_metadata = self._read_video_metadata(
+            cap, video_path, video_id, original_filename
+        )
+        frame_metadata_list: List[FrameMetadata] = []
+
+        try:
+            for (
+                frame_index,
+                frame_number,
+                timestamp,
+                frame,
+                end_time,
+            ) in self._iter_video_frames(
+                cap, video_path, video_metadata, options, parallel
+            ):
+                frame_metadata_list.append(
+                    self._save_frame(
+                        frame,
+                        video_id,
+                        frame_index,
+                        frame_number,
+                        timestamp,
+                        end_time,
+                    )
+                )
+
+                if len(frame_metadata_list) % 100 == 0:
+                    logger.info(f"Extracted {len(frame_metadata_list)} frames...")
+        finally:
+            cap.release()
+
+        logger.info(
+            f"Frame extraction completed: {len(frame_metadata_list)} frames "
+            f"extracted from {video_metadata.total_frames} total frames"
         )
 
         return frame_metadata_list, video_metadata
 
-    def process_video(
-        self, video_file_path: Path, original_filename: str
-    ) -> Tuple[str, List[FrameMetadata], VideoMetadata]:
+    def iter_frames(
+        self,
+        video_path: Path,
+        video_id: str,
+        original_filename: str,
+        options: Optional[SamplingOptions] = None,
+        parallel: Optional[bool] = None,
+    ) -> Tuple[VideoMetadata, Iterator[Tuple[FrameMetadata, np.ndarray]]]:
         """
-        Video'yu işler: doğrular, frame çıkarır ve metadata oluşturur.
+        Videodaki örneklenen frame'leri diske yazmadan akış halinde üretir.
+
+        Frame'ler bellekte BGR formatında döndürülür. Thumbnail'ların diske
+        yazılması çağıranın sorumluluğundadır (bkz. FrameMetadata.frame_path).
+        Uzun videolar extract_frames'teki gibi process pool'da decode edilir.
+
+        Args:
+            video_path: Video dosya yolu
+            video_id: Video benzersiz ID'si
+            original_filename: Orijinal dosya adı
+            options: Örnekleme seçenekleri (boş alanlar settings'den alınır)
+            parallel: Process pool ile paralel decode (None ise video
+                      süresine göre otomatik seçilir)
+
+        Returns:
+            (video_metadata, (frame_metadata, frame) iterator'ı) tuple'ı
+        """
+        options = (options or SamplingOptions()).resolve()
+
+        cap = cv2.VideoCapture(str(video_path))
+
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open video: {video_path}")
+
+        video_metadata = self._read_video_metadata(
+            cap, video_path, video_id, original_filename
+        )
+
+        def frame_iterator() -> Iterator[Tuple[FrameMetadata, np.ndarray]]:
+            try:
+                for (
+                    frame_index,
+                    frame_number,
+                    timestamp,
+                    frame,
+                    end_time,
+                ) in self._iter_video_frames(
+                    cap, video_path, video_metadata, options, parallel
+                ):
+                    yield (
+                        self._build_frame_metadata(
+                            video_id, frame_index, frame_number, timestamp, end_time
+                        ),
+                        frame,
+                    )
+            finally:
+                cap.release()
+
+        return video_metadata, frame_iterator()
+
+    def prepare_video(
+        self,
+        video_file_path: Path,
+        original_filename: str,
+        video_id: Optional[str] = None,
+    ) -> Tuple[str, Path]:
+        """
+        Video'yu doğrular, ID atar ve kalıcı upload dizinine taşır.
 
         Args:
             video_file_path: Video dosya yolu (geçici dosya)
             original_filename: Orijinal dosya adı
+            video_id: Önceden atanmış video ID'si (verilmezse yenisi üretilir)
 
         Returns:
-            (video_id, frame_metadata_list, video_metadata) tuple'ı
+            (video_id, kalıcı_video_yolu) tuple'ı
 
         Raises:
             ValueError: Video geçersizse
@@ -238,14 +970,111 @@ class VideoProcessor:
         if not self.validate_video(video_file_path):
             raise ValueError("Invalid video file")
 
-        video_id = str(uuid.uuid4())
+        video_id = video_id or str(uuid.uuid4())
 
         permanent_path = settings.UPLOAD_DIR / f"{video_id}{video_file_path.suffix}"
         video_file_path.rename(permanent_path)
 
+        return video_id, permanent_path
+
+    def process_video(
+        self,
+        video_file_path: Path,
+        original_filename: str,
+        options: Optional[SamplingOptions] = None,
+    ) -> Tuple[str, List[FrameMetadata], VideoMetadata]:
+        """
+        Video'yu işler: doğrular, frame çıkarır ve metadata oluşturur.
+
+        Args:
+            video_file_path: Video dosya yolu (geçici dosya)
+            original_filename: Orijinal dosya adı
+            options: Örnekleme seçenekleri (boş alanlar settings'den alınır)
+
+        Returns:
+            (video_id, frame_metadata_list, video_metadata) tuple'ı
+
+        Raises:
+            ValueError: Video geçersizse
+        """
+        video_id, permanent_path = self.prepare_video(
+            video_file_path, original_filename
+        )
+
         frame_metadata_list, video_metadata = self.extract_frames(
-            permanent_path, video_id, original_filename
+            permanent_path, video_id, original_filename, options
         )
 
         return video_id, frame_metadata_list, video_metadata
 
+
+def _sample_slot(timestamp: float, sample_rate: float) -> int:
+    """
+    Zaman damgasının düştüğü örnekleme slotunun numarasını döndürür.
+
+    Args:
+        timestamp: Zaman damgası (saniye)
+        sample_rate: Saniyedeki slot sayısı
+
+    Returns:
+        Slot numarası
+    """
+    return math.floor(timestamp * sample_rate + _SLOT_EPSILON)
+
+
+def make_frame_id(video_id: str, frame_index: int) -> str:
+    """
+    Videodaki bir örnekleme slotunun frame ID'sini döndürür.
+
+    Args:
+        video_id: Video benzersiz ID'si
+        frame_index: Örnekleme slotu numarası
+
+    Returns:
+        Frame ID'si (frame dosyasının adı da budur)
+    """
+    return f"{video_id}_frame_{frame_index:06d}"
+
+
+def _decode_frame_range(
+    video_path: str,
+    fps: float,
+    total_frames: int,
+    options: SamplingOptions,
+    start_frame: int,
+    end_frame: Optional[int],
+) -> List[Tuple[int, int, float, np.ndarray]]:
+    """
+    Process pool worker fonksiyonu: tek bir frame aralığını decode eder.
+
+    Args:
+        video_path: Video dosya yolu
+        fps: Video FPS değeri
+        total_frames: Toplam frame sayısı
+        options: Çözümlenmiş örnekleme seçenekleri
+        start_frame: Aralığın başlangıç frame numarası
+        end_frame: Aralığın bitiş frame numarası (dahil değil, None ise video sonu)
+
+    Returns:
+        Aralıkta örneklenen (frame_index, frame_number, timestamp, frame) listesi
+    """
+    processor = VideoProcessor()
+    cap = cv2.VideoCapture(video_path)
+
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {video_path}")
+
+    try:
+        return list(
+            processor._iter_strategy_frames(
+                cap,
+                Path(video_path),
+                fps,
+                total_frames,
+                options,
+                start_frame,
+                end_frame,
+            )
+        )
+    finally:
+        cap.release()
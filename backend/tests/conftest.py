@@ -0,0 +1,72 @@
+"""
+Testler arasında paylaşılan fixture'lar.
+
+Model indirilemeyen ortamlarda da çalışabilmek için rastgele ağırlıklı,
+küçük bir CLIP modeli ve ona uygun tokenizer/görsel processor'ı üretilir.
+"""
+
+import json
+import string
+
+import pytest
+import torch
+from transformers import (
+    CLIPConfig,
+    CLIPImageProcessor,
+    CLIPModel,
+    CLIPTokenizer,
+)
+
+from config.settings import settings
+
+
+@pytest.fixture(autouse=True)
+def frame_embedding_dir(tmp_path, monkeypatch):
+    """Frame embedding deposunu her test için geçici bir dizine yönlendirir."""
+    path = tmp_path / "embeddings"
+    monkeypatch.setattr(type(settings), "FRAME_EMBEDDING_DIR", path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def tiny_clip():
+    """Rastgele ağırlıklı küçük CLIP modeli (projeksiyon boyutu 16)."""
+    torch.manual_seed(0)
+    tower = {
+        "hidden_size": 32,
+        "intermediate_size": 64,
+        "num_hidden_layers": 2,
+        "num_attention_heads": 4,
+        "projection_dim": 16,
+    }
+    config = CLIPConfig(
+        text_config=dict(tower, vocab_size=64, bos_token_id=0, eos_token_id=1),
+        vision_config=dict(tower, image_size=32, patch_size=8),
+        projection_dim=16,
+    )
+    return CLIPModel(config).eval()
+
+
+@pytest.fixture(scope="session")
+def tiny_clip_dir(tiny_clip, tmp_path_factory):
+    """Küçük CLIP modelinin from_pretrained ile yüklenebilen kopyası."""
+    model_dir = tmp_path_factory.mktemp("tiny_clip")
+
+    # Harf bazlı vocab: her kelime harflerine bölünerek tokenize edilir
+    vocab = {"<|startoftext|>": 0, "<|endoftext|>": 1}
+    for letter in string.ascii_lowercase:
+        vocab[letter] = len(vocab)
+        vocab[f"{letter}</w>"] = len(vocab)
+
+    (model_dir / "vocab.json").write_text(json.dumps(vocab))
+    (model_dir / "merges.txt").write_text("#version: 0.2\n")
+
+    CLIPTokenizer(
+        str(model_dir / "vocab.json"), str(model_dir / "merges.txt")
+    ).save_pretrained(model_dir)
+    CLIPImageProcessor(
+        size={"shortest_edge": 32}, crop_size={"height": 32, "width": 32}
+    ).save_pretrained(model_dir)
+    tiny_clip.save_pretrained(model_dir)
+
+    return str(model_dir)
@@ -0,0 +1,64 @@
+"""
+BoundedExecutor testleri.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from core.bounded_executor import BoundedExecutor, ExecutorSaturatedError
+
+
+def test_jobs_beyond_workers_and_queue_are_rejected():
+    executor = BoundedExecutor("test", max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    running = executor.submit(release.wait)
+    queued = executor.submit(lambda: "queued")
+    assert executor.active == 2
+
+    with pytest.raises(ExecutorSaturatedError):
+        executor.submit(lambda: "rejected")
+
+    release.set()
+    assert running.result(timeout=1)
+    assert queued.result(timeout=1) == "queued"
+
+    # Biten işlerin kapasitesi tekrar kullanılabilir
+    assert executor.submit(lambda: "accepted").result(timeout=1) == "accepted"
+    executor.shutdown()
+    assert executor.active == 0
+
+
+def test_saturated_pool_does_not_block_other_pool():
+    """Dolu upload havuzu arama havuzundaki işleri bekletmez."""
+    uploads = BoundedExecutor("upload", max_workers=1, max_pending=0)
+    searches = BoundedExecutor("search", max_workers=2, max_pending=2)
+    release = threading.Event()
+
+    async def main():
+        upload = asyncio.ensure_future(uploads.run(release.wait))
+        result = await asyncio.wait_for(searches.run(sum, [1, 2, 3]), timeout=1)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await uploads.run(lambda: None)
+
+        release.set()
+        assert await upload
+        return result
+
+    assert asyncio.run(main()) == 6
+
+    uploads.shutdown()
+    searches.shutdown()
+
+
+def test_failed_job_releases_capacity():
+    executor = BoundedExecutor("test", max_workers=1, max_pending=0)
+
+    with pytest.raises(ZeroDivisionError):
+        executor.submit(lambda: 1 / 0).result(timeout=1)
+
+    assert executor.submit(lambda: 1).result(timeout=1) == 1
+    executor.shutdown()
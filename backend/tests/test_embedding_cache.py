@@ -0,0 +1,89 @@
+"""
+EmbeddingCache testleri.
+"""
+
+import numpy as np
+import pytest
+
+from core.embedding_cache import EmbeddingCache
+
+
+def vector(*values):
+    return np.array(values, dtype="float32")
+
+
+def test_hits_and_misses_are_counted():
+    cache = EmbeddingCache(max_size=4)
+
+    assert cache.get("clip", "a dog") is None
+    cache.put("clip", "a dog", vector(3, 4))
+
+    np.testing.assert_allclose(cache.get("clip", "  A   Dog "), [0.6, 0.8])
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(0.5)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EmbeddingCache(max_size=2)
+    cache.put("clip", "first", vector(1, 0))
+    cache.put("clip", "second", vector(0, 1))
+
+    # "first" yeniden kullanıldığı için "second" en eski kayıt olur
+    cache.get("clip", "first")
+    cache.put("clip", "third", vector(1, 1))
+
+    assert cache.get("clip", "second") is None
+    assert cache.get("clip", "first") is not None
+    assert cache.get("clip", "third") is not None
+
+
+def test_entries_are_scoped_to_model():
+    cache = EmbeddingCache(max_size=4)
+    cache.put("clip-base", "a dog", vector(1, 0))
+
+    assert cache.get("clip-large", "a dog") is None
+
+
+def test_cached_embeddings_are_read_only():
+    cache = EmbeddingCache(max_size=4)
+    embedding = cache.put("clip", "a dog", vector(1, 0))
+
+    with pytest.raises(ValueError):
+        embedding[0] = 2.0
+
+
+def test_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "text_cache.pkl")
+
+    cache = EmbeddingCache(max_size=4, persist_path=path)
+    cache.put("clip", "a dog", vector(0, 2))
+    cache.save()
+
+    restored = EmbeddingCache(max_size=4, persist_path=path)
+
+    assert len(restored) == 1
+    np.testing.assert_allclose(restored.get("clip", "a dog"), [0, 1])
+
+
+@pytest.mark.parametrize("content", [b"", b"not a pickle"])
+def test_corrupt_cache_file_starts_empty(tmp_path, content):
+    path = tmp_path / "text_cache.pkl"
+    path.write_bytes(content)
+
+    cache = EmbeddingCache(max_size=4, persist_path=str(path))
+
+    assert len(cache) == 0
+
+
+def test_disabled_cache_ignores_persisted_entries(tmp_path):
+    path = str(tmp_path / "text_cache.pkl")
+    cache = EmbeddingCache(max_size=4, persist_path=path)
+    cache.put("clip", "a dog", vector(0, 2))
+    cache.save()
+
+    disabled = EmbeddingCache(max_size=0, persist_path=path)
+
+    assert len(disabled) == 0
+    assert disabled.get("clip", "a dog") is None
@@ -0,0 +1,106 @@
+"""
+EmbeddingStore testleri.
+"""
+
+import numpy as np
+import pytest
+
+from core.embedding_store import EmbeddingStore, content_key
+
+
+def random_features(n: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype("float32")
+
+
+def test_put_and_get_round_trip(tmp_path):
+    """Embedding'ler float16 hassasiyetinde, istenen sırayla döner."""
+    store = EmbeddingStore(tmp_path)
+    keys = [content_key(bytes([i])) for i in range(5)]
+    features = random_features(5)
+
+    store.put(keys, features)
+
+    assert all(key in store for key in keys)
+    assert content_key(b"other") not in store
+    np.testing.assert_allclose(
+        store.get(keys[::-1]), features[::-1], rtol=1e-3, atol=1e-3
+    )
+
+
+def test_existing_keys_are_not_written_again(tmp_path):
+    store = EmbeddingStore(tmp_path)
+    keys = [content_key(bytes([i])) for i in range(3)]
+
+    store.put(keys, random_features(3))
+    store.put([keys[0], keys[0], content_key(b"new")], random_features(3, seed=1))
+
+    assert len(store) == 4
+    assert (tmp_path / "shard_00000.keys").stat().st_size == 4 * 16
+
+
+def test_store_is_reloaded_across_shards(tmp_path):
+    """Kapatılıp açılan depo tüm shard'lardaki embedding'leri bulur."""
+    keys = [content_key(bytes([i])) for i in range(10)]
+    features = random_features(10)
+
+    store = EmbeddingStore(tmp_path, shard_rows=4)
+    store.put(keys[:3], features[:3])
+    store.put(keys[3:], features[3:])
+    assert store.stats()["shards"] == 3
+
+    reopened = EmbeddingStore(tmp_path, shard_rows=4)
+
+    assert len(reopened) == 10
+    np.testing.assert_array_equal(reopened.get(keys), store.get(keys))
+
+
+def test_incomplete_writes_are_truncated(tmp_path):
+    """Yarım kalmış bir yazma açılışta temizlenir, tam satırlar korunur."""
+    keys = [content_key(bytes([i])) for i in range(3)]
+    features = random_features(3)
+
+    EmbeddingStore(tmp_path).put(keys, features)
+    with open(tmp_path / "shard_00000.f16", "r+b") as f:
+        f.truncate(2 * 8 * 2 + 5)
+
+    store = EmbeddingStore(tmp_path)
+
+    assert len(store) == 2
+    assert keys[2] not in store
+    np.testing.assert_allclose(store.get(keys[:2]), features[:2], atol=1e-3)
+
+    store.put([keys[2]], features[2:])
+    assert len(EmbeddingStore(tmp_path)) == 3
+
+
+def test_stores_sharing_a_directory_see_each_others_rows(tmp_path):
+    """Aynı dizine yazan instance'lar (process'ler) birbirinin satırlarını bozmaz."""
+    keys = [content_key(bytes([i])) for i in range(8)]
+    features = random_features(8)
+    first = EmbeddingStore(tmp_path, shard_rows=4)
+    second = EmbeddingStore(tmp_path, shard_rows=4)
+
+    first.put(keys[:3], features[:3])
+    second.put(keys[1:6], features[1:6])
+    first.put(keys[5:], features[5:])
+
+    assert len(first) == 8
+    reopened = EmbeddingStore(tmp_path, shard_rows=4)
+    assert reopened.stats()["shards"] == 2
+    np.testing.assert_allclose(reopened.get(keys), features, rtol=1e-3, atol=1e-3)
+    np.testing.assert_array_equal(first.get(keys), reopened.get(keys))
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    store = EmbeddingStore(tmp_path)
+    store.put([content_key(b"a")], random_features(1))
+
+    with pytest.raises(ValueError):
+        store.put([content_key(b"b")], random_features(1, dim=4))
+
+
+def test_content_key_includes_frame_shape():
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+
+    assert content_key(frame) == content_key(frame.copy())
+    assert content_key(frame) != content_key(frame.reshape(6, 4, 3))
@@ -0,0 +1,252 @@
+"""
+FeatureExtractor testleri.
+
+Model indirilemeyen ortamlarda da çalışması için gerçek CLIP ağırlıkları
+yerine piksel ortalaması döndüren bir encoder veya rastgele ağırlıklı küçük
+bir CLIP modeli kullanılır.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+from transformers import CLIPImageProcessor, CLIPModel, CLIPTokenizerFast
+
+from config.settings import settings
+from core.feature_extractor import FeatureExtractor
+
+
+class MeanPixelEncoder:
+    """pixel_values'un kanal ortalamalarını embedding olarak döndürür."""
+
+    name = "mean-pixel"
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, inputs):
+        self.encoded += len(inputs["pixel_values"])
+        return inputs["pixel_values"].mean(dim=(2, 3)).numpy()
+
+
+def passthrough_tokenizer(text, **kwargs):
+    """Metinleri tokenize etmeden encoder'a iletir."""
+    return {"text": text}
+
+
+@pytest.fixture
+def extractor():
+    """Model yüklemeden kurulmuş FeatureExtractor."""
+    extractor = FeatureExtractor(model_name="mean-pixel")
+    extractor._towers["image"] = (
+        CLIPImageProcessor(
+            size={"shortest_edge": 32}, crop_size={"height": 32, "width": 32}
+        ),
+        MeanPixelEncoder(),
+    )
+    yield extractor
+    extractor.text_batcher.close()
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    """Farklı renklerde küçük JPEG görselleri."""
+    paths = []
+    rng = np.random.default_rng(0)
+
+    for i in range(23):
+        color = rng.integers(0, 256, size=3, dtype=np.uint8)
+        path = tmp_path / f"image_{i:02d}.jpg"
+        Image.fromarray(np.full((48, 64, 3), color)).save(path)
+        paths.append(path)
+
+    return paths
+
+
+def test_prefetched_loading_matches_serial(extractor, image_paths):
+    """Thread pool ile yükleme, sırayı bozmadan seri yüklemeyle aynı sonucu verir."""
+    serial = extractor.extract_image_features(image_paths, batch_size=4, num_workers=0)
+    prefetched = extractor.extract_image_features(
+        image_paths, batch_size=4, num_workers=3, prefetch_batches=2
+    )
+
+    assert serial.shape == (len(image_paths), 3)
+    np.testing.assert_allclose(prefetched, serial)
+
+
+def test_unreadable_images_are_skipped(extractor, image_paths, tmp_path):
+    """Açılamayan görseller atlanır, kalanların feature'ları çıkarılır."""
+    broken = tmp_path / "broken.jpg"
+    broken.write_bytes(b"not an image")
+
+    features = extractor.extract_image_features(
+        [broken, *image_paths[:3]], batch_size=2, num_workers=2
+    )
+
+    assert features.shape == (3, 3)
+
+    with pytest.raises(ValueError):
+        extractor.extract_image_features([broken], num_workers=2)
+
+
+def test_reindexing_frames_skips_the_model(extractor):
+    """Daha önce encode edilen frame'lerin embedding'leri depodan okunur."""
+    rng = np.random.default_rng(1)
+    frames = [rng.integers(0, 256, (40, 40, 3), dtype=np.uint8) for _ in range(10)]
+    encoder = extractor._towers["image"][1]
+
+    first = extractor.extract_array_features(frames[:6], batch_size=4)
+    assert encoder.encoded == 6
+
+    # Yeni bir instance diskteki depoyu kullanır; sadece yeni frame'ler encode edilir
+    reopened = FeatureExtractor(model_name="mean-pixel")
+    reopened._towers["image"] = extractor._towers["image"]
+    second = reopened.extract_array_features(frames, batch_size=4)
+    reopened.text_batcher.close()
+
+    assert encoder.encoded == 10
+    np.testing.assert_array_equal(second[:6], first)
+
+
+def test_frame_store_is_separated_per_backend(frame_embedding_dir, monkeypatch):
+    """Farklı backend ve quantization ayarlarının embedding'leri karışmaz."""
+    directories = []
+    for backend, quantize in [("torch", False), ("onnx", False), ("onnx", True)]:
+        monkeypatch.setattr(type(settings), "ONNX_QUANTIZE", quantize)
+        extractor = FeatureExtractor(model_name="org/clip", backend=backend)
+        directories.append(extractor.frame_store.directory.name)
+        extractor.text_batcher.close()
+
+    assert directories == ["org--clip", "org--clip@onnx", "org--clip@onnx-int8"]
+
+
+def test_stored_image_features_are_reused(extractor, image_paths):
+    """Aynı içerikteki görsel dosyaları tekrar açılmadan depodan okunur."""
+    encoder = extractor._towers["image"][1]
+
+    first = extractor.extract_image_features(image_paths[:5], batch_size=2)
+    second = extractor.extract_image_features(image_paths[:8], batch_size=2)
+
+    assert encoder.encoded == 8
+    np.testing.assert_array_equal(second[:5], first)
+
+
+def test_repeated_queries_skip_the_model(extractor):
+    """Cache'teki sorgular için text tower çalıştırılmaz."""
+    encoded = []
+
+    class CountingEncoder:
+        def encode(self, inputs):
+            encoded.append(inputs["text"])
+            return np.array([[3.0, 4.0]] * len(inputs["text"]))
+
+    extractor._towers["text"] = (passthrough_tokenizer, CountingEncoder())
+
+    first = extractor.extract_query_features("a red car")
+    second = extractor.extract_query_features("A red  car")
+
+    assert encoded == [["a red car"]]
+    np.testing.assert_allclose(second, first)
+    np.testing.assert_allclose(first, [0.6, 0.8])
+
+
+def test_query_batch_is_encoded_in_one_call(extractor):
+    """Cache'te olmayan sorgular tek bir text tower çağrısında encode edilir."""
+    encoded = []
+
+    class CountingEncoder:
+        def encode(self, inputs):
+            encoded.append(inputs["text"])
+            return np.array([[float(len(text)), 1.0] for text in inputs["text"]])
+
+    extractor._towers["text"] = (passthrough_tokenizer, CountingEncoder())
+
+    cached = extractor.extract_query_features("a cat")
+    features = extractor.extract_query_features_batch(
+        ["a dog", "a cat", "A  dog", "a red car"]
+    )
+
+    assert encoded == [["a cat"], ["a dog", "a red car"]]
+    assert features.shape == (4, 2)
+    np.testing.assert_allclose(features[1], cached)
+    np.testing.assert_allclose(features[2], features[0])
+    np.testing.assert_allclose(np.linalg.norm(features, axis=1), 1.0, rtol=1e-6)
+
+
+def test_towers_are_loaded_on_demand(tiny_clip_dir):
+    """Arama sadece text tower'ını, frame embedding'i sadece image tower'ını yükler."""
+    extractor = FeatureExtractor(model_name=tiny_clip_dir, device="cpu")
+    assert extractor.loaded_towers == []
+
+    extractor.extract_query_features("a cat")
+    assert extractor.loaded_towers == ["text"]
+
+    extractor.extract_array_features([np.zeros((48, 64, 3), dtype=np.uint8)])
+    assert extractor.loaded_towers == ["image", "text"]
+
+    extractor.text_batcher.close()
+
+
+def test_split_towers_match_full_model(tiny_clip, tiny_clip_dir, monkeypatch):
+    """Ayrı yüklenen tower'lar tam CLIPModel ile aynı embedding'leri üretir."""
+    # Depo embedding'leri float16 saklar; karşılaştırma model çıktısıyla yapılır
+    monkeypatch.setattr(type(settings), "FRAME_EMBEDDING_STORE", False)
+    extractor = FeatureExtractor(model_name=tiny_clip_dir, device="cpu")
+    model = CLIPModel.from_pretrained(tiny_clip_dir).eval()
+    tokenizer = CLIPTokenizerFast.from_pretrained(tiny_clip_dir)
+    image_processor = CLIPImageProcessor.from_pretrained(tiny_clip_dir)
+
+    texts = ["a cat", "two dogs on grass"]
+    images = [np.full((40, 40, 3), value, dtype=np.uint8) for value in (0, 90, 200)]
+
+    with torch.no_grad():
+        expected_text = model.get_text_features(
+            **tokenizer(texts, return_tensors="pt", padding=True)
+        )
+        expected_image = model.get_image_features(
+            **image_processor(images=images, return_tensors="pt")
+        )
+
+    np.testing.assert_allclose(
+        extractor.extract_text_features(texts),
+        getattr(expected_text, "pooler_output", expected_text).numpy(),
+        atol=1e-5,
+    )
+    np.testing.assert_allclose(
+        extractor.extract_array_features(images, num_workers=0),
+        getattr(expected_image, "pooler_output", expected_image).numpy(),
+        atol=1e-5,
+    )
+
+    extractor.text_batcher.close()
+
+
+def test_warm_up_loads_requested_towers(tiny_clip_dir):
+    extractor = FeatureExtractor(model_name=tiny_clip_dir, device="cpu")
+
+    extractor.warm_up(["text"])
+
+    assert extractor.loaded_towers == ["text"]
+    extractor.text_batcher.close()
+
+
+def test_import_does_not_load_torch():
+    """Modülün import edilmesi torch ve transformers'ı yüklemez."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, core.feature_extractor; "
+            "print('torch' in sys.modules, 'transformers' in sys.modules)",
+        ],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split() == ["False", "False"]
@@ -0,0 +1,72 @@
+"""
+FrameMetadataStore testleri.
+"""
+
+import numpy as np
+import pytest
+
+from config.settings import settings
+from core.frame_metadata_store import FrameMetadataStore
+from core.video_processor import FrameMetadata
+
+
+def make_frame(video_id, frame_index, end_time=None):
+    """Extractor'ın ürettiği biçimde frame metadata'sı üretir."""
+    frame_id = f"{video_id}_frame_{frame_index:06d}"
+    return FrameMetadata(
+        frame_id=frame_id,
+        video_id=video_id,
+        frame_path=str(settings.FRAME_EXTRACTION_DIR / video_id / f"{frame_id}.jpg"),
+        timestamp=frame_index * 0.5,
+        frame_number=frame_index * 15,
+        end_time=end_time,
+    )
+
+
+def test_frames_round_trip_through_memory_mapped_columns(tmp_path):
+    frames = [make_frame("video1", i) for i in range(3)]
+    frames.append(make_frame("video2", 7, end_time=12.5))
+
+    store = FrameMetadataStore()
+    store.append(frames)
+    store.save(tmp_path / "frames")
+
+    loaded = FrameMetadataStore.load(tmp_path / "frames")
+
+    assert len(loaded) == 4
+    assert isinstance(loaded.column("timestamp"), np.memmap)
+    assert [loaded.get(i) for i in range(4)] == frames
+    assert loaded.video_id(3) == "video2"
+
+
+def test_missing_rows_have_no_metadata(tmp_path):
+    store = FrameMetadataStore()
+    store.append([make_frame("video1", 0), None])
+    store.save(tmp_path / "frames")
+
+    loaded = FrameMetadataStore.load(tmp_path / "frames")
+
+    assert loaded.get(1) is None
+    assert loaded.video_id(1) is None
+
+
+def test_unsaved_rows_are_kept_until_truncated(tmp_path):
+    store = FrameMetadataStore()
+    store.append([make_frame("video1", i) for i in range(2)])
+    store.save(tmp_path / "frames")
+
+    store.append([make_frame("video2", 0)])
+    assert len(store) == 3
+    assert store.get(2).frame_id == "video2_frame_000000"
+
+    store.truncate(2)
+    assert len(store) == 2
+    assert list(store.column("frame_index")) == [0, 1]
+
+
+def test_frame_ids_must_be_derivable():
+    frame = make_frame("video1", 0)
+    frame.frame_id = "custom"
+
+    with pytest.raises(ValueError):
+        FrameMetadataStore().append([frame])
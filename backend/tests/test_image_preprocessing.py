@@ -0,0 +1,65 @@
+"""
+BatchImagePreprocessor testleri.
+"""
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+from transformers import CLIPImageProcessor
+
+from core.image_preprocessing import BatchImagePreprocessor
+
+
+def smooth_frame(height, width, seed=0):
+    """Düşük frekanslı, doğal görüntüye benzeyen RGB frame."""
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 256, size=(height // 8 + 1, width // 8 + 1, 3))
+    return cv2.resize(
+        coarse.astype(np.uint8), (width, height), interpolation=cv2.INTER_CUBIC
+    )
+
+
+@pytest.fixture(scope="module")
+def processor():
+    return CLIPImageProcessor()
+
+
+@pytest.mark.parametrize(
+    "height, width", [(720, 1280), (1280, 720), (480, 640), (360, 360), (224, 300)]
+)
+def test_matches_clip_processor(processor, height, width):
+    """Vektörize yol processor çıktısıyla tolerans dahilinde örtüşür."""
+    frames = [smooth_frame(height, width, seed) for seed in range(3)]
+
+    expected = processor(images=frames, return_tensors="pt")["pixel_values"]
+    actual = BatchImagePreprocessor(processor)(frames)["pixel_values"]
+
+    assert actual.shape == expected.shape
+    # Fark yuvarlamadan kaynaklı en fazla bir uint8 seviyesi (~0.015)
+    assert (actual - expected).abs().max() < 0.02
+    assert (actual - expected).abs().mean() < 0.001
+
+
+def test_mixed_sizes_keep_input_order(processor):
+    frames = [smooth_frame(480, 640, 0), smooth_frame(720, 1280, 1)]
+    frames.insert(1, smooth_frame(480, 640, 2))
+
+    batched = BatchImagePreprocessor(processor)(frames)["pixel_values"]
+    single = [
+        BatchImagePreprocessor(processor)([frame])["pixel_values"] for frame in frames
+    ]
+
+    for i, expected in enumerate(single):
+        np.testing.assert_allclose(batched[i], expected[0])
+
+
+def test_pil_images_use_processor(processor):
+    """Vektörize yol sadece uint8 dizilere uygulanır, PIL görselleri processor'a gider."""
+    preprocessor = BatchImagePreprocessor(processor)
+    images = [Image.fromarray(smooth_frame(240, 320)), smooth_frame(240, 320, 1)]
+
+    np.testing.assert_allclose(
+        preprocessor(images, return_tensors="pt")["pixel_values"],
+        processor(images=images, return_tensors="pt")["pixel_values"],
+    )
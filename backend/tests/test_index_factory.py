@@ -0,0 +1,124 @@
+"""
+index_factory testleri.
+"""
+
+import faiss
+import numpy as np
+import pytest
+
+from config.settings import settings
+from core import index_factory
+
+EMBEDDING_DIM = 16
+
+
+def random_vectors(count, seed=0):
+    """L2 normalize edilmiş rastgele vektörler üretir."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, EMBEDDING_DIM)).astype("float32")
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+@pytest.fixture(autouse=True)
+def small_ann_threshold(monkeypatch):
+    monkeypatch.setattr(type(settings), "ANN_MIN_VECTORS", 1000)
+
+
+def test_auto_switches_to_ann_above_threshold(monkeypatch):
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "auto")
+    monkeypatch.setattr(type(settings), "ANN_INDEX_TYPE", "ivf_flat")
+
+    assert index_factory.choose_index_type(999) == "flat"
+    assert index_factory.choose_index_type(1000) == "ivf_flat"
+
+
+def test_ann_index_is_kept_until_corpus_shrinks_well_below_threshold(monkeypatch):
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "auto")
+    monkeypatch.setattr(type(settings), "ANN_INDEX_TYPE", "hnsw")
+    monkeypatch.setattr(type(settings), "ANN_DOWNGRADE_RATIO", 0.5)
+
+    assert index_factory.choose_index_type(999, current_type="flat") == "flat"
+    assert index_factory.choose_index_type(999, current_type="hnsw") == "hnsw"
+    assert index_factory.choose_index_type(500, current_type="hnsw") == "hnsw"
+    assert index_factory.choose_index_type(499, current_type="hnsw") == "flat"
+    # Yapılandırma değiştiyse eski ANN tipi korunmaz
+    assert index_factory.choose_index_type(999, current_type="ivf_flat") == "flat"
+
+
+def test_trained_types_wait_for_enough_vectors():
+    assert index_factory.choose_index_type(10, "ivf_pq") == "flat"
+    assert index_factory.choose_index_type(10, "hnsw") == "hnsw"
+
+    with pytest.raises(ValueError):
+        index_factory.choose_index_type(10, "lsh")
+
+
+@pytest.mark.parametrize(
+    "index_type", ["ivf_flat", "ivf_pq", "hnsw", "fp16", "sq8", "pq"]
+)
+def test_ann_indexes_find_nearest_neighbours(index_type, monkeypatch):
+    """ANN index'leri sorgulanan vektörün kendisini ilk sonuçlar arasında bulur."""
+    # Küçük test corpus'unda PQ merkez sayısı düşük kalır; alt quantizer sayısı artırılır
+    monkeypatch.setattr(type(settings), "IVF_PQ_M", 8)
+    vectors = random_vectors(1200)
+    queries = vectors[:50]
+
+    index = index_factory.build_index(vectors, index_type)
+    assert index_factory.get_index_type(index) == index_type
+    assert index.ntotal == len(vectors)
+
+    params = index_factory.search_parameters(index, 10, nprobe=8, ef_search=64)
+    _, found = index.search(queries, 10, params=params)
+
+    recall = np.mean([i in row for i, row in enumerate(found)])
+    assert recall > 0.9
+
+
+def test_compressed_types_are_lossy():
+    vectors = random_vectors(1200)
+
+    assert not index_factory.is_lossy(index_factory.build_index(vectors, "flat"))
+    assert not index_factory.is_lossy(index_factory.build_index(vectors, "hnsw"))
+    assert index_factory.is_lossy(index_factory.build_index(vectors, "sq8"))
+    assert index_factory.is_lossy(index_factory.build_index(vectors, "fp16"))
+
+
+def test_search_parameters_match_index_type():
+    vectors = random_vectors(2000)
+
+    ivf = index_factory.build_index(vectors, "ivf_flat")
+    assert index_factory.search_parameters(ivf, 10, nprobe=4).nprobe == 4
+
+    hnsw = index_factory.build_index(vectors, "hnsw")
+    assert index_factory.search_parameters(hnsw, 100, ef_search=16).efSearch == 100
+
+    flat = index_factory.build_index(vectors, "flat")
+    assert index_factory.search_parameters(flat, 10) is None
+
+
+def test_reconstruct_vectors_by_id_from_ivf_index():
+    vectors = random_vectors(2000)
+    ids = np.arange(2000) + 5000
+    index = index_factory.build_index(vectors, "ivf_flat", ids=ids)
+
+    np.testing.assert_allclose(
+        index_factory.reconstruct_ids(index, ids[[3, 1500]]), vectors[[3, 1500]]
+    )
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "ivf_pq", "sq8", "pq"])
+def test_removed_ids_are_not_returned(index_type, monkeypatch):
+    """remove_ids sonrası kalan vektörler kendi id'leriyle bulunmaya devam eder."""
+    monkeypatch.setattr(type(settings), "IVF_PQ_M", 8)
+    vectors = random_vectors(1200)
+    index = index_factory.build_index(vectors, index_type)
+
+    assert index_factory.supports_removal(index)
+    assert index_factory.remove_range(index, 0, 600) == 600
+
+    params = index_factory.search_parameters(index, 10, nprobe=8)
+    _, found = index.search(vectors[600:650], 10, params=params)
+
+    assert found.min() >= 600
+    assert np.mean([600 + i in row for i, row in enumerate(found)]) > 0.9
@@ -0,0 +1,64 @@
+"""
+IndexStore testleri.
+"""
+
+import numpy as np
+import pytest
+
+from core.frame_metadata_store import FrameMetadataStore
+from core.index_store import IndexStore
+
+
+def write_snapshot(store, merged_shards=(), merged_removals=0):
+    """Boş içerikli bir snapshot yazar."""
+    return store.write_snapshot(
+        index_data=np.zeros(4, dtype="uint8"),
+        metadata={"next_id": 0},
+        frames=FrameMetadataStore(),
+        merged_shards=list(merged_shards),
+        merged_removals=merged_removals,
+    )
+
+
+def test_shard_requires_snapshot(tmp_path):
+    store = IndexStore(tmp_path / "store")
+
+    with pytest.raises(RuntimeError):
+        store.write_shard(np.zeros((1, 4)), {})
+
+
+def test_snapshot_keeps_shards_and_removals_it_did_not_merge(tmp_path):
+    store = IndexStore(tmp_path / "store")
+    write_snapshot(store)
+    first = store.write_shard(np.ones((2, 4)), {"start_id": 0})
+    store.add_removal("video1", 2)
+    second = store.write_shard(np.ones((1, 4)), {"start_id": 2})
+    store.add_removal("video2", 3)
+
+    write_snapshot(store, merged_shards=[first], merged_removals=1)
+
+    assert store.shards == [second]
+    assert store.removed == [("video2", 3)]
+    assert not first.exists()
+
+    vectors, metadata = IndexStore.read_shard(second)
+    assert vectors.shape == (1, 4)
+    assert metadata == {"start_id": 2}
+
+
+def test_interrupted_writes_are_ignored_on_open(tmp_path):
+    """Manifest'e girmemiş dizinler açılışta silinir."""
+    store = IndexStore(tmp_path / "store")
+    snapshot = write_snapshot(store)
+    (store.directory / ".tmp_shard_000002").mkdir()
+    (store.directory / "shard_000003").mkdir()
+
+    reopened = IndexStore(store.directory)
+
+    assert reopened.snapshot == snapshot
+    assert reopened.shards == []
+    assert sorted(p.name for p in store.directory.iterdir()) == [
+        "manifest.json",
+        snapshot.name,
+    ]
+    assert reopened.write_shard(np.ones((1, 4)), {}).name == "shard_000002"
@@ -0,0 +1,76 @@
+"""
+Inference backend testleri.
+
+İndirme gerektirmemesi için rastgele ağırlıklı küçük bir CLIPModel kullanılır.
+"""
+
+import pytest
+import torch
+
+from core.inference_backends import (
+    OnnxEncoder,
+    TorchEncoder,
+    compare_encoders,
+    create_encoder,
+)
+
+pytest.importorskip("onnxruntime")
+
+
+@pytest.fixture
+def inputs():
+    """Tower başına farklı batch ve sequence boyutlarında girdiler."""
+    generator = torch.Generator().manual_seed(1)
+    image_inputs = {"pixel_values": torch.randn(5, 3, 32, 32, generator=generator)}
+
+    input_ids = torch.randint(2, 64, (3, 11), generator=generator)
+    input_ids[:, 0] = 0
+    input_ids[:, -1] = 1
+    attention_mask = torch.ones_like(input_ids)
+
+    # İlk metin kısa: eos'tan sonrası padding
+    input_ids[0, 6:] = 1
+    attention_mask[0, 7:] = 0
+
+    text_inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+    return {"image": image_inputs, "text": text_inputs}
+
+
+@pytest.mark.parametrize("tower", ["image", "text"])
+@pytest.mark.parametrize("quantize, min_cosine", [(False, 0.9999), (True, 0.95)])
+def test_onnx_encoder_matches_torch(
+    tiny_clip, inputs, tmp_path, tower, quantize, min_cosine
+):
+    """ONNX encoder'ı torch encoder'ı ile aynı yönde embedding'ler üretir."""
+    onnx_encoder = OnnxEncoder(
+        lambda: tiny_clip, tower, "tiny/clip", quantize=quantize, model_dir=tmp_path
+    )
+
+    cosine = compare_encoders(
+        TorchEncoder(tiny_clip, tower, "cpu"), onnx_encoder, inputs[tower]
+    )
+
+    assert cosine > min_cosine
+
+
+def test_onnx_export_is_reused(tiny_clip, tmp_path):
+    """Export edilen model sonraki başlatmalarda torch modeli yüklenmeden kullanılır."""
+    OnnxEncoder(lambda: tiny_clip, "image", "tiny/clip", model_dir=tmp_path)
+    image_path = tmp_path / "tiny--clip" / "image.onnx"
+    modified = image_path.stat().st_mtime_ns
+
+    def fail_to_load():
+        raise AssertionError("model should not be loaded")
+
+    OnnxEncoder(fail_to_load, "image", "tiny/clip", model_dir=tmp_path)
+
+    assert image_path.stat().st_mtime_ns == modified
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_unknown_backend_raises(tiny_clip):
+    with pytest.raises(ValueError):
+        create_encoder("tensorrt", "image", lambda: tiny_clip, "tiny/clip", "cpu")
+
+    encoder = create_encoder("torch", "text", lambda: tiny_clip, "tiny/clip", "cpu")
+    assert isinstance(encoder, TorchEncoder)
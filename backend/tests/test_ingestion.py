@@ -0,0 +1,157 @@
+"""
+IngestionPipeline testleri.
+
+Gerçek CLIP modeli yerine frame piksellerinden vektör üreten basit bir
+extractor kullanır.
+"""
+
+import shutil
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pytest
+
+from benchmarks.video_utils import generate_test_video
+from config.settings import settings
+from core.ingestion import IngestionPipeline
+from core.search_engine import SearchEngine
+from core.video_processor import VideoProcessor
+
+
+class MeanColorExtractor:
+    """Her frame için ortalama renk ve parlaklıktan vektör üretir."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def extract_array_features(self, images, batch_size=32):
+        self.batch_sizes.append(len(images))
+        return np.array(
+            [
+                [*image.reshape(-1, 3).mean(axis=0), image.std(), 1.0]
+                for image in images
+            ],
+            dtype="float32",
+        )
+
+
+@pytest.fixture
+def ingestion_dirs(tmp_path, monkeypatch):
+    """Upload ve frame dizinlerini geçici dizine yönlendirir."""
+    monkeypatch.setattr(type(settings), "UPLOAD_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(
+        type(settings), "PENDING_UPLOAD_DIR", tmp_path / "uploads" / "pending"
+    )
+    monkeypatch.setattr(type(settings), "FRAME_EXTRACTION_DIR", tmp_path / "frames")
+    settings.create_directories()
+    return tmp_path
+
+
+def test_pipeline_streams_frames_into_index(ingestion_dirs):
+    """Pipeline frame'leri batch'ler halinde embed edip index'e eklemelidir."""
+    video_path = generate_test_video(
+        ingestion_dirs / "source.mp4", duration=10.0, fps=10.0, width=160, height=120
+    )
+    upload_path = ingestion_dirs / "upload.mp4"
+    shutil.copy(video_path, upload_path)
+
+    extractor = MeanColorExtractor()
+    search_engine = SearchEngine(
+        index_path=str(ingestion_dirs / "index"),
+        metadata_path=str(ingestion_dirs / "metadata"),
+    )
+    pipeline = IngestionPipeline(
+        VideoProcessor(), extractor, search_engine, batch_size=4, queue_size=2
+    )
+
+    updates = []
+    video_id, frame_metadata_list, video_metadata = pipeline.run(
+        upload_path,
+        "upload.mp4",
+        video_id="video1",
+        progress=lambda **fields: updates.append(fields),
+    )
+
+    assert video_id == video_metadata.video_id == "video1"
+    assert [u.get("frames_processed") for u in updates] == [4, 8, 10, None]
+    assert [u["stage"] for u in updates][-1] == "indexing"
+    assert [round(u["percent"]) for u in updates] == [40, 80, 100, 100]
+    assert [fm.frame_number for fm in frame_metadata_list] == list(range(0, 100, 10))
+    assert extractor.batch_sizes == [4, 4, 2]
+    assert search_engine.index.ntotal == len(frame_metadata_list)
+    assert all(Path(fm.frame_path).exists() for fm in frame_metadata_list)
+
+
+def test_long_video_is_searchable_while_being_indexed(ingestion_dirs):
+    """Frame'ler parça parça eklenir; video işlenirken eklenen kısmı aranabilir."""
+    video_path = generate_test_video(
+        ingestion_dirs / "source.mp4", duration=10.0, fps=10.0, width=160, height=120
+    )
+    search_engine = SearchEngine(
+        index_path=str(ingestion_dirs / "index"),
+        metadata_path=str(ingestion_dirs / "metadata"),
+    )
+    pipeline = IngestionPipeline(
+        VideoProcessor(),
+        MeanColorExtractor(),
+        search_engine,
+        batch_size=4,
+        queue_size=2,
+        commit_frames=4,
+    )
+
+    snapshots = []
+
+    def progress(**fields):
+        video = search_engine.get_video_metadata("video1")
+        snapshots.append(
+            (search_engine.view.frame_count, video.indexed_until if video else None)
+        )
+        assert video is None or not video.fully_indexed
+
+    _, _, video_metadata = pipeline.run(
+        video_path, "source.mp4", video_id="video1", progress=progress
+    )
+
+    assert [count for count, _ in snapshots] == [0, 4, 8, 8]
+    watermarks = [until for _, until in snapshots[1:]]
+    assert 0 < watermarks[0] < watermarks[1] < video_metadata.duration
+    assert search_engine.view.frame_count == 10
+    assert search_engine.video_id_ranges == {"video1": [(0, 10)]}
+    assert video_metadata.indexed_until == video_metadata.duration
+    assert search_engine.get_video_metadata("video1").fully_indexed
+
+
+def test_chunk_commits_do_not_copy_the_index(ingestion_dirs, monkeypatch):
+    """Parçalar mevcut index kopyalanmadan delta'ya eklenir."""
+    video_path = generate_test_video(
+        ingestion_dirs / "source.mp4", duration=10.0, fps=10.0, width=160, height=120
+    )
+    search_engine = SearchEngine(
+        index_path=str(ingestion_dirs / "index"),
+        metadata_path=str(ingestion_dirs / "metadata"),
+    )
+    pipeline = IngestionPipeline(
+        VideoProcessor(),
+        MeanColorExtractor(),
+        search_engine,
+        batch_size=2,
+        queue_size=2,
+        commit_frames=2,
+    )
+    shutil.copy(video_path, ingestion_dirs / "upload.mp4")
+    pipeline.run(ingestion_dirs / "upload.mp4", "upload.mp4", video_id="video1")
+    search_engine.save_index()
+
+    clones = []
+    clone_index = faiss.clone_index
+    monkeypatch.setattr(
+        faiss, "clone_index", lambda index: clones.append(index) or clone_index(index)
+    )
+
+    pipeline.run(video_path, "source.mp4", video_id="video2")
+
+    assert clones == []
+    assert search_engine.view.frame_count == 20
+    assert search_engine.video_id_ranges["video2"] == [(10, 20)]
@@ -0,0 +1,122 @@
+"""
+JobQueue testleri.
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.job_queue import COMPLETED, FAILED, QUEUED, RUNNING, JobQueue
+
+
+def wait_for(queue, job_id, timeout=5.0):
+    """İş bitene kadar bekler ve son durumunu döndürür."""
+    for _ in range(int(timeout / 0.01)):
+        job = queue.get(job_id)
+        if job.done:
+            return job
+        time.sleep(0.01)
+    pytest.fail(f"Job {job_id} did not finish")
+
+
+def test_jobs_run_in_background_and_report_progress(tmp_path):
+    def handler(job, progress):
+        progress(stage="extracting", frames_processed=10, percent=50.0)
+        assert queue.get(job.job_id).stage == "extracting"
+
+    queue = JobQueue(str(tmp_path / "jobs.db"), handler)
+    job, queued = queue.submit(
+        "video1", "/tmp/a.mp4", "a.mp4", "hash1", {"strategy": "fixed"}
+    )
+    assert queued
+    assert queue.get(job.job_id).status == QUEUED
+
+    queue.start()
+    finished = wait_for(queue, job.job_id)
+    queue.close()
+
+    assert finished.status == COMPLETED
+    assert finished.percent == 100.0
+    assert finished.frames_processed == 10
+    assert finished.options == {"strategy": "fixed"}
+    assert finished.frames_per_second > 0
+
+
+def test_failed_job_keeps_error(tmp_path):
+    def handler(job, progress):
+        raise ValueError("No frames could be extracted from the video")
+
+    queue = JobQueue(str(tmp_path / "jobs.db"), handler)
+    queue.start()
+    job, _ = queue.submit("video1", "/tmp/a.mp4", "a.mp4", "hash1")
+    finished = wait_for(queue, job.job_id)
+
+    assert finished.status == FAILED
+    assert finished.error == "No frames could be extracted from the video"
+
+    # Başarısız iş aynı içeriğin tekrar upload edilmesini engellemez
+    retry, queued = queue.submit("video2", "/tmp/a.mp4", "a.mp4", "hash1")
+    assert queued and retry.job_id != job.job_id
+    wait_for(queue, retry.job_id)
+    queue.close()
+
+
+def test_interrupted_jobs_are_resumed_after_restart(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_handler(job, progress):
+        started.set()
+        release.wait()
+
+    queue = JobQueue(db_path, blocking_handler)
+    queue.start()
+    job, _ = queue.submit("video1", "/tmp/a.mp4", "a.mp4")
+    assert started.wait(1)
+    assert queue.get(job.job_id).status == RUNNING
+
+    # Çalışan iş bitmeden açılan kuyruk (yeniden başlatılan uygulama) işi tekrar alır
+    runs = []
+    resumed = JobQueue(db_path, lambda job, progress: runs.append(job.video_id))
+    assert resumed.get(job.job_id).status == QUEUED
+    resumed.start()
+    assert wait_for(resumed, job.job_id).status == COMPLETED
+    assert runs == ["video1"]
+
+    release.set()
+    queue.close()
+    resumed.close()
+
+
+def test_concurrent_uploads_of_same_content_create_one_job(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    # İki kuyruk aynı veritabanını kullanan iki process gibi davranır
+    queues = [JobQueue(db_path, lambda job, progress: None) for _ in range(2)]
+    barrier = threading.Barrier(8)
+    results = []
+
+    def upload(i):
+        barrier.wait()
+        results.append(
+            queues[i % 2].submit(f"video{i}", f"/tmp/{i}.mp4", "a.mp4", "hash1")
+        )
+
+    threads = [threading.Thread(target=upload, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    created = [job for job, queued in results if queued]
+    assert len(created) == 1
+    assert {job.job_id for job, _ in results} == {created[0].job_id}
+
+    queues[0].start()
+    assert wait_for(queues[0], created[0].job_id).status == COMPLETED
+    job, queued = queues[1].submit("video9", "/tmp/9.mp4", "a.mp4", "hash1")
+    assert queued and job.video_id == "video9"
+
+    for queue in queues:
+        queue.close()
@@ -0,0 +1,221 @@
+"""
+API endpoint testleri.
+
+Servisler geçici dizinlerde kurulur; gerçek CLIP ağırlıkları yerine
+rastgele ağırlıklı küçük CLIP modeli kullanılır.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import routes
+from benchmarks.video_utils import generate_test_video
+from config.settings import settings
+from core.bounded_executor import BoundedExecutor
+from core.feature_extractor import FeatureExtractor
+from core.ingestion import IngestionPipeline
+from core.job_queue import COMPLETED, FAILED, JobQueue
+from core.search_engine import SearchEngine
+from core.segment_merger import SegmentMerger
+from core.video_processor import VideoProcessor
+
+
+@pytest.fixture
+def services(tmp_path, tiny_clip_dir, monkeypatch):
+    """Endpoint'lerin kullandığı servisleri geçici dizinlerde kurar."""
+    monkeypatch.setattr(type(settings), "UPLOAD_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(
+        type(settings), "PENDING_UPLOAD_DIR", tmp_path / "uploads" / "pending"
+    )
+    monkeypatch.setattr(type(settings), "FRAME_EXTRACTION_DIR", tmp_path / "frames")
+    monkeypatch.setattr(type(settings), "TEXT_CACHE_PATH", None)
+    settings.create_directories()
+
+    feature_extractor = FeatureExtractor(model_name=tiny_clip_dir, device="cpu")
+    search_engine = SearchEngine(
+        index_path=str(tmp_path / "index"),
+        metadata_path=str(tmp_path / "metadata"),
+    )
+    video_processor = VideoProcessor()
+    search_executor = BoundedExecutor("search", max_workers=2, max_pending=4)
+    upload_executor = BoundedExecutor("upload", max_workers=1, max_pending=4)
+
+    # İşler, test start() çağırana kadar kuyrukta bekler
+    job_queue = JobQueue(str(tmp_path / "jobs.db"), routes._process_job)
+
+    monkeypatch.setattr(routes, "video_processor", video_processor)
+    monkeypatch.setattr(routes, "feature_extractor", feature_extractor)
+    monkeypatch.setattr(routes, "search_engine", search_engine)
+    monkeypatch.setattr(routes, "segment_merger", SegmentMerger())
+    monkeypatch.setattr(
+        routes,
+        "ingestion_pipeline",
+        IngestionPipeline(video_processor, feature_extractor, search_engine),
+    )
+    monkeypatch.setattr(routes, "search_executor", search_executor)
+    monkeypatch.setattr(routes, "upload_executor", upload_executor)
+    monkeypatch.setattr(routes, "job_queue", job_queue)
+
+    yield job_queue
+
+    job_queue.close()
+    search_executor.shutdown()
+    upload_executor.shutdown()
+    feature_extractor.text_batcher.close()
+
+
+@pytest.fixture
+def client(services):
+    """Router'ı /api altında sunan test istemcisi."""
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api")
+    return TestClient(app)
+
+
+@pytest.fixture
+def video_bytes(tmp_path):
+    """Kısa sentetik test videosunun içeriği."""
+    path = generate_test_video(
+        tmp_path / "source.mp4", duration=4.0, fps=10.0, width=160, height=120
+    )
+    return path.read_bytes()
+
+
+def upload(client, content, **form):
+    """Videoyu /api/upload endpoint'ine gönderir."""
+    return client.post(
+        "/api/upload",
+        files={"file": ("clip.mp4", content, "video/mp4")},
+        data=form,
+    )
+
+
+def wait_for_job(client, job_id, timeout=30.0):
+    """İş bitene kadar /api/jobs/{id} endpoint'ini sorgular."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get(f"/api/jobs/{job_id}").json()
+        if status["status"] in (COMPLETED, FAILED):
+            return status
+        time.sleep(0.05)
+    pytest.fail(f"Job {job_id} did not finish")
+
+
+def test_invalid_sampling_options_are_rejected(client, video_bytes):
+    """Geçersiz örnekleme stratejisi iş oluşturulmadan 400 döner."""
+    response = upload(client, video_bytes, sampling_strategy="every-other-frame")
+
+    assert response.status_code == 400
+    assert not list(settings.PENDING_UPLOAD_DIR.iterdir())
+
+
+def test_duplicate_upload_reuses_queued_job(client, services, video_bytes):
+    """Kuyruktaki videonun tekrar upload'u aynı işi döndürür."""
+    first = upload(client, video_bytes, sampling_strategy="fixed").json()
+    second = upload(client, video_bytes).json()
+
+    assert first["message"] == "Video queued for processing"
+    assert second["message"] == "Video is already being processed"
+    assert second["job_id"] == first["job_id"]
+    assert second["video_id"] == first["video_id"]
+    assert len(list(settings.PENDING_UPLOAD_DIR.iterdir())) == 1
+
+    services.start()
+    assert wait_for_job(client, first["job_id"])["status"] == COMPLETED
+
+    third = upload(client, video_bytes).json()
+
+    assert third["message"] == "Video already indexed"
+    assert third["video_id"] == first["video_id"]
+    assert third["job_id"] is None
+    assert third["video_info"]["indexed_until"] is None
+
+
+def test_job_status_and_missing_job(client, services, video_bytes):
+    """İş durumu sorgulanabilir; bilinmeyen iş 404 döner."""
+    uploaded = upload(client, video_bytes).json()
+
+    queued = client.get(f"/api/jobs/{uploaded['job_id']}")
+    assert queued.status_code == 200
+    assert queued.json()["status"] == "queued"
+    assert queued.json()["video_id"] == uploaded["video_id"]
+
+    services.start()
+    finished = wait_for_job(client, uploaded["job_id"])
+
+    assert finished["percent"] == 100.0
+    assert finished["frames_processed"] > 0
+    assert client.get("/api/jobs/missing").status_code == 404
+    assert client.get("/api/jobs/missing/events").status_code == 404
+
+
+def test_job_events_stream_until_done(client, services, video_bytes):
+    """Event akışı iş bitene kadar durum gönderir ve sonra kapanır."""
+    job_id = upload(client, video_bytes).json()["job_id"]
+    services.start()
+
+    with client.stream("GET", f"/api/jobs/{job_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            json.loads(line.removeprefix("data: "))
+            for line in response.iter_lines()
+            if line.startswith("data: ")
+        ]
+
+    assert {event["job_id"] for event in events} == {job_id}
+    assert events[-1]["status"] == COMPLETED
+    assert all(event["status"] != COMPLETED for event in events[:-1])
+
+
+@pytest.fixture
+def indexed_video(client, services, video_bytes):
+    """Upload edilip index'lenmiş videonun ID'si."""
+    uploaded = upload(client, video_bytes).json()
+    services.start()
+    assert wait_for_job(client, uploaded["job_id"])["status"] == COMPLETED
+    return uploaded["video_id"]
+
+
+def test_batch_search_matches_single_searches(client, indexed_video):
+    """Çoklu arama sorgu sırasıyla, her sorgu için /search sonucunu döndürür."""
+    queries = ["a red car", "sunset", "a red car", "cat"]
+    options = {"k": 5, "similarity_threshold": 0.0, "video_id": indexed_video}
+
+    response = client.post("/api/search/batch", json={"queries": queries, **options})
+
+    assert response.status_code == 200
+    batch = response.json()
+    assert batch["total_queries"] == len(queries)
+    assert [r["query"] for r in batch["responses"]] == queries
+    assert batch["responses"][2] == batch["responses"][0]
+
+    for query, result in zip(queries, batch["responses"]):
+        single = client.post("/api/search", json={"query": query, **options})
+        assert result == single.json()
+        assert {frame["video_id"] for frame in result["results"]} == {indexed_video}
+        assert result["segments"]
+        assert {s["video_id"] for s in result["segments"]} == {indexed_video}
+
+
+def test_batch_search_is_rejected_when_executor_is_saturated(
+    client, indexed_video, monkeypatch
+):
+    """Arama havuzu doluyken çoklu arama 503 ve Retry-After döner."""
+    executor = BoundedExecutor("search", max_workers=1, max_pending=0)
+    monkeypatch.setattr(routes, "search_executor", executor)
+    release = threading.Event()
+    executor.submit(release.wait)
+
+    try:
+        response = client.post("/api/search/batch", json={"queries": ["a red car"]})
+    finally:
+        release.set()
+        executor.shutdown()
+
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
@@ -0,0 +1,721 @@
+"""
+SearchEngine testleri.
+
+Gerçek CLIP embedding'leri yerine rastgele vektörler kullanır.
+"""
+
+import pickle
+import threading
+from dataclasses import replace
+from collections import Counter
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pytest
+
+from config.settings import settings
+from core.search_engine import SearchEngine
+from core.video_processor import FrameMetadata, VideoMetadata
+
+EMBEDDING_DIM = 16
+
+
+def make_video(video_id, frame_count, content_hash=None):
+    """Test için video ve frame metadata'sı üretir."""
+    video_metadata = VideoMetadata(
+        video_id=video_id,
+        original_filename=f"{video_id}.mp4",
+        video_path=f"/uploads/{video_id}.mp4",
+        duration=float(frame_count),
+        fps=1.0,
+        total_frames=frame_count,
+        width=64,
+        height=48,
+        content_hash=content_hash,
+    )
+    frame_metadata_list = [
+        FrameMetadata(
+            frame_id=f"{video_id}_frame_{i:06d}",
+            video_id=video_id,
+            frame_path=f"/frames/{video_id}/{video_id}_frame_{i:06d}.jpg",
+            timestamp=float(i),
+            frame_number=i,
+        )
+        for i in range(frame_count)
+    ]
+    return frame_metadata_list, video_metadata
+
+
+def random_features(count, seed=0):
+    """Rastgele feature vektörleri üretir."""
+    return (
+        np.random.default_rng(seed)
+        .normal(size=(count, EMBEDDING_DIM))
+        .astype("float32")
+    )
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Geçici dosya yollarıyla SearchEngine oluşturur."""
+    return SearchEngine(
+        index_path=str(tmp_path / "video_faiss.index"),
+        metadata_path=str(tmp_path / "video_metadata.npy"),
+    )
+
+
+def test_find_video_by_hash_survives_reload(engine):
+    """İçerik hash tablosu kaydedilip yüklendikten sonra da çalışmalıdır."""
+    frames, video = make_video("video1", 5, content_hash="abc123")
+    engine.build_index(random_features(5), frames, video)
+    engine.save_index()
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+
+    assert reloaded.find_video_by_hash("abc123").video_id == "video1"
+    assert reloaded.find_video_by_hash("unknown") is None
+
+    reloaded.remove_video("video1")
+    assert reloaded.find_video_by_hash("abc123") is None
+
+
+def test_index_switches_to_ann_as_corpus_grows(engine, monkeypatch):
+    """Corpus eşiği geçtiğinde index ANN tipine taşınır ve arama doğru kalır."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "auto")
+    monkeypatch.setattr(type(settings), "ANN_INDEX_TYPE", "hnsw")
+    monkeypatch.setattr(type(settings), "ANN_MIN_VECTORS", 500)
+
+    features = random_features(800)
+
+    frames, video = make_video("video1", 400)
+    engine.build_index(features[:400].copy(), frames, video)
+    assert engine.index_type == "flat"
+
+    frames, video = make_video("video2", 400)
+    engine.build_index(features[400:].copy(), frames, video)
+    assert engine.index_type == "hnsw"
+
+    results = engine.search(features[650], k=1, ef_search=32)
+    assert results[0]["frame_metadata"].frame_id == "video2_frame_000250"
+
+
+def test_ann_index_is_not_rebuilt_around_threshold(engine, monkeypatch):
+    """Eşiğin hemen altına inen corpus Flat'e dönüp tekrar ANN'e taşınmaz."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "auto")
+    monkeypatch.setattr(type(settings), "ANN_INDEX_TYPE", "hnsw")
+    monkeypatch.setattr(type(settings), "ANN_MIN_VECTORS", 500)
+    monkeypatch.setattr(type(settings), "INDEX_DELTA_MAX_VECTORS", 1)
+
+    features = random_features(700)
+    for i in range(6):
+        frames, video = make_video(f"video{i}", 100)
+        engine.build_index(features[i * 100 : (i + 1) * 100].copy(), frames, video)
+    assert engine.index_type == "hnsw"
+
+    engine.remove_video("video0")
+    engine.remove_video("video1")
+    frames, video = make_video("video6", 50)
+    engine.build_index(features[600:650].copy(), frames, video)
+    assert engine.frame_count == 450
+    assert engine.index_type == "hnsw"
+
+    for i in range(2, 5):
+        engine.remove_video(f"video{i}")
+    frames, video = make_video("video7", 50)
+    engine.build_index(features[650:].copy(), frames, video)
+    assert engine.frame_count == 200
+    assert engine.index_type == "flat"
+
+
+def test_loaded_index_is_migrated_to_configured_type(engine, monkeypatch):
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "flat")
+    frames, video = make_video("video1", 50)
+    engine.build_index(random_features(50), frames, video)
+    engine.save_index()
+
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "hnsw")
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+
+    assert reloaded.index_type == "hnsw"
+    assert reloaded.index.ntotal == 50
+
+
+def test_compressed_index_is_reranked_with_exact_vectors(engine, monkeypatch):
+    """PQ index adayları tam vektörlerle sıralanır; skorlar Flat ile aynıdır."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "pq")
+    monkeypatch.setattr(type(settings), "ANN_MIN_VECTORS", 500)
+    monkeypatch.setattr(type(settings), "RERANK_CANDIDATES", 10)
+
+    features = random_features(1000)
+    frames, video = make_video("video1", 1000)
+    engine.build_index(features.copy(), frames, video)
+    assert engine.index_type == "pq"
+
+    normalized = features / np.linalg.norm(features, axis=1, keepdims=True)
+    query = normalized[123]
+    expected = np.sort(normalized @ query)[::-1][:5]
+
+    results = engine.search(query, k=5, similarity_threshold=-1.0)
+
+    assert results[0]["frame_metadata"].frame_id == "video1_frame_000123"
+    np.testing.assert_allclose([r["score"] for r in results], expected, rtol=1e-5)
+
+
+def test_unsaved_vectors_are_dropped_on_reload(engine, monkeypatch):
+    """Kaydedilmemiş eklemeler vektör dosyasından atılır."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "flat")
+    frames, video = make_video("video1", 10)
+    engine.build_index(random_features(10), frames, video)
+    engine.save_index()
+
+    frames, video = make_video("video2", 5)
+    engine.build_index(random_features(5, seed=1), frames, video)
+    assert len(engine.vectors) == 15
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+    assert len(reloaded.vectors) == 10
+
+
+def test_missing_vectors_file_is_rebuilt_from_flat_index(engine, monkeypatch):
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "flat")
+    features = random_features(10)
+    frames, video = make_video("video1", 10)
+    engine.build_index(features.copy(), frames, video)
+    engine.save_index()
+    Path(engine.vectors_path).unlink()
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+
+    normalized = features / np.linalg.norm(features, axis=1, keepdims=True)
+    np.testing.assert_allclose(reloaded.vectors.read_all(), normalized, rtol=1e-6)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "sq8", "hnsw", "ivf_flat"])
+def test_video_filter_returns_top_k_within_video(engine, monkeypatch, index_type):
+    """Video filtresi büyük corpus içindeki kısa videoda tam olarak ilk k'yı döndürür."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", index_type)
+    monkeypatch.setattr(type(settings), "ANN_MIN_VECTORS", 500)
+
+    sizes = {"video1": 600, "short": 8, "video3": 600}
+    features = {
+        video_id: random_features(size, seed=i)
+        for i, (video_id, size) in enumerate(sizes.items())
+    }
+    for video_id, size in sizes.items():
+        frames, video = make_video(video_id, size)
+        engine.build_index(features[video_id].copy(), frames, video)
+
+    # Sorgu videonun dışındaki bir frame'e daha yakındır
+    query = features["video1"][0]
+    short = features["short"] / np.linalg.norm(features["short"], axis=1, keepdims=True)
+    expected = np.argsort(-(short @ (query / np.linalg.norm(query))))[:5]
+
+    results = engine.search(query, k=5, similarity_threshold=-1.0, video_id="short")
+
+    assert [r["frame_metadata"].frame_number for r in results] == list(expected)
+    assert {r["frame_metadata"].video_id for r in results} == {"short"}
+
+    results = engine.search(query, k=30, similarity_threshold=-1.0, video_id="short")
+    assert len(results) == 8
+
+
+@pytest.mark.parametrize("index_type", ["flat", "sq8"])
+def test_video_filter_scans_only_the_video(engine, monkeypatch, index_type):
+    """IDMap sarmalı index'lerde video araması FAISS id filtresi kullanmaz."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", index_type)
+    for i, video_id in enumerate(["video1", "video2"]):
+        frames, video = make_video(video_id, 20)
+        engine.build_index(random_features(20, seed=i), frames, video)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("video search must not scan the whole index")
+
+    monkeypatch.setattr(engine, "_search_index", fail)
+    monkeypatch.setattr(faiss, "IDSelectorRange", fail)
+    monkeypatch.setattr(faiss, "IDSelectorBatch", fail)
+
+    results = engine.search(
+        random_features(1, seed=5)[0], k=5, similarity_threshold=-1.0, video_id="video2"
+    )
+    assert len(results) == 5
+    assert {r["frame_metadata"].video_id for r in results} == {"video2"}
+
+
+def test_video_ranges_are_derived_for_old_metadata(engine):
+    """Aralık bilgisi olmayan metadata'da aralıklar frame sırasından çıkarılır."""
+    for video_id, size in [("video1", 4), ("video2", 3)]:
+        frames, video = make_video(video_id, size)
+        engine.build_index(random_features(size), frames, video)
+    engine.video_id_ranges = {}
+    engine.save_index()
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+
+    assert reloaded.video_id_ranges == {"video1": [(0, 4)], "video2": [(4, 7)]}
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_removed_video_is_excluded_and_index_stays_searchable(
+    engine, monkeypatch, index_type
+):
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", index_type)
+    monkeypatch.setattr(type(settings), "ANN_MIN_VECTORS", 500)
+    monkeypatch.setattr(type(settings), "HNSW_REBUILD_RATIO", 0.5)
+
+    features = random_features(1200)
+    for i, video_id in enumerate(["video1", "video2", "video3"]):
+        frames, video = make_video(video_id, 400)
+        engine.build_index(features[i * 400 : (i + 1) * 400].copy(), frames, video)
+
+    assert engine.remove_video("video2")
+    assert engine.index is not None
+    assert engine.frame_count == 800
+
+    # Silinen videonun frame'i sorgulandığında kendisi dönmez
+    results = engine.search(features[500], k=10, similarity_threshold=-1.0, nprobe=64)
+    assert len(results) == 10
+    assert "video2" not in {r["frame_metadata"].video_id for r in results}
+
+    # Diğer videoların id'leri değişmez
+    results = engine.search(features[900], k=1, nprobe=64)
+    assert results[0]["frame_metadata"].frame_id == "video3_frame_000100"
+
+
+def test_removal_survives_reload_without_save(engine):
+    for video_id, size in [("video1", 4), ("video2", 3)]:
+        frames, video = make_video(video_id, size, content_hash=video_id)
+        engine.build_index(random_features(size), frames, video)
+    engine.save_index()
+
+    engine.remove_video("video1")
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+
+    assert reloaded.get_video_metadata("video1") is None
+    assert reloaded.find_video_by_hash("video1") is None
+    assert reloaded.index.ntotal == reloaded.frame_count == 3
+
+
+def test_hnsw_is_rebuilt_when_too_many_vectors_are_removed(engine, monkeypatch):
+    """HNSW'de silinen id'ler filtrelenir; oran aşılınca graf yeniden kurulur."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "hnsw")
+    monkeypatch.setattr(type(settings), "HNSW_REBUILD_RATIO", 0.3)
+    # Videolar delta'da beklemeden ana index'e eklenir
+    monkeypatch.setattr(type(settings), "INDEX_DELTA_MAX_VECTORS", 1)
+
+    for i, video_id in enumerate(["video1", "video2", "video3", "video4"]):
+        frames, video = make_video(video_id, 25)
+        engine.build_index(random_features(25, seed=i), frames, video)
+
+    engine.remove_video("video1")
+    assert engine.index.ntotal == 100
+    assert engine.removed_ranges == [(0, 25)]
+
+    engine.remove_video("video2")
+    assert engine.index.ntotal == 50
+    assert engine.removed_ranges == []
+    assert engine.index_type == "hnsw"
+
+    query = random_features(25, seed=3)[7]
+    results = engine.search(query, k=1)
+    assert results[0]["frame_metadata"].frame_id == "video4_frame_000007"
+
+
+def test_legacy_position_keyed_index_is_loaded(engine):
+    """Id'siz index ve liste tabanlı metadata ile kaydedilmiş eski kurulumlar yüklenir."""
+    features = random_features(7)
+    faiss.normalize_L2(features)
+    index = faiss.IndexFlatIP(EMBEDDING_DIM)
+    index.add(features)
+    faiss.write_index(index, engine.index_path)
+
+    frames1, video1 = make_video("video1", 4)
+    frames2, video2 = make_video("video2", 3)
+    with open(engine.metadata_path, "wb") as f:
+        pickle.dump(
+            {
+                "frame_metadata_list": frames1 + frames2,
+                "video_metadata_dict": {"video1": video1, "video2": video2},
+            },
+            f,
+        )
+
+    assert engine.load_index()
+    assert engine.video_id_ranges == {"video1": [(0, 4)], "video2": [(4, 7)]}
+
+    assert engine.remove_video("video1")
+    results = engine.search(features[5], k=1)
+    assert results[0]["frame_metadata"].frame_id == "video2_frame_000001"
+
+
+def test_frame_metadata_is_stored_in_columns(engine):
+    """Frame'ler pickle yerine sütun dosyalarında saklanır ve aynı şekilde geri gelir."""
+    features = random_features(6)
+    frames, video = make_video("video1", 6)
+    engine.build_index(features.copy(), frames, video)
+    engine.save_index()
+
+    with open(engine.store.snapshot / "metadata.pkl", "rb") as f:
+        assert set(pickle.load(f)) == {
+            "video_metadata_dict",
+            "content_hash_index",
+            "video_id_ranges",
+            "next_id",
+            "removed_ranges",
+        }
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+
+    result = reloaded.search(features[4], k=1)[0]["frame_metadata"]
+    assert result.frame_id == "video1_frame_000004"
+    assert result.frame_number == 4
+    assert result.timestamp == 4.0
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_memory_mapped_index_is_copied_before_changes(engine, monkeypatch, index_type):
+    """Map'lenmiş index aranabilir; ekleme ve silme öncesi belleğe kopyalanır."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", index_type)
+    monkeypatch.setattr(type(settings), "ANN_MIN_VECTORS", 500)
+    monkeypatch.setattr(type(settings), "INDEX_MMAP", True)
+
+    features = random_features(700)
+    frames, video = make_video("video1", 600)
+    engine.build_index(features[:600].copy(), frames, video)
+    engine.save_index()
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+    assert reloaded._index_mapped
+
+    results = reloaded.search(features[10], k=1, nprobe=64)
+    assert results[0]["frame_metadata"].frame_id == "video1_frame_000010"
+
+    frames, video = make_video("video2", 100)
+    reloaded.build_index(features[600:].copy(), frames, video)
+    # Yeni frame'ler delta'da tutulur; map'lenmiş index'e dokunulmaz
+    assert reloaded._index_mapped
+
+    reloaded.remove_video("video1")
+    assert not reloaded._index_mapped
+    reloaded.save_index()
+
+    results = reloaded.search(features[650], k=1, nprobe=64)
+    assert results[0]["frame_metadata"].frame_id == "video2_frame_000050"
+
+
+def test_uploads_are_saved_as_shards_and_reloaded(engine, monkeypatch):
+    """İlk kayıttan sonra her kayıt snapshot'a dokunmadan yeni bir shard yazar."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "sq8")
+    features = random_features(12)
+    for i, video_id in enumerate(["video1", "video2", "video3"]):
+        frames, video = make_video(video_id, 4, content_hash=video_id)
+        engine.build_index(features[i * 4 : (i + 1) * 4].copy(), frames, video)
+        engine.save_index()
+
+    snapshot = engine.store.snapshot
+    assert [shard.name for shard in engine.store.shards] == [
+        "shard_000002",
+        "shard_000003",
+    ]
+
+    engine.remove_video("video2")
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+    assert reloaded.store.snapshot == snapshot
+    assert reloaded.video_id_ranges == {"video1": [(0, 4)], "video3": [(8, 12)]}
+    assert reloaded.find_video_by_hash("video3") == reloaded.get_video_metadata(
+        "video3"
+    )
+
+    # Shard'daki tam vektörler yeniden skorlama için korunur
+    normalized = features / np.linalg.norm(features, axis=1, keepdims=True)
+    np.testing.assert_allclose(reloaded.vectors.read_all(), normalized, rtol=1e-6)
+
+    results = reloaded.search(features[9], k=1)
+    assert results[0]["frame_metadata"].frame_id == "video3_frame_000001"
+    assert reloaded.index.ntotal == 8
+
+
+def test_shards_are_merged_by_background_compaction(engine, monkeypatch):
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "flat")
+    monkeypatch.setattr(type(settings), "COMPACTION_SHARDS", 2)
+    features = random_features(12)
+    for i, video_id in enumerate(["video1", "video2", "video3"]):
+        frames, video = make_video(video_id, 4)
+        engine.build_index(features[i * 4 : (i + 1) * 4].copy(), frames, video)
+        engine.save_index()
+    engine.wait_for_compaction()
+
+    assert engine.store.shards == []
+    assert sorted(p.name for p in engine.store.directory.iterdir()) == [
+        "manifest.json",
+        "snapshot_000004",
+    ]
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+    assert reloaded.frame_count == 12
+
+    results = reloaded.search(features[6], k=1)
+    assert results[0]["frame_metadata"].frame_id == "video2_frame_000002"
+
+
+def test_compaction_maps_frames_from_snapshot(engine, monkeypatch):
+    """Birleştirmeden sonra frame'ler bellekte değil snapshot'tan okunur."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "flat")
+    monkeypatch.setattr(type(settings), "COMPACTION_SHARDS", 1)
+    features = random_features(12)
+    frames, video = make_video("video1", 4)
+    engine.build_index(features[:4].copy(), frames, video)
+    engine.save_index()
+
+    # Snapshot yazılırken eklenen frame'ler yeni depoya aktarılmalıdır
+    started, release = threading.Event(), threading.Event()
+    write_snapshot = engine.store.write_snapshot
+
+    def slow_write_snapshot(**kwargs):
+        started.set()
+        release.wait()
+        return write_snapshot(**kwargs)
+
+    monkeypatch.setattr(engine.store, "write_snapshot", slow_write_snapshot)
+
+    frames, video = make_video("video2", 4)
+    engine.build_index(features[4:8].copy(), frames, video)
+    engine.save_index()
+    assert started.wait(5)
+
+    frames, video = make_video("video3", 4)
+    engine.build_index(features[8:].copy(), frames, video)
+    release.set()
+    engine.wait_for_compaction()
+
+    assert len(engine.frames._tail["video_index"]) == 4
+    assert len(engine.frames._columns["video_index"]) == 8
+    assert len(engine.frames) == 12
+    assert engine.view.frames is engine.frames
+
+    engine.save_index()
+    engine.wait_for_compaction()
+
+    assert all(not rows for rows in engine.frames._tail.values())
+    assert len(engine.frames) == 12
+
+    results = engine.search(features[9], k=1)
+    assert results[0]["frame_metadata"].frame_id == "video3_frame_000001"
+
+
+@pytest.mark.parametrize("index_type", ["flat", "sq8", "hnsw"])
+@pytest.mark.parametrize("video_id", [None, "video2"])
+def test_batch_search_matches_single_searches(
+    engine, monkeypatch, index_type, video_id
+):
+    """Çoklu arama her sorgu için tek tek aramayla aynı sonuçları döndürür."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", index_type)
+    features = random_features(60)
+    for i, video in enumerate(["video1", "video2", "video3"]):
+        frames, video_metadata = make_video(video, 20)
+        engine.build_index(
+            features[i * 20 : (i + 1) * 20].copy(), frames, video_metadata
+        )
+
+    queries = random_features(5, seed=7)
+    batch = engine.search_batch(
+        queries, k=10, similarity_threshold=-1.0, video_id=video_id
+    )
+
+    assert len(batch) == len(queries)
+    for query, results in zip(queries, batch):
+        expected = engine.search(
+            query, k=10, similarity_threshold=-1.0, video_id=video_id
+        )
+        assert [r["frame_metadata"].frame_id for r in results] == [
+            r["frame_metadata"].frame_id for r in expected
+        ]
+        np.testing.assert_allclose(
+            [r["score"] for r in results], [r["score"] for r in expected], rtol=1e-5
+        )
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_interleaved_video_chunks_are_searched_per_video(
+    engine, monkeypatch, index_type
+):
+    """Parça parça eklenen videolar araya giren videolardan ayrı aranır."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", index_type)
+    features = random_features(12)
+    frames1, video1 = make_video("video1", 8)
+    frames2, video2 = make_video("video2", 4)
+
+    engine.build_index(
+        features[:4].copy(), frames1[:4], replace(video1, indexed_until=4.0)
+    )
+    engine.save_index()
+    engine.build_index(features[4:8].copy(), frames2, video2)
+    engine.build_index(features[8:].copy(), frames1[4:], video1)
+    engine.save_index()
+
+    assert engine.video_id_ranges == {"video1": [(0, 4), (8, 12)], "video2": [(4, 8)]}
+    assert engine.get_video_metadata("video1").fully_indexed
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+    assert reloaded.video_id_ranges == engine.video_id_ranges
+
+    for search_engine in (engine, reloaded):
+        results = search_engine.search(
+            features[9], k=30, similarity_threshold=-1.0, video_id="video1"
+        )
+        assert len(results) == 8
+        assert results[0]["frame_metadata"].frame_id == "video1_frame_000005"
+        assert {r["frame_metadata"].video_id for r in results} == {"video1"}
+
+    assert reloaded.remove_video("video1")
+    results = reloaded.search(features[9], k=30, similarity_threshold=-1.0)
+    assert {r["frame_metadata"].video_id for r in results} == {"video2"}
+
+
+def test_video_added_again_after_removal_survives_reload(engine, monkeypatch):
+    """Silme kaydı aynı video_id ile sonradan eklenen frame'leri silmez."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "flat")
+    features = random_features(12)
+    for i, video_id in enumerate(["video1", "video2"]):
+        frames, video = make_video(video_id, 4)
+        engine.build_index(features[i * 4 : (i + 1) * 4].copy(), frames, video)
+    engine.save_index()
+
+    assert engine.remove_video("video1")
+    frames, video = make_video("video1", 4)
+    engine.build_index(features[8:].copy(), frames, video)
+    engine.save_index()
+
+    assert engine.store.removed == [("video1", 8)]
+
+    reloaded = SearchEngine(engine.index_path, engine.metadata_path)
+    assert reloaded.load_index()
+    assert reloaded.video_id_ranges == {"video1": [(8, 12)], "video2": [(4, 8)]}
+
+    results = reloaded.search(features[9], k=1)
+    assert results[0]["frame_metadata"].frame_id == "video1_frame_000001"
+    assert reloaded.frame_count == reloaded.index.ntotal == 8
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_published_view_is_not_changed_by_later_writes(engine, monkeypatch, index_type):
+    """Yayınlanan görünüm sonraki ekleme ve silmelerden etkilenmez."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", index_type)
+    monkeypatch.setattr(type(settings), "ANN_MIN_VECTORS", 500)
+
+    features = random_features(700)
+    frames, video = make_video("video1", 600)
+    engine.build_index(features[:600].copy(), frames, video)
+    view = engine.view
+
+    frames, video = make_video("video2", 100)
+    engine.build_index(features[600:].copy(), frames, video)
+    engine.remove_video("video1")
+
+    assert engine.view.version == view.version + 2
+    assert view.index.ntotal == 600
+    assert view.frame_count == 600
+    assert set(view.video_id_ranges) == {"video1"}
+    assert engine.get_video_metadata("video1") is None
+
+    # Görünüm kendi id'leriyle aranabilir kalır
+    query = features[10:11].copy()
+    faiss.normalize_L2(query)
+    _, indices = view.index.search(query, 1)
+    assert view.frame_metadata(int(indices[0][0])).frame_id == "video1_frame_000010"
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_new_videos_are_searched_from_delta_until_merged(
+    engine, monkeypatch, index_type
+):
+    """Yeni videolar index kopyalanmadan delta'dan aranır ve sınırda birleştirilir."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", index_type)
+    monkeypatch.setattr(type(settings), "INDEX_DELTA_MAX_VECTORS", 20)
+    clones = []
+    clone_index = faiss.clone_index
+    monkeypatch.setattr(
+        faiss, "clone_index", lambda index: clones.append(index) or clone_index(index)
+    )
+
+    features = random_features(40)
+    frames, video = make_video("video1", 20)
+    engine.build_index(features[:20].copy(), frames, video)
+    for i, video_id in enumerate(["video2", "video3"]):
+        frames, video = make_video(video_id, 5)
+        start = 20 + i * 5
+        engine.build_index(features[start : start + 5].copy(), frames, video)
+
+    assert clones == []
+    assert engine.index.ntotal == 20
+    assert engine.view.delta_ids.tolist() == list(range(20, 30))
+
+    results = engine.search(features[22], k=1)
+    assert results[0]["frame_metadata"].frame_id == "video2_frame_000002"
+
+    assert engine.remove_video("video2")
+    assert clones == []
+    results = engine.search(features[22], k=30, similarity_threshold=-1.0)
+    assert {r["frame_metadata"].video_id for r in results} == {"video1", "video3"}
+    assert len(results) == 25
+
+    # Delta sınırı aşılınca tek kopyayla ana index'e eklenir
+    frames, video = make_video("video4", 10)
+    engine.build_index(features[30:].copy(), frames, video)
+
+    assert len(clones) == 1
+    assert engine.index.ntotal == 35
+    assert len(engine.view.delta_ids) == 0
+    results = engine.search(features[33], k=1)
+    assert results[0]["frame_metadata"].frame_id == "video4_frame_000003"
+
+
+def test_search_during_ingestion_sees_whole_videos(engine, monkeypatch):
+    """Eşzamanlı aramalar her videonun ya hepsini ya hiçbirini görür."""
+    monkeypatch.setattr(type(settings), "INDEX_TYPE", "flat")
+    frames, video = make_video("video0", 50)
+    engine.build_index(random_features(50), frames, video)
+
+    errors = []
+    done = threading.Event()
+
+    def search():
+        while not done.is_set():
+            try:
+                results = engine.search(
+                    random_features(1, seed=99)[0], k=1000, similarity_threshold=-1.0
+                )
+                counts = Counter(r["frame_metadata"].video_id for r in results)
+                assert set(counts.values()) == {50}
+            except Exception as e:
+                errors.append(e)
+                return
+
+    searchers = [threading.Thread(target=search) for _ in range(4)]
+    for thread in searchers:
+        thread.start()
+
+    for i in range(1, 20):
+        frames, video = make_video(f"video{i}", 50)
+        engine.build_index(random_features(50, seed=i), frames, video)
+        if i % 5 == 0:
+            engine.remove_video(f"video{i - 3}")
+
+    done.set()
+    for thread in searchers:
+        thread.join()
+
+    assert errors == []
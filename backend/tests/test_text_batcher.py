@@ -0,0 +1,73 @@
+"""
+TextBatcher testleri.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from core.text_batcher import TextBatcher
+
+
+class SlowEncoder:
+    """Her metin için uzunluğunu içeren vektör döndüren yavaş encoder."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        time.sleep(self.delay)
+        return np.array([[len(text), 1.0] for text in texts], dtype="float32")
+
+
+def test_concurrent_requests_are_coalesced():
+    encoder = SlowEncoder()
+    batcher = TextBatcher(encoder, max_batch_size=8, max_wait_ms=20)
+    texts = [f"query {'x' * i}" for i in range(20)]
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = list(pool.map(batcher.encode, texts))
+
+    batcher.close()
+
+    # Her çağıran kendi metninin vektörünü alır
+    assert [result[0] for result in results] == [len(text) for text in texts]
+    assert sum(len(batch) for batch in encoder.batches) == len(texts)
+    assert len(encoder.batches) < len(texts)
+    assert max(len(batch) for batch in encoder.batches) <= 8
+
+
+def test_duplicate_texts_are_encoded_once():
+    encoder = SlowEncoder()
+    batcher = TextBatcher(encoder, max_batch_size=8, max_wait_ms=50)
+
+    futures = [batcher.submit("same query") for _ in range(5)]
+    results = [future.result() for future in futures]
+    batcher.close()
+
+    assert encoder.batches == [["same query"]]
+    assert all(np.array_equal(result, results[0]) for result in results)
+
+
+def test_encoding_errors_reach_every_caller():
+    def failing_encoder(texts):
+        raise RuntimeError("model failed")
+
+    batcher = TextBatcher(failing_encoder, max_batch_size=4, max_wait_ms=20)
+    futures = [batcher.submit(f"query {i}") for i in range(3)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model failed"):
+            future.result()
+
+    batcher.close()
+
+    with pytest.raises(RuntimeError):
+        batcher.submit("after close")
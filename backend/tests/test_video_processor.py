@@ -0,0 +1,258 @@
+"""
+VideoProcessor frame örnekleme testleri.
+
+Farklı decode modlarının aynı frame'leri örneklediğini doğrular.
+"""
+
+import math
+
+import cv2
+import numpy as np
+import pytest
+
+from benchmarks.video_utils import generate_scene_video, generate_test_video
+from config.settings import settings
+from core.video_processor import DECODE_MODES, SamplingOptions, VideoProcessor
+
+
+@pytest.fixture(scope="module")
+def test_video(tmp_path_factory):
+    """Testler için kısa bir sentetik video üretir."""
+    video_path = tmp_path_factory.mktemp("videos") / "sample.mp4"
+    return generate_test_video(
+        video_path, duration=6.0, fps=25.0, width=160, height=120
+    )
+
+
+def sample_frames(video_path, decode_mode, sample_rate=1.0):
+    """Verilen modda örneklenen (frame_number, frame) çiftlerini döndürür."""
+    cap = cv2.VideoCapture(str(video_path))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    frames = [
+        (frame_number, frame)
+        for _, frame_number, _, frame in VideoProcessor()._iter_sampled_frames(
+            cap, fps, total_frames, decode_mode, sample_rate
+        )
+    ]
+    cap.release()
+    return frames
+
+
+@pytest.mark.parametrize("decode_mode", DECODE_MODES)
+def test_decode_modes_sample_same_frames(test_video, decode_mode, monkeypatch):
+    """Tüm decode modları read moduyla aynı frame'leri döndürmelidir."""
+    monkeypatch.setattr(settings, "SEEK_MIN_FRAME_GAP", 5)
+
+    expected = sample_frames(test_video, "read")
+    actual = sample_frames(test_video, decode_mode)
+
+    assert [n for n, _ in actual] == [n for n, _ in expected] == list(range(0, 150, 25))
+
+    for (_, expected_frame), (_, actual_frame) in zip(expected, actual):
+        assert (
+            np.abs(expected_frame.astype(int) - actual_frame.astype(int)).mean() < 2.0
+        )
+
+
+def test_unknown_decode_mode_raises(test_video):
+    """Bilinmeyen decode modu ValueError fırlatmalıdır."""
+    with pytest.raises(ValueError):
+        VideoProcessor().extract_frames(
+            test_video, "video", "sample.mp4", SamplingOptions(decode_mode="fast")
+        )
+
+
+def test_parallel_extraction_matches_serial(test_video, tmp_path, monkeypatch):
+    """Paralel extraction seri yol ile aynı frame ID ve timestamp'leri üretmelidir."""
+    monkeypatch.setattr(type(settings), "FRAME_EXTRACTION_DIR", tmp_path)
+    monkeypatch.setattr(settings, "EXTRACTION_WORKERS", 4)
+
+    processor = VideoProcessor()
+    serial, _ = processor.extract_frames(
+        test_video, "serial", "sample.mp4", parallel=False
+    )
+    parallel, _ = processor.extract_frames(
+        test_video, "parallel", "sample.mp4", parallel=True
+    )
+
+    assert len(parallel) == len(serial) > 0
+    for serial_frame, parallel_frame in zip(serial, parallel):
+        assert (
+            parallel_frame.frame_id.replace("parallel", "serial")
+            == serial_frame.frame_id
+        )
+        assert parallel_frame.frame_number == serial_frame.frame_number
+        assert parallel_frame.timestamp == serial_frame.timestamp
+
+
+def test_streamed_parallel_frames_match_serial(test_video, tmp_path, monkeypatch):
+    """iter_frames paralel decode'da seri yol ile aynı frame'leri sırayla üretmelidir."""
+    monkeypatch.setattr(type(settings), "FRAME_EXTRACTION_DIR", tmp_path)
+    monkeypatch.setattr(settings, "EXTRACTION_WORKERS", 2)
+    monkeypatch.setattr(settings, "PARALLEL_EXTRACTION_CHUNK_SECONDS", 1.0)
+
+    processor = VideoProcessor()
+    _, serial = processor.iter_frames(test_video, "video", "sample.mp4", parallel=False)
+    _, parallel = processor.iter_frames(
+        test_video, "video", "sample.mp4", parallel=True
+    )
+    serial, parallel = list(serial), list(parallel)
+
+    assert [fm for fm, _ in parallel] == [fm for fm, _ in serial]
+    for (_, serial_frame), (_, parallel_frame) in zip(serial, parallel):
+        assert (
+            np.abs(serial_frame.astype(int) - parallel_frame.astype(int)).mean() < 2.0
+        )
+
+
+@pytest.mark.parametrize("dedup_method", ["histogram", "phash"])
+def test_dedup_keeps_one_frame_per_static_scene(tmp_path, monkeypatch, dedup_method):
+    """Sabit sahnelerde her sahneden tek frame tutulmalı ve aralıkları kapsamalıdır."""
+    monkeypatch.setattr(type(settings), "FRAME_EXTRACTION_DIR", tmp_path / "frames")
+    video_path = generate_scene_video(
+        tmp_path / "scenes.avi",
+        [4.0, 3.0, 5.0],
+        fps=10.0,
+        width=160,
+        height=120,
+        fourcc="MJPG",
+    )
+
+    frames, video_metadata = VideoProcessor().extract_frames(
+        video_path,
+        "scenes",
+        "scenes.avi",
+        SamplingOptions(dedup_method=dedup_method),
+        parallel=False,
+    )
+
+    assert [fm.timestamp for fm in frames] == [0.0, 4.0, 7.0]
+    assert [fm.end_time for fm in frames] == [4.0, 7.0, video_metadata.duration]
+    assert [fm.frame_id for fm in frames] == [
+        "scenes_frame_000000",
+        "scenes_frame_000004",
+        "scenes_frame_000007",
+    ]
+
+
+@pytest.mark.parametrize("dedup_method", ["histogram", "phash"])
+def test_parallel_dedup_matches_serial_across_chunks(
+    tmp_path, monkeypatch, dedup_method
+):
+    """Aralık sınırını aşan sahneler paralel yolda da tek frame ile temsil edilmelidir."""
+    monkeypatch.setattr(type(settings), "FRAME_EXTRACTION_DIR", tmp_path / "frames")
+    monkeypatch.setattr(settings, "EXTRACTION_WORKERS", 4)
+    # 3 saniyelik aralıklar sahneleri ortadan böler
+    monkeypatch.setattr(settings, "PARALLEL_EXTRACTION_CHUNK_SECONDS", 3.0)
+    video_path = generate_scene_video(
+        tmp_path / "scenes.avi",
+        [4.0, 3.0, 5.0],
+        fps=10.0,
+        width=160,
+        height=120,
+        fourcc="MJPG",
+    )
+    options = SamplingOptions(dedup_method=dedup_method)
+
+    processor = VideoProcessor()
+    serial, video_metadata = processor.extract_frames(
+        video_path, "scenes", "scenes.avi", options, parallel=False
+    )
+    parallel, _ = processor.extract_frames(
+        video_path, "scenes", "scenes.avi", options, parallel=True
+    )
+
+    assert parallel == serial
+    assert [fm.timestamp for fm in parallel] == [0.0, 4.0, 7.0]
+    assert [fm.end_time for fm in parallel] == [4.0, 7.0, video_metadata.duration]
+
+
+def test_dedup_disabled_keeps_every_sample(tmp_path, monkeypatch):
+    """Dedup kapalıyken her örneklenen frame tutulmalıdır."""
+    monkeypatch.setattr(type(settings), "FRAME_EXTRACTION_DIR", tmp_path / "frames")
+    video_path = generate_scene_video(
+        tmp_path / "scenes.avi",
+        [4.0, 3.0],
+        fps=10.0,
+        width=160,
+        height=120,
+        fourcc="MJPG",
+    )
+
+    frames, _ = VideoProcessor().extract_frames(
+        video_path,
+        "scenes",
+        "scenes.avi",
+        SamplingOptions(dedup_method="none"),
+        parallel=False,
+    )
+
+    assert len(frames) == 7
+    assert [fm.end_time for fm in frames] == [float(t) for t in range(1, 8)]
+
+
+@pytest.mark.parametrize("decode_mode", DECODE_MODES)
+def test_fractional_frame_rate_does_not_drift(tmp_path, decode_mode, monkeypatch):
+    """29.97 FPS videoda her saniyenin ilk frame'i örneklenmelidir."""
+    monkeypatch.setattr(settings, "SEEK_MIN_FRAME_GAP", 5)
+    video_path = generate_test_video(
+        tmp_path / "ntsc.mp4", duration=40.0, fps=29.97, width=64, height=48
+    )
+
+    frame_numbers = [n for n, _ in sample_frames(video_path, decode_mode)]
+
+    # Tam sayıya yuvarlanan aralık (29) 30 saniyede bir saniye kayma üretirdi
+    assert frame_numbers == [math.ceil(k * 29.97 - 1e-6) for k in range(40)]
+
+
+def test_keyframe_strategy_samples_only_keyframes(tmp_path, monkeypatch):
+    """Keyframe stratejisi sadece I-frame'leri, en fazla verilen hızda döndürmelidir."""
+    av = pytest.importorskip("av")
+    monkeypatch.setattr(type(settings), "FRAME_EXTRACTION_DIR", tmp_path / "frames")
+    video_path = generate_test_video(
+        tmp_path / "sample.mp4", duration=10.0, fps=25.0, width=160, height=120
+    )
+
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        keyframe_times = [
+            float(packet.pts * stream.time_base)
+            for packet in container.demux(stream)
+            if packet.is_keyframe and packet.pts is not None
+        ]
+
+    frames, _ = VideoProcessor().extract_frames(
+        video_path,
+        "keyframes",
+        "sample.mp4",
+        SamplingOptions(strategy="keyframe", frames_per_second=10, dedup_method="none"),
+    )
+
+    assert [fm.timestamp for fm in frames] == pytest.approx(sorted(keyframe_times))
+
+
+def test_adaptive_strategy_follows_motion(tmp_path, monkeypatch):
+    """Adaptive strateji hareketli sahnede sık, sabit sahnede seyrek örneklemelidir."""
+    monkeypatch.setattr(type(settings), "FRAME_EXTRACTION_DIR", tmp_path / "frames")
+    monkeypatch.setattr(settings, "ADAPTIVE_MIN_FPS", 0.5)
+    monkeypatch.setattr(settings, "ADAPTIVE_MAX_FPS", 4.0)
+    monkeypatch.setattr(settings, "ADAPTIVE_MOTION_THRESHOLD", 0.01)
+
+    static_video = generate_scene_video(
+        tmp_path / "static.avi", [10.0], fps=20.0, width=160, height=120, fourcc="MJPG"
+    )
+    moving_video = generate_test_video(
+        tmp_path / "moving.mp4", duration=10.0, fps=20.0, width=160, height=120
+    )
+    options = SamplingOptions(strategy="adaptive", dedup_method="none")
+
+    static_frames, _ = VideoProcessor().extract_frames(
+        static_video, "static", "static.avi", options
+    )
+    moving_frames, _ = VideoProcessor().extract_frames(
+        moving_video, "moving", "moving.mp4", options
+    )
+
+    assert [fm.timestamp for fm in static_frames] == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert len(moving_frames) == 40
@@ -0,0 +1,39 @@
+"""
+Dosya içeriği hash'leme yardımcıları.
+Upload edilen dosyaları diske yazarken aynı geçişte içerik hash'ini hesaplar.
+"""
+
+import hashlib
+from typing import BinaryIO
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def copy_with_hash(
+    source: BinaryIO, destination: BinaryIO, chunk_size: int = CHUNK_SIZE
+) -> str:
+    """
+    Kaynak dosyayı hedefe parça parça kopyalar ve SHA-256 hash'ini hesaplar.
+
+    Dosya ikinci kez okunmadığı için hash hesabı ek disk I/O gerektirmez.
+
+    Args:
+        source: Okunacak dosya nesnesi
+        destination: Yazılacak dosya nesnesi
+        chunk_size: Okuma parça boyutu (byte)
+
+    Returns:
+        İçeriğin hex formatında SHA-256 hash'i
+    """
+    digest = hashlib.sha256()
+
+    while True:
+        chunk = source.read(chunk_size)
+
+        if not chunk:
+            break
+
+        digest.update(chunk)
+        destination.write(chunk)
+
+    return digest.hexdigest()
@@ -55,6 +55,40 @@ export async function uploadVideo(file, onProgress = null) {
   });
 }
 
+/**
+ * Ingestion işi bitene kadar durumunu sorgular
+ *
+ * @param {string} jobId - Upload yanıtındaki iş ID'si
+ * @param {Function} onProgress - Progress callback (0-100 arası değer alır)
+ * @param {number} intervalMs - Sorgulama aralığı (ms)
+ * @returns {Promise<Object>} Tamamlanan işin durumu
+ */
+export async function waitForJob(jobId, onProgress = null, intervalMs = 1000) {
+  while (true) {
+    const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`);
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch job status');
+    }
+
+    const job = await response.json();
+
+    if (onProgress) {
+      onProgress(job.percent);
+    }
+
+    if (job.status === 'completed') {
+      return job;
+    }
+
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Video processing failed');
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
+
 /**
  * Arama fonksiyonu
  * 